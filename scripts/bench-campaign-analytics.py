@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+bench-campaign-analytics.py - Benchmark the cross-campaign analytics report.
+
+Builds a throwaway tenant with --campaigns campaigns of --targets v2 target
+references each (random stages, touches, channels and dates over a
+quarter), then times:
+- load: reading every campaign's targets and log into columns
+- total / campaign / cohort: the report grouped each way
+
+Usage:
+    python scripts/bench-campaign-analytics.py [--campaigns 20] [--targets 2500]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "src" / "tools" / "python"
+sys.path.insert(0, str(TOOLS_DIR))
+import campaign_analytics
+import campaign_write
+import frontmatter
+
+START = datetime(2026, 1, 1)
+CHANNELS = ["email", "email", "email", "linkedin", "sms"]
+
+
+def iso(moment: datetime) -> str:
+    return moment.isoformat() + "Z"
+
+
+def seed_campaign(name: str, targets: int, rng: random.Random) -> None:
+    campaign_write.create_campaign(name, {"goal": "benchmark"})
+    refs = []
+    for i in range(targets):
+        added = START + timedelta(minutes=rng.randrange(90 * 24 * 60))
+        stage = rng.choices(campaign_analytics.STAGES + ["lost"], weights=[30, 20, 25, 8, 5, 4, 3, 5])[0]
+        touches = rng.randrange(6) if stage != "identified" else 0
+        by_channel = {}
+        for _ in range(touches):
+            channel = rng.choice(CHANNELS)
+            by_channel[channel] = by_channel.get(channel, 0) + 1
+        refs.append({
+            "id": f"{name}-{i:05d}",
+            "prospect_slug": f"prospect-{i:05d}",
+            "added_at": iso(added),
+            "last_touch_at": iso(added + timedelta(days=touches * 3)) if touches else None,
+            "touch_count": touches,
+            "campaign_stage": stage,
+            "stage_changed_at": iso(added + timedelta(days=rng.randrange(30))),
+            "touches_by_channel": by_channel,
+            "unsubscribed": False
+        })
+    path = campaign_write.get_campaign_path(name)
+    frontmatter.write(path / "targets.md", {"version": 2, "lastUpdated": iso(START), "target_references": refs}, "\n# Campaign Targets\n")
+
+
+def timed_ms(fn) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return round((time.perf_counter() - start) * 1000, 1), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--campaigns", type=int, default=20)
+    parser.add_argument("--targets", type=int, default=2500)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            for c in range(args.campaigns):
+                seed_campaign(f"bench-{c:02d}", args.targets, rng)
+
+            load_ms, (columns, events) = timed_ms(lambda: campaign_analytics.load(campaign_analytics.campaign_folders()))
+            reports = {}
+            for group_by in ("total", "campaign", "cohort"):
+                ms, groups = timed_ms(lambda: campaign_analytics.analyse(columns, events, group_by=group_by))
+                reports[group_by] = {"groups": len(groups), "ms": ms}
+        finally:
+            os.chdir(cwd)
+
+    print(json.dumps({
+        "targets": len(columns),
+        "load_ms": load_ms,
+        "reports": reports
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+bench-campaign-hydration.py - Benchmark prospect hydration for a targets listing.
+
+Builds a throwaway tenant with one campaign of --targets v2 target
+references, each pointing at its own prospect file, then times hydrating
+every target's prospect context:
+- per_target: the old path, read_prospect() once per reference
+- bulk_full: hydrate_prospects() with whole prospects
+- bulk_header: hydrate_prospects() with frontmatter fields outside the manifest
+- bulk_manifest: hydrate_prospects() with manifest fields only (no files opened)
+- bulk_header_threads: bulk_header with --workers threads
+
+Each is run with the frontmatter sidecar cache warm (as in a busy tenant).
+
+Usage:
+    python scripts/bench-campaign-hydration.py [--targets 2000] [--workers 8]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "src" / "tools" / "python"
+sys.path.insert(0, str(TOOLS_DIR))
+import campaign_read
+import frontmatter
+
+BODY = """
+## Business Context
+Runs a {n}-person brokerage.
+
+## Research Notes
+Met at the spring expo.
+
+## Personalization Hooks
+Mentioned a new office.
+
+## Interaction History
+- 2026-01-0{d}: intro email
+"""
+
+
+def seed_prospects(targets: int) -> list[str]:
+    folder = Path("relationships") / "prospects"
+    folder.mkdir(parents=True)
+    slugs = []
+    for i in range(targets):
+        slug = f"prospect-{i:05d}"
+        frontmatter.write(folder / f"{slug}.md", {
+            "name": f"Prospect {i}",
+            "email": f"p{i}@example.com",
+            "company": f"Company {i % 97}",
+            "title": "Broker",
+            "stage": "identified",
+            "tags": ["bench"]
+        }, BODY.format(n=i % 50, d=i % 9 + 1))
+        slugs.append(slug)
+    return slugs
+
+
+def timed_ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--targets", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            slugs = seed_prospects(args.targets)
+            # Build the manifest and warm the caches once
+            campaign_read.hydrate_prospects(slugs)
+
+            results = {
+                "per_target": timed_ms(lambda: [campaign_read.read_prospect(slug) for slug in slugs]),
+                "bulk_full": timed_ms(lambda: campaign_read.hydrate_prospects(slugs)),
+                "bulk_header": timed_ms(lambda: campaign_read.hydrate_prospects(slugs, ["company", "title"])),
+                "bulk_manifest": timed_ms(lambda: campaign_read.hydrate_prospects(slugs, ["name", "email"])),
+                "bulk_header_threads": timed_ms(lambda: campaign_read.hydrate_prospects(slugs, ["company", "title"], args.workers)),
+            }
+        finally:
+            os.chdir(cwd)
+
+    print(json.dumps({"targets": args.targets, "ms": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
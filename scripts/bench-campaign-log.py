@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+bench-campaign-log.py - Benchmark campaign log appends and reads on an old campaign.
+
+Builds a throwaway tenant with one campaign whose log already holds
+--events events (a day's worth every 100), then times:
+- rewrite: the old path - read log.md, insert the event, rewrite the file
+- append: campaign_write.log_event (one line appended to log.jsonl)
+- tail: CampaignLog.tail(50)
+- window: CampaignLog.window() over one day in the middle of the log
+- compact: rebuilding the log.md view from the tail
+
+Usage:
+    python scripts/bench-campaign-log.py [--events 100000] [--runs 50]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "src" / "tools" / "python"
+sys.path.insert(0, str(TOOLS_DIR))
+import campaign_log
+import campaign_write
+import frontmatter
+from campaign_log import CampaignLog
+
+CAMPAIGN = "bench-outreach"
+START = datetime(2026, 1, 1)
+
+
+def seed_log(events: int) -> Path:
+    """Create the campaign and write its log.jsonl; returns the campaign folder."""
+    campaign_write.create_campaign(CAMPAIGN, {"goal": "benchmark"})
+    path = campaign_write.get_campaign_path(CAMPAIGN)
+    with open(path / "log.jsonl", "w", encoding="utf-8") as f:
+        for i in range(events):
+            timestamp = START + timedelta(days=i // 100, seconds=i % 100 * 60)
+            f.write(campaign_log.encode_event({"timestamp": timestamp.isoformat() + "Z", "type": "INFO", "message": f"Event {i}"}))
+    CampaignLog(path).compact()
+    return path
+
+
+def old_rewrite(path: Path) -> None:
+    data, markdown = frontmatter.parse((path / "log.md").read_text(encoding="utf-8"))
+    data["events"].insert(0, {"timestamp": datetime.utcnow().isoformat() + "Z", "type": "INFO", "message": "bench"})
+    data["events"] = data["events"][:1000]
+    (path / "log.md").write_text(frontmatter.serialize(data, markdown), encoding="utf-8")
+
+
+def median_ms(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return round(samples[len(samples) // 2] * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    # Keep the view as seeded until the explicit compaction below
+    campaign_log.COMPACT_BYTES = 10 ** 12
+    campaign_log.COMPACT_AGE = 10 ** 9
+
+    day = (START + timedelta(days=args.events // 200)).date()
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            path = seed_log(args.events)
+            size_kb = round((path / "log.jsonl").stat().st_size / 1024)
+
+            rewrite = median_ms(lambda: old_rewrite(path), min(args.runs, 10))
+            append = median_ms(lambda: campaign_write.log_event(CAMPAIGN, "INFO", "bench"), args.runs)
+
+            start = time.perf_counter()
+            CampaignLog(path).index()
+            build = round((time.perf_counter() - start) * 1000, 1)
+            tail = median_ms(lambda: CampaignLog(path).tail(50), args.runs)
+            window = median_ms(lambda: CampaignLog(path).window(day.isoformat(), (day + timedelta(days=1)).isoformat()), args.runs)
+
+            start = time.perf_counter()
+            CampaignLog(path).compact()
+            compact = round((time.perf_counter() - start) * 1000, 1)
+        finally:
+            os.chdir(cwd)
+
+    print(json.dumps({
+        "events": args.events,
+        "log_kb": size_kb,
+        "rewrite_ms": rewrite,
+        "append_ms": append,
+        "index_build_ms": build,
+        "tail_ms": tail,
+        "window_day_ms": window,
+        "compact_ms": compact
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+bench-campaign-search.py - Benchmark target search on a big reference campaign.
+
+Builds a throwaway tenant with one campaign of --targets v2 target
+references (each pointing at its own prospect file), then times:
+- scan: the unindexed way - load the targets and read every prospect
+- build: the first search, building the index
+- query / filter: warm searches (text query; "contacted > 7 days ago")
+- after_touch: a search right after a record_touch (targets rebuilt,
+  prospects re-used)
+- after_prospect_edit: a search right after one prospect file changed
+
+Usage:
+    python scripts/bench-campaign-search.py [--targets 5000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "src" / "tools" / "python"
+sys.path.insert(0, str(TOOLS_DIR))
+import campaign_write
+import frontmatter
+from campaign_search import TargetSearch
+from campaign_targets import TargetStore
+
+CAMPAIGN = "bench-search"
+STAGES = ["identified", "researched", "contacted", "replied"]
+
+
+def seed_tenant(targets: int) -> list[str]:
+    campaign_write.create_campaign(CAMPAIGN, {"goal": "benchmark"})
+    prospects = Path("relationships") / "prospects"
+    prospects.mkdir(parents=True)
+
+    refs = []
+    for i in range(targets):
+        slug = f"prospect-{i:05d}"
+        frontmatter.write(prospects / f"{slug}.md", {
+            "name": f"Prospect {i}",
+            "email": f"p{i}@example.com",
+            "company": f"Company {i % 97}",
+            "title": "Broker",
+            "tags": ["bench"]
+        }, "")
+        refs.append({
+            "id": f"target-{i:05d}",
+            "prospect_slug": slug,
+            "added_at": "2026-01-01T00:00:00Z",
+            "last_touch_at": f"2026-01-{i % 28 + 1:02d}T09:00:00Z" if i % 3 else None,
+            "touch_count": 1 if i % 3 else 0,
+            "campaign_stage": STAGES[i % 4],
+            "unsubscribed": False
+        })
+    path = campaign_write.get_campaign_path(CAMPAIGN)
+    frontmatter.write(path / "targets.md", {"version": 2, "lastUpdated": "2026-01-01T00:00:00Z", "target_references": refs}, "\n# Campaign Targets\n")
+    return [ref["id"] for ref in refs]
+
+
+def scan(path: Path, needle: str) -> list[dict]:
+    data, _ = TargetStore(path).load()
+    hits = []
+    for ref in data["target_references"]:
+        prospect = frontmatter.read_data(Path("relationships") / "prospects" / f"{ref['prospect_slug']}.md")
+        text = " ".join(str(prospect.get(key) or "") for key in ("name", "email", "company", "title")).lower()
+        if needle in text:
+            hits.append(ref)
+    return hits
+
+
+def timed_ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--targets", type=int, default=5000)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            ids = seed_tenant(args.targets)
+            path = campaign_write.get_campaign_path(CAMPAIGN)
+
+            def search(**filters):
+                return TargetSearch(path).search(**filters)
+
+            results = {
+                "scan": timed_ms(lambda: scan(path, "company 42")),
+                "build": timed_ms(lambda: search(query="company 42")),
+                "query": timed_ms(lambda: search(query="company 42")),
+                "filter": timed_ms(lambda: search(stage="contacted", min_days_since_touch=7, sort="last_touch_at")),
+            }
+            campaign_write.record_touch(CAMPAIGN, ids[0], {"channel": "email"})
+            results["after_touch"] = timed_ms(lambda: search(query="company 42"))
+            time.sleep(0.01)
+            frontmatter.write(Path("relationships") / "prospects" / "prospect-00042.md", {"name": "Renamed", "company": "Company 42"}, "")
+            results["after_prospect_edit"] = timed_ms(lambda: search(query="company 42"))
+        finally:
+            os.chdir(cwd)
+
+    print(json.dumps({"targets": args.targets, "ms": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+bench-campaign-targets.py - Benchmark single-target updates on a big campaign.
+
+Builds a throwaway tenant with one campaign of --targets v2 target
+references (each pointing at a prospect file), then times:
+- rewrite: the old path - read targets.md, scan for the id, rewrite the file
+- store update: TargetStore.update() (append one change line)
+- store get: TargetStore.get() for a random target
+- record_touch: the full campaign_write operation, metrics included
+- compact: folding COMPACT_CHANGES pending changes into targets.md
+- onboard: adding --onboard prospects one add_target_by_prospect at a time
+  vs. as one batch (one metrics recount, one targets append)
+
+Usage:
+    python scripts/bench-campaign-targets.py [--targets 5000] [--runs 50] [--onboard 100]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "src" / "tools" / "python"
+sys.path.insert(0, str(TOOLS_DIR))
+import campaign_targets
+import campaign_write
+import frontmatter
+from campaign_targets import TargetStore
+
+CAMPAIGN = "bench-outreach"
+
+
+def seed_tenant(targets: int) -> list[str]:
+    """Create the campaign and its prospects; returns the target ids."""
+    campaign_write.create_campaign(CAMPAIGN, {"goal": "benchmark"})
+    prospects = Path("relationships") / "prospects"
+    prospects.mkdir(parents=True)
+
+    refs = []
+    for i in range(targets):
+        slug = f"prospect-{i:05d}"
+        frontmatter.write(prospects / f"{slug}.md", {"name": f"Prospect {i}", "email": f"p{i}@example.com", "stage": "identified"}, "")
+        refs.append({
+            "id": f"target-{i:05d}",
+            "prospect_slug": slug,
+            "added_at": "2026-01-01T00:00:00Z",
+            "last_touch_at": None,
+            "touch_count": 0,
+            "campaign_stage": "identified",
+            "unsubscribed": False
+        })
+    path = campaign_write.get_campaign_path(CAMPAIGN)
+    frontmatter.write(path / "targets.md", {"version": 2, "lastUpdated": "2026-01-01T00:00:00Z", "target_references": refs}, "\n# Campaign Targets\n")
+    return [ref["id"] for ref in refs]
+
+
+def old_rewrite(target_id: str) -> None:
+    path = campaign_write.get_campaign_path(CAMPAIGN) / "targets.md"
+    data, markdown = frontmatter.parse(path.read_text(encoding="utf-8"))
+    for ref in data["target_references"]:
+        if ref["id"] == target_id:
+            ref["touch_count"] += 1
+            break
+    path.write_text(frontmatter.serialize(data, markdown), encoding="utf-8")
+
+
+def median_ms(fn, ids: list[str], runs: int) -> float:
+    rng = random.Random(7)
+    samples = []
+    for _ in range(runs):
+        target_id = rng.choice(ids)
+        start = time.perf_counter()
+        fn(target_id)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return round(samples[len(samples) // 2] * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--targets", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--onboard", type=int, default=100)
+    args = parser.parse_args()
+
+    # Keep every change pending until the explicit compaction below
+    campaign_targets.COMPACT_CHANGES = 10 ** 9
+    campaign_targets.COMPACT_AGE = 10 ** 9
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            ids = seed_tenant(args.targets)
+            path = campaign_write.get_campaign_path(CAMPAIGN)
+            size_kb = round((path / "targets.md").stat().st_size / 1024)
+
+            rewrite = median_ms(old_rewrite, ids, min(args.runs, 10))
+            store = TargetStore(path)
+            store.index()
+            update = median_ms(lambda i: TargetStore(path).update(i, {"campaign_stage": "researched"}), ids, args.runs)
+            get = median_ms(lambda i: TargetStore(path).get(i), ids, args.runs)
+            touch = median_ms(lambda i: campaign_write.record_touch(CAMPAIGN, i, {"channel": "email"}), ids, min(args.runs, 10))
+
+            pending = len(store.changes())
+            start = time.perf_counter()
+            store.compact()
+            compact = round((time.perf_counter() - start) * 1000, 1)
+
+            # Re-use the seeded prospects; a campaign may reference one more than once
+            slugs = [f"prospect-{i:05d}" for i in range(args.onboard)]
+            start = time.perf_counter()
+            for slug in slugs:
+                campaign_write.add_target_by_prospect(CAMPAIGN, slug)
+            single = round((time.perf_counter() - start) * 1000, 1)
+            start = time.perf_counter()
+            result = campaign_write.run_batch(
+                [{"operation": "add_target_by_prospect", "prospect_slug": slug} for slug in slugs], CAMPAIGN
+            )
+            batch = round((time.perf_counter() - start) * 1000, 1)
+            assert result["status"] == "success", result["message"]
+        finally:
+            os.chdir(cwd)
+
+    print(json.dumps({
+        "targets": args.targets,
+        "targets_kb": size_kb,
+        "rewrite_ms": rewrite,
+        "store_update_ms": update,
+        "store_get_ms": get,
+        "record_touch_ms": touch,
+        "compact": {"changes": pending, "ms": compact},
+        "onboard": {"prospects": args.onboard, "single_ms": single, "batch_ms": batch}
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+bench-life-read.py - Benchmark path-projected life_read on a multi-MB contacts file.
+
+Builds a throwaway tenant with a large life/contacts.md (thousands of
+contacts in the frontmatter plus a long markdown body), then times getting
+["owner.name", "version"] three ways:
+- full: read the whole file, parse it, walk the paths (the old behaviour)
+- projected (cold): life_store.read(path=[...]) with no parse cache
+- projected (warm): the same call once the parse cache is populated
+
+Peak memory for each is measured with tracemalloc, in a separate run.
+
+Usage:
+    python scripts/bench-life-read.py [--contacts 20000] [--runs 10]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "src" / "tools" / "python"
+sys.path.insert(0, str(TOOLS_DIR))
+import frontmatter
+import life_store
+
+FILE_NAME = "life/contacts.md"
+PATHS = ["owner.name", "version"]
+
+
+def seed_tenant(root: Path, contacts: int) -> int:
+    """Write a large contacts file; returns its size in bytes."""
+    data = {
+        "version": 1,
+        "owner": {"name": "Jane Realtor", "timezone": "America/Denver"},
+        "contacts": [
+            {
+                "id": f"c{i}",
+                "name": f"Contact {i}",
+                "email": f"contact{i}@example.com",
+                "phone": f"+1555{i:07d}",
+                "notes": "met at an open house, interested in 3 bed listings near downtown"
+            }
+            for i in range(contacts)
+        ]
+    }
+    body = "".join(f"\n## Contact {i}\nCalled about showing times, follow up next week.\n" for i in range(contacts))
+
+    path = root / FILE_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(frontmatter.serialize(data, body), encoding="utf-8")
+    return path.stat().st_size
+
+
+def full_read():
+    content = Path(FILE_NAME).read_text(encoding="utf-8")
+    data, _ = frontmatter.parse(content)
+    return {p: life_store.get_nested_value(data, p) for p in PATHS}
+
+
+def projected_read():
+    return life_store.read(FILE_NAME, path=PATHS)["data"]
+
+
+def clear_cache():
+    frontmatter._memory.clear()
+    shutil.rmtree(frontmatter.CACHE_DIR, ignore_errors=True)
+
+
+def measure(fn, runs: int, before=None) -> dict:
+    """Median wall time of fn over runs, plus peak memory of one traced run."""
+    samples = []
+    for _ in range(runs):
+        if before:
+            before()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+
+    if before:
+        before()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "ms": round(samples[len(samples) // 2] * 1000, 2),
+        "peak_mb": round(peak / 1e6, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contacts", type=int, default=20000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            size = seed_tenant(Path(tmp), args.contacts)
+            assert full_read() == projected_read()
+
+            full = measure(full_read, args.runs)
+            cold = measure(projected_read, args.runs, before=clear_cache)
+            projected_read()
+            warm = measure(projected_read, args.runs)
+        finally:
+            os.chdir(cwd)
+
+    print(json.dumps({
+        "file_mb": round(size / 1e6, 1),
+        "paths": PATHS,
+        "full": full,
+        "projected_cold": cold,
+        "projected_warm": warm
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+bench-recall-ranked.py - Benchmark BM25 ranked recall on a large memory.
+
+Builds a throwaway tenant whose knowledge/ and life/ files hold about
+--sections markdown sections and frontmatter fields, then times:
+- build: first refresh (sectioning every file and indexing it)
+- refresh: a no-change refresh (one stat per file)
+- edit: a refresh after one file changed (re-indexing only that file)
+- load: a new LifeRank (what every recall process pays) plus one search
+- query: life_rank search for a few queries, including a typo'd one
+
+Usage:
+    python scripts/bench-recall-ranked.py [--sections 10000] [--runs 20]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "src" / "tools" / "python"
+sys.path.insert(0, str(TOOLS_DIR))
+import frontmatter
+from life_rank import LifeRank
+
+WORDS = (
+    "buyer seller listing showing offer inspection appraisal closing escrow mortgage "
+    "downtown suburb school commute garage kitchen remodel budget preapproval lender "
+    "morning afternoon weekend call email text follow reminder price reduction market"
+).split()
+
+QUERIES = ["kitchen remodel budget", "morning showings", "preaproval lendr", "escrow closing weekend"]
+
+
+def seed_tenant(root: Path, sections: int, per_file: int = 50):
+    """Write files of per_file sections each; a third of them as frontmatter notes."""
+    rng = random.Random(7)
+    folder = root / "knowledge"
+    folder.mkdir(parents=True)
+
+    for f in range(sections // per_file):
+        notes = [{"note": " ".join(rng.choices(WORDS, k=12))} for i in range(per_file // 3)]
+        body = "".join(
+            f"\n## Topic {f}-{i}\n{' '.join(rng.choices(WORDS, k=40))}\n"
+            for i in range(per_file - len(notes))
+        )
+        (folder / f"topic-{f}.md").write_text(frontmatter.serialize({"notes": notes}, body), encoding="utf-8")
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sections", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            seed_tenant(Path(tmp), args.sections)
+
+            build = timed(lambda: LifeRank().refresh())
+            refresh = timed(lambda: LifeRank().refresh())
+            edited = Path(tmp) / "knowledge" / "topic-0.md"
+            edited.write_text(edited.read_text(encoding="utf-8") + "\n## Added\nkitchen budget\n", encoding="utf-8")
+            edit = timed(lambda: LifeRank().refresh())
+            loads = sorted(timed(lambda: LifeRank().search(QUERIES[0])) for _ in range(args.runs))
+
+            ranker = LifeRank()
+            ranker.refresh()
+            queries = {}
+            for query in QUERIES:
+                samples = sorted(timed(lambda: ranker.search(query)) for _ in range(args.runs))
+                result = ranker.search(query, limit=1)
+                queries[query] = {
+                    "ms": round(samples[len(samples) // 2] * 1000, 2),
+                    "expansions": result["expansions"],
+                    "top": result["hits"][0]["snippet"][:60] if result["hits"] else None
+                }
+            sections = ranker.search("x")["sections"]
+        finally:
+            os.chdir(cwd)
+
+    print(json.dumps({
+        "sections": sections,
+        "build_ms": round(build * 1000),
+        "refresh_ms": round(refresh * 1000, 1),
+        "edit_ms": round(edit * 1000, 1),
+        "load_and_query_ms": round(loads[len(loads) // 2] * 1000, 2),
+        "queries": queries
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
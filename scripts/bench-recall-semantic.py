@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+bench-recall-semantic.py - Benchmark semantic recall on a large memory.
+
+Builds a throwaway tenant whose knowledge/ files hold about --sections
+markdown sections and frontmatter fields, then times:
+- build: first refresh (embedding every section)
+- refresh: a no-change refresh (one stat per file)
+- touch: a refresh after one file changed (re-embeds only that file)
+- ivf_train: training the IVF centroids used by approximate search
+- query: exact and approximate life_semantic search for a few queries,
+  with the overlap between the two top-10 lists
+
+Usage:
+    python scripts/bench-recall-semantic.py [--sections 10000] [--runs 20]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "src" / "tools" / "python"
+sys.path.insert(0, str(TOOLS_DIR))
+import frontmatter
+from life_semantic import LifeSemantic
+
+WORDS = (
+    "buyer seller listing showing offer inspection appraisal closing escrow mortgage "
+    "downtown suburb school commute garage kitchen remodel budget preapproval lender "
+    "morning afternoon weekend call email text follow reminder price reduction market"
+).split()
+
+QUERIES = ["kitchen remodel budget", "morning showings", "mortgage lender preapproval", "escrow closing weekend"]
+
+
+def seed_tenant(root: Path, sections: int, per_file: int = 50):
+    """Write files of per_file sections each; a third of them as frontmatter notes."""
+    rng = random.Random(7)
+    folder = root / "knowledge"
+    folder.mkdir(parents=True)
+
+    for f in range(sections // per_file):
+        notes = [{"note": " ".join(rng.choices(WORDS, k=12))} for i in range(per_file // 3)]
+        body = "".join(
+            f"\n## Topic {f}-{i}\n{' '.join(rng.choices(WORDS, k=40))}\n"
+            for i in range(per_file - len(notes))
+        )
+        (folder / f"topic-{f}.md").write_text(frontmatter.serialize({"notes": notes}, body), encoding="utf-8")
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sections", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            seed_tenant(Path(tmp), args.sections)
+
+            build = timed(lambda: LifeSemantic().refresh())
+            refresh = timed(lambda: LifeSemantic().refresh())
+
+            touched = Path("knowledge/topic-0.md")
+            touched.write_text(touched.read_text(encoding="utf-8") + "\nescrow reminder\n", encoding="utf-8")
+            touch = timed(lambda: LifeSemantic().refresh())
+
+            index = LifeSemantic()
+            train = timed(index.train_ivf)
+            queries = {}
+            for query in QUERIES:
+                result = {}
+                for mode, approximate in (("exact", False), ("approximate", True)):
+                    samples = sorted(
+                        timed(lambda: index.search(query, approximate=approximate)) for _ in range(args.runs)
+                    )
+                    result[f"{mode}_ms"] = round(samples[len(samples) // 2] * 1000, 2)
+                exact = {(h["file"], h.get("path"), h.get("line")) for h in index.search(query, approximate=False)["hits"]}
+                approx = {(h["file"], h.get("path"), h.get("line")) for h in index.search(query, approximate=True)["hits"]}
+                result["recall_at_10"] = round(len(exact & approx) / len(exact), 2) if exact else None
+                queries[query] = result
+            sections = index.table["rows"]
+        finally:
+            os.chdir(cwd)
+
+    print(json.dumps({
+        "sections": sections,
+        "build_ms": round(build * 1000),
+        "refresh_ms": round(refresh * 1000, 1),
+        "touch_ms": round(touch * 1000, 1),
+        "ivf_train_ms": round(train * 1000),
+        "queries": queries
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+bench-recall.py - Benchmark structured recall against the legacy subprocess fan-out.
+
+Builds a throwaway tenant folder with populated life files, then times:
+- in-process: one `recall.py` launch with {"structured": true} (current behaviour)
+- fan-out: one `recall.py` launch plus one `life_read.py` launch per life
+  file, which is what structured recall used to cost
+
+Usage:
+    python scripts/bench-recall.py [--runs 10]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "src" / "tools" / "python"
+sys.path.insert(0, str(TOOLS_DIR))
+import frontmatter
+from recall import get_all_life_files
+
+
+def seed_tenant(root: Path):
+    """Write a realistic set of life files into a tenant folder."""
+    files = {
+        "identity/profile.md": {"version": 1, "name": "Jane Realtor", "timezone": "America/Denver"},
+        "life/boundaries.md": {"version": 1, "neverDo": [f"never rule {i}" for i in range(50)]},
+        "life/patterns.md": {
+            "version": 1,
+            "work": [{"id": f"w{i}", "pattern": f"works on listings batch {i}", "confidence": "high"} for i in range(200)]
+        },
+        "life/questions.md": {
+            "version": 1,
+            "pending": [{"id": f"q{i}", "question": f"question {i}?", "priority": "low"} for i in range(50)]
+        },
+        "knowledge/services.md": {"version": 1, "services": [f"service {i}" for i in range(100)]},
+        "knowledge/policies.md": {"version": 1, "policies": [f"policy {i}" for i in range(100)]},
+    }
+    for rel, data in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(frontmatter.serialize(data, "\n# Notes\nlistings and showings\n"), encoding="utf-8")
+    (root / "relationships" / "contacts").mkdir(parents=True, exist_ok=True)
+
+
+def run_tool(script: str, payload: dict, cwd: Path):
+    subprocess.run(
+        [sys.executable, str(TOOLS_DIR / script)],
+        input=json.dumps(payload),
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        check=False
+    )
+
+
+def time_runs(fn, runs: int) -> float:
+    """Return the median wall time of fn over runs."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        seed_tenant(root)
+        payload = {"query": "listing", "structured": True}
+
+        def in_process():
+            run_tool("recall.py", payload, root)
+
+        def fan_out():
+            run_tool("recall.py", payload, root)
+            for name in get_all_life_files():
+                run_tool("life_read.py", {"file": name, "query": payload["query"]}, root)
+
+        new = time_runs(in_process, args.runs)
+        old = time_runs(fan_out, args.runs)
+
+    print(json.dumps({
+        "runs": args.runs,
+        "in_process_ms": round(new * 1000, 1),
+        "fan_out_ms": round(old * 1000, 1),
+        "speedup": round(old / new, 1)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
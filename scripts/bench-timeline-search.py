@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+bench-timeline-search.py - Benchmark timeline_search on a long history.
+
+Builds a throwaway tenant with --days busy timeline day files of --events
+events each (mostly MESSAGE, some TOOL), then times:
+- index: first refresh of every day's sidecar index
+- refresh: a no-change refresh (one stat and one header check per day)
+- search: timeline_search over the whole range for each query, reporting
+  the bytes of journal read through the index (total is null when the
+  query opted out with "exact_total": false) (group_by queries are
+  answered from the columnar archive, compacted on the first run)
+
+Usage:
+    python scripts/bench-timeline-search.py [--days 90] [--events 400] [--runs 5]
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "src" / "tools" / "python"
+sys.path.insert(0, str(TOOLS_DIR))
+import timeline_index
+import timeline_search
+from timeline_index import DayIndex
+
+WORDS = (
+    "buyer seller listing showing offer inspection appraisal closing escrow mortgage "
+    "campaign email queued approval prospect denver realtor reply follow schedule"
+).split()
+
+QUERIES = [
+    {"type": "TOOL"},
+    {"type": "SCHEDULED"},
+    {"query": "escrow"},
+    {"query": "escrow", "exact_total": False},
+    {"q": "escrow"},
+    {"q": "escrow NOT denver type:MESSAGE"},
+    {"q": "\"escrow mortgage\" OR (appraisal AND realtor)"},
+    {"group_by": ["type", "day"]},
+    {"group_by": "hour", "type": "TOOL"},
+]
+
+
+def seed_tenant(root: Path, days: int, events: int) -> tuple[str, str]:
+    """Write days of journals ending 2026-03-31; returns the (from, to) range."""
+    rng = random.Random(11)
+    folder = root / "timeline"
+    folder.mkdir(parents=True)
+    end = date(2026, 3, 31)
+    start = end - timedelta(days=days - 1)
+
+    for d in range(days):
+        day = (start + timedelta(days=d)).isoformat()
+        parts = [f"# Timeline - {day}\n\n## Events\n\n"]
+        for i in range(events):
+            t = f"{(i * 86399 // events) // 3600:02d}:{(i * 86399 // events) // 60 % 60:02d}:{i * 86399 // events % 60:02d}"
+            if i % 20 == 0:
+                parts.append(f"### {t} [TOOL] recall (success, {rng.randint(5, 900)}ms)\n\n---\n\n")
+            else:
+                direction = rng.choice(["Inbound from", "Outbound to"])
+                parts.append(f"### {t} [MESSAGE] {direction} ***{rng.randint(1000, 9999)}\n{' '.join(rng.choices(WORDS, k=30))}\n\n---\n\n")
+        (folder / f"{day}.md").write_text("".join(parts), encoding="utf-8")
+
+    return start.isoformat(), end.isoformat()
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def refresh_all(first: str, last: str) -> None:
+    current, end = date.fromisoformat(first), date.fromisoformat(last)
+    while current <= end:
+        DayIndex(current.isoformat()).refresh()
+        current += timedelta(days=1)
+
+
+def run_search(params: dict) -> dict:
+    sys.stdin = io.StringIO(json.dumps(params))
+    out = io.StringIO()
+    with redirect_stdout(out):
+        timeline_search.main()
+    return json.loads(out.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--events", type=int, default=400)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    # Count the journal bytes read through DayIndex
+    read_bytes = [0]
+    read_event = DayIndex.read_event
+
+    def counting_read_event(self, entry, f=None):
+        if f is not None:
+            read_bytes[0] += entry[timeline_index.LENGTH]
+        return read_event(self, entry, f)
+
+    DayIndex.read_event = counting_read_event
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            first, last = seed_tenant(Path(tmp), args.days, args.events)
+            journal_bytes = sum(p.stat().st_size for p in Path("timeline").iterdir())
+
+            index = timed(lambda: refresh_all(first, last))
+            refresh = timed(lambda: refresh_all(first, last))
+
+            queries = {}
+            for query in QUERIES:
+                params = {"from": first, "to": last, "limit": 20, **query}
+                samples = sorted(timed(lambda: run_search(params)) for _ in range(args.runs))
+                read_bytes[0] = 0
+                result = run_search(params)
+                queries[json.dumps(query)] = {
+                    "ms": round(samples[len(samples) // 2] * 1000, 1),
+                    "total": result["aggregate"]["count"] if "aggregate" in result else result.get("total"),
+                    "kb_read": round(read_bytes[0] / 1024, 1)
+                }
+        finally:
+            os.chdir(cwd)
+
+    print(json.dumps({
+        "days": args.days,
+        "events": args.days * args.events,
+        "journal_kb": round(journal_bytes / 1024),
+        "index_ms": round(index * 1000),
+        "refresh_ms": round(refresh * 1000, 1),
+        "queries": queries
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
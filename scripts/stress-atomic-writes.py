@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+stress-atomic-writes.py - Check that parallel tool processes never lose an append.
+
+Builds a throwaway tenant folder, then runs N concurrent writers, each
+launching the real tools M times:
+- life_write.py         append to life/patterns.md (work)
+- update_state.py       append to state/current.json (activeTasks)
+- queue_action.py       append to state/pending_approvals.json (pending)
+- save_deal.py          append to state/deals.json (deals)
+
+Every append carries a unique id; the run fails (exit 1) if any id is
+missing from the final files.
+
+Usage:
+    python scripts/stress-atomic-writes.py [--writers 10] [--appends 20]
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TOOLS_DIR = ROOT / "src" / "tools" / "python"
+sys.path.insert(0, str(TOOLS_DIR))
+import frontmatter
+
+
+def seed_tenant(root: Path):
+    """Create the state files and tool layout the writers need."""
+    (root / "state").mkdir(parents=True)
+    (root / "state" / "current.json").write_text(json.dumps({"activeTasks": []}), encoding="utf-8")
+
+    # save_deal.py finds state/ and shared_tools/ relative to its own folder
+    (root / "execution").mkdir()
+    (root / "shared_tools").mkdir()
+    shutil.copy(ROOT / "tenants" / "anden" / "execution" / "save_deal.py", root / "execution")
+    shutil.copy(TOOLS_DIR / "atomic_io.py", root / "shared_tools")
+
+
+def run_tool(script: Path, payload: dict, cwd: Path):
+    result = subprocess.run(
+        [sys.executable, str(script)],
+        input=json.dumps(payload),
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        check=False
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{script.name} failed: {result.stdout or result.stderr}")
+
+
+def writer(root: Path, writer_id: int, appends: int):
+    for n in range(appends):
+        key = f"{writer_id}-{n}"
+        run_tool(TOOLS_DIR / "life_write.py", {
+            "file": "patterns",
+            "operation": "append",
+            "path": "work",
+            "value": {"id": key, "pattern": f"pattern {key}"}
+        }, root)
+        run_tool(TOOLS_DIR / "update_state.py", {
+            "file": "current",
+            "operation": "append",
+            "path": "activeTasks",
+            "value": key
+        }, root)
+        run_tool(TOOLS_DIR / "queue_action.py", {
+            "campaign_id": "stress",
+            "target_id": key,
+            "target_name": key,
+            "action_type": "send_email",
+            "body": "hello"
+        }, root)
+        run_tool(root / "execution" / "save_deal.py", {
+            "title": key,
+            "source": "facebook",
+            "buy_price": 1,
+            "estimated_sell": 2,
+            "margin_pct": 50
+        }, root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=10)
+    parser.add_argument("--appends", type=int, default=20)
+    args = parser.parse_args()
+
+    expected = {f"{w}-{n}" for w in range(args.writers) for n in range(args.appends)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        seed_tenant(root)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.writers) as pool:
+            futures = [pool.submit(writer, root, w, args.appends) for w in range(args.writers)]
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - start
+
+        patterns, _ = frontmatter.parse((root / "life" / "patterns.md").read_text(encoding="utf-8"))
+        state = root / "state"
+        found = {
+            "life_write": {item["id"] for item in patterns.get("work", [])},
+            "update_state": set(json.loads((state / "current.json").read_text())["activeTasks"]),
+            "queue_action": {a["target_id"] for a in json.loads((state / "pending_approvals.json").read_text())["pending"]},
+            "save_deal": {d["title"] for d in json.loads((state / "deals.json").read_text())["deals"]},
+        }
+
+    lost = {tool: len(expected - ids) for tool, ids in found.items()}
+    print(json.dumps({
+        "writers": args.writers,
+        "appends_per_writer": args.appends,
+        "seconds": round(elapsed, 1),
+        "lost": lost
+    }, indent=2))
+
+    if any(lost.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
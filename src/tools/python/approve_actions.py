@@ -22,26 +22,80 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+# Add this directory to path for shared write layer imports
+sys.path.insert(0, str(Path(__file__).parent))
+import atomic_io
 
-def load_pending_approvals() -> dict:
-    """Load pending approvals file."""
-    file_path = Path("state") / "pending_approvals.json"
 
-    if not file_path.exists():
-        return {
-            "version": 1,
-            "pending": [],
-            "history": []
-        }
+PENDING_APPROVALS_FILE = Path("state") / "pending_approvals.json"
+
+
+def new_pending_approvals() -> dict:
+    """Initial contents of the pending approvals file."""
+    return {
+        "version": 1,
+        "pending": [],
+        "history": []
+    }
+
+
+def approve_pending(data: dict, action_ids: list, approve_all: bool, campaign_id: str | None) -> int:
+    """Mark matching pending actions approved in place. Returns the count."""
+    now = datetime.utcnow()
+    approved_count = 0
+
+    for action in data.get("pending", []):
+        # Skip non-pending
+        if action.get("status") != "pending":
+            continue
+
+        # Check if expired
+        expires_at = action.get("expires_at", "")
+        if expires_at:
+            expires = datetime.fromisoformat(expires_at.replace("Z", ""))
+            if expires <= now:
+                continue
+
+        # Check filters
+        should_approve = False
+        if approve_all:
+            if campaign_id:
+                should_approve = action.get("campaign_id") == campaign_id
+            else:
+                should_approve = True
+        else:
+            should_approve = action["id"] in action_ids
+
+        if should_approve:
+            action["status"] = "approved"
+            action["approved_at"] = now.isoformat() + "Z"
+
+            # Add to history
+            data["history"].insert(0, {
+                "id": action["id"],
+                "action_type": action.get("action_type"),
+                "target_name": action.get("target_name"),
+                "status": "approved",
+                "approved_at": action["approved_at"]
+            })
 
-    return json.loads(file_path.read_text(encoding="utf-8"))
+            approved_count += 1
 
+    # Keep history manageable
+    if len(data["history"]) > 500:
+        data["history"] = data["history"][:500]
 
-def save_pending_approvals(data: dict):
-    """Save pending approvals file."""
-    file_path = Path("state") / "pending_approvals.json"
-    data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
-    file_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return approved_count
+
+
+def update_pending_approvals(mutate):
+    """Apply mutate(data) to the pending approvals file under its lock."""
+    def stamped(data: dict):
+        result = mutate(data)
+        data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
+        return result
+
+    return atomic_io.update_json(PENDING_APPROVALS_FILE, stamped, default=new_pending_approvals)
 
 
 def main():
@@ -58,52 +112,9 @@ def main():
         if not action_ids and not approve_all:
             raise ValueError("Must provide action_ids or set approve_all=true")
 
-        data = load_pending_approvals()
-        now = datetime.utcnow()
-        approved_count = 0
-
-        for action in data.get("pending", []):
-            # Skip non-pending
-            if action.get("status") != "pending":
-                continue
-
-            # Check if expired
-            expires_at = action.get("expires_at", "")
-            if expires_at:
-                expires = datetime.fromisoformat(expires_at.replace("Z", ""))
-                if expires <= now:
-                    continue
-
-            # Check filters
-            should_approve = False
-            if approve_all:
-                if campaign_id:
-                    should_approve = action.get("campaign_id") == campaign_id
-                else:
-                    should_approve = True
-            else:
-                should_approve = action["id"] in action_ids
-
-            if should_approve:
-                action["status"] = "approved"
-                action["approved_at"] = now.isoformat() + "Z"
-
-                # Add to history
-                data["history"].insert(0, {
-                    "id": action["id"],
-                    "action_type": action.get("action_type"),
-                    "target_name": action.get("target_name"),
-                    "status": "approved",
-                    "approved_at": action["approved_at"]
-                })
-
-                approved_count += 1
-
-        # Keep history manageable
-        if len(data["history"]) > 500:
-            data["history"] = data["history"][:500]
-
-        save_pending_approvals(data)
+        approved_count = update_pending_approvals(
+            lambda data: approve_pending(data, action_ids, approve_all, campaign_id)
+        )
 
         result = {
             "status": "success",
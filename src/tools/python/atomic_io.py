@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+atomic_io.py - Crash-safe, lock-protected writes for tenant files.
+
+Tool processes run concurrently (PythonRunnerService allows up to 10 at
+once), so a plain read -> modify -> write_text() can lose another
+process's update or leave a half-written file behind. Every write here:
+
+1. takes an exclusive fcntl advisory lock on a `.<name>.lock` sidecar
+   (the target itself is replaced, so it can't carry the lock)
+2. writes the new content to a temp file in the same folder and fsyncs it
+3. checks the target's fingerprint (inode, mtime_ns, size) still matches
+   what was read, to catch writers that don't take the lock (the Node
+   services write some of these files directly)
+4. os.replace()s the temp file over the target
+
+A fingerprint mismatch raises ConflictError; transaction() and
+update_json() re-read and re-apply the change, up to RETRIES times.
+
+Usage:
+    sys.path.insert(0, str(Path(__file__).parent))
+    import atomic_io
+
+    def add(data):
+        data["pending"].append(action)
+
+    atomic_io.update_json(Path("state/pending_approvals.json"), add, default=dict)
+    atomic_io.write_text(Path("life/patterns.md"), content)
+"""
+
+import os
+import json
+import time
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory locks on Windows dev machines; writes are still atomic
+    fcntl = None
+
+
+RETRIES = 5
+RETRY_DELAY = 0.01
+
+# Sentinel for "don't check the fingerprint before replacing"
+UNCHECKED = object()
+
+_held: dict[str, int] = {}
+
+
+class ConflictError(RuntimeError):
+    """The target changed between being read and being replaced."""
+
+
+def lock_path(path: Path) -> Path:
+    """Sidecar lock file for path."""
+    path = Path(path)
+    return path.with_name(f".{path.name}.lock")
+
+
+def fingerprint(path: Path) -> tuple | None:
+    """(inode, mtime_ns, size) of path, or None if it doesn't exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+@contextmanager
+def locked(path: Path):
+    """
+    Hold an exclusive lock on path for the duration of the block.
+
+    Re-entrant within a process, so a locked caller can call helpers that
+    lock the same file.
+    """
+    key = os.path.abspath(path)
+    if _held.get(key) or fcntl is None:
+        _held[key] = _held.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            _held[key] -= 1
+        return
+
+    lock_file = lock_path(path)
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        _held[key] = 1
+        try:
+            yield
+        finally:
+            _held[key] = 0
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def index_locked(path: Path):
+    """
+    locked(path) for an index's refresh-and-save, or no lock if the lock
+    file can't be created (a read-only tenant, which never writes the
+    index anyway).
+    """
+    with ExitStack() as stack:
+        try:
+            stack.enter_context(locked(path))
+        except OSError:
+            pass
+        yield
+
+
+def write_text(path: Path, content: str, expected=UNCHECKED) -> None:
+    """
+    Atomically replace path with content.
+
+    If expected is given (a fingerprint() result, None meaning "must not
+    exist yet"), raise ConflictError instead of overwriting a file that
+    changed since it was read.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+    with locked(path):
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+
+            if expected is not UNCHECKED and fingerprint(path) != expected:
+                raise ConflictError(f"{path} was modified by another process")
+
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    _fsync_dir(path.parent)
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Make the rename itself durable (best effort, POSIX only)."""
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_json(path: Path, data, indent: int | None = 2, expected=UNCHECKED) -> None:
+    """Atomically replace path with data serialized as JSON."""
+    write_text(path, json.dumps(data, indent=indent), expected=expected)
+
+
+def transaction(path: Path, attempt, retries: int = RETRIES):
+    """
+    Run attempt(expected) under path's lock, retrying on ConflictError.
+
+    attempt should read path, compute the new content and write it with
+    write_text/write_json(..., expected=expected). Its return value is
+    returned.
+    """
+    with locked(path):
+        for i in range(retries):
+            try:
+                return attempt(fingerprint(path))
+            except ConflictError:
+                time.sleep(RETRY_DELAY * (i + 1))
+
+    raise ConflictError(f"{path} kept changing while being updated; gave up after {retries} attempts")
+
+
+def update_json(path: Path, mutate, default=None, indent: int | None = 2, retries: int = RETRIES):
+    """
+    Read-modify-write a JSON file safely.
+
+    mutate(data) changes data in place and may return a result, which is
+    passed back. If it raises, the file is left untouched. default is a
+    factory for the initial data when the file doesn't exist; without it a
+    missing file raises FileNotFoundError.
+    """
+    path = Path(path)
+
+    def attempt(expected):
+        if expected is None:
+            if default is None:
+                raise FileNotFoundError(f"File not found: {path}")
+            data = default()
+        else:
+            data = json.loads(path.read_text(encoding="utf-8"))
+
+        result = mutate(data)
+        write_json(path, data, indent=indent, expected=expected)
+        return result
+
+    return transaction(path, attempt, retries)
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+campaign_analytics.py - Funnel, time-in-stage, touch and channel reports across campaigns.
+
+campaign_read summarises one campaign's stages at a time. This loads every
+campaign's targets (both formats, pending target changes included) into
+one set of columns - an array per attribute, one slot per target:
+
+    campaign        campaign code (index into the folder names)
+    stage           pipeline position (STAGES index; LOST, UNKNOWN otherwise)
+    touches         touch count
+    added           when the target was added (epoch seconds, NaN if unknown)
+    stage_since     when it entered its current stage (NaN if unknown)
+    channels        per channel: touches on that channel
+
+plus the campaign logs' events, then aggregates per group (everything, per
+campaign or per cohort of the week/month targets were added in):
+
+- funnel: targets that reached each pipeline stage and the conversion from
+  the previous one (a target counts as having reached every stage up to its
+  current one; lost targets only count as identified)
+- time_in_stage: percentiles of how long targets have been in their
+  current stage (days)
+- touches: touch-count histogram, mean and percentiles
+- channels: per channel, targets touched, touches, targets that replied
+  (replied, qualified, booked or won) and the reply rate
+- activity: campaign log events by type
+
+Reference targets record stage_changed_at and touches_by_channel from
+campaign_write; ones written before that count towards time_in_stage only
+while identified (since added_at) and their touches go to "unrecorded".
+
+Input JSON:
+{
+    "campaigns": ["q1-outreach"],     // optional - default: all campaigns
+    "from": "2026-01-01",             // optional - targets added / events on or after
+    "to": "2026-03-31",               // optional - targets added / events on or before
+    "group_by": "total",              // optional - total (default), campaign or cohort
+    "cohort": "week",                 // optional - week (default) or month
+    "percentiles": [50, 90]           // optional
+}
+
+Output JSON:
+{
+    "status": "success",
+    "targets": 1200,
+    "groups": [{
+        "group": "2026-W10",
+        "targets": 140,
+        "funnel": [{"stage": "identified", "reached": 140, "conversion": null}, {"stage": "researched", "reached": 90, "conversion": 0.643}, ...],
+        "lost": 12,
+        "time_in_stage": {"contacted": {"targets": 40, "p50_days": 6.2, "p90_days": 19.0}},
+        "touches": {"histogram": {"0": 30, "1": 52, "2": 33, "3": 15, "4": 6, "5+": 4}, "mean": 1.4, "p50": 1, "p90": 3},
+        "channels": {"email": {"targets": 110, "touches": 190, "replied": 21, "reply_rate": 0.191}},
+        "activity": {"CREATED": 1, "REPLY": 21}
+    }]
+}
+"""
+
+import sys
+import json
+import re
+import math
+import time
+from array import array
+from collections import Counter
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+# Add this directory to path for the shared target store
+sys.path.insert(0, str(Path(__file__).parent))
+from campaign_targets import TargetStore
+from campaign_log import CampaignLog
+
+
+CAMPAIGNS_DIR = Path("operations") / "campaigns"
+
+STAGES = ["identified", "researched", "contacted", "replied", "qualified", "booked", "won"]
+LOST = len(STAGES)
+UNKNOWN = -1
+STAGE_CODES = {**{stage: code for code, stage in enumerate(STAGES)}, "lost": LOST}
+REPLIED = {STAGE_CODES[stage] for stage in ("replied", "qualified", "booked", "won")}
+
+NAN = float("nan")
+DAY = 86400.0
+
+
+def parse_time(value) -> float:
+    """An ISO timestamp as epoch seconds (naive ones taken as UTC), or NaN."""
+    if not value:
+        return NAN
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return NAN
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class TargetColumns:
+    """Every loaded target, one array per attribute."""
+
+    def __init__(self):
+        self.campaigns: list[str] = []
+        self.campaign = array("l")
+        self.stage = array("b")
+        self.touches = array("l")
+        self.added = array("d")
+        self.stage_since = array("d")
+        self.channels: dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.stage)
+
+    def append(self, campaign: int, stage: str, touches: int, added: float, stage_since: float, channels: dict) -> None:
+        for name in channels:
+            if name not in self.channels:
+                self.channels[name] = array("l", [0]) * len(self)
+        self.campaign.append(campaign)
+        self.stage.append(STAGE_CODES.get(stage, UNKNOWN))
+        self.touches.append(touches)
+        self.added.append(added)
+        self.stage_since.append(stage_since)
+        for name, column in self.channels.items():
+            column.append(channels.get(name, 0))
+
+    def add_reference(self, campaign: int, ref: dict) -> None:
+        stage = ref.get("campaign_stage", "unknown")
+        touches = ref.get("touch_count", 0) or 0
+        added = parse_time(ref.get("added_at"))
+        since = parse_time(ref.get("stage_changed_at"))
+        if math.isnan(since) and stage == "identified":
+            since = added
+        channels = ref.get("touches_by_channel") or ({"unrecorded": touches} if touches else {})
+        self.append(campaign, stage, touches, added, since, channels)
+
+    def add_legacy(self, campaign: int, target: dict) -> None:
+        touches = target.get("touches") or []
+        channels = Counter(touch.get("channel") or "unrecorded" for touch in touches)
+        self.append(
+            campaign,
+            target.get("stage", "unknown"),
+            len(touches),
+            parse_time(target.get("created_at")),
+            parse_time(target.get("stage_changed_at")),
+            channels,
+        )
+
+
+def campaign_folders(names: list[str] | None = None) -> list[Path]:
+    if names:
+        folders = [CAMPAIGNS_DIR / re.sub(r"[^a-z0-9-]", "-", name.lower()) for name in names]
+        return [folder for folder in folders if folder.is_dir()]
+    if not CAMPAIGNS_DIR.exists():
+        return []
+    return sorted(entry for entry in CAMPAIGNS_DIR.iterdir() if entry.is_dir())
+
+
+def load(folders: list[Path]) -> tuple[TargetColumns, list[tuple[float, int, str]]]:
+    """Columns of every target in the folders, and (epoch, campaign code, type) per log event."""
+    columns = TargetColumns()
+    events = []
+    for folder in folders:
+        code = len(columns.campaigns)
+        columns.campaigns.append(folder.name)
+
+        data, _ = TargetStore(folder).load()
+        for ref in data.get("target_references", []):
+            columns.add_reference(code, ref)
+        for target in data.get("targets", []):
+            columns.add_legacy(code, target)
+
+        for event in CampaignLog(folder).window():
+            events.append((parse_time(event.get("timestamp")), code, event.get("type", "")))
+    return columns, events
+
+
+# -- aggregation -----------------------------------------------------------
+
+def stage_name(code: int) -> str:
+    if 0 <= code < LOST:
+        return STAGES[code]
+    return "lost" if code == LOST else "unknown"
+
+
+def percentile(values: list, pct: float):
+    """Nearest-rank percentile of sorted values, or None if there are none."""
+    if not values:
+        return None
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+def cohort_key(epoch: float, cohort: str) -> str:
+    if math.isnan(epoch):
+        return "unknown"
+    day = datetime.fromtimestamp(epoch, timezone.utc).date()
+    if cohort == "month":
+        return day.strftime("%Y-%m")
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def report(columns: TargetColumns, rows: list[int], event_types: list[str], now: float, percentiles: list) -> dict:
+    """Funnel, time in stage, touches, channels and log activity of the given target rows."""
+    stage = columns.stage
+
+    counts = Counter(stage[i] for i in rows)
+    reached = [0] * len(STAGES)
+    running = 0
+    for code in reversed(range(len(STAGES))):
+        running += counts.get(code, 0)
+        reached[code] = running
+    # Every target was identified, whatever became of it
+    reached[0] = len(rows)
+    funnel = [
+        {
+            "stage": name,
+            "reached": reached[code],
+            "conversion": round(reached[code] / reached[code - 1], 3) if code and reached[code - 1] else None
+        }
+        for code, name in enumerate(STAGES)
+    ]
+
+    since = columns.stage_since
+    dwell = {}
+    for i in rows:
+        if not math.isnan(since[i]):
+            dwell.setdefault(stage[i], []).append(max(0.0, now - since[i]) / DAY)
+    time_in_stage = {}
+    for code in sorted(dwell):
+        days = sorted(dwell[code])
+        time_in_stage[stage_name(code)] = {
+            "targets": len(days),
+            **{f"p{pct}_days": round(percentile(days, pct), 1) for pct in percentiles}
+        }
+
+    touches = sorted(columns.touches[i] for i in rows)
+    histogram = Counter(min(count, 5) for count in touches)
+    touch_report = {
+        "histogram": {("5+" if n == 5 else str(n)): histogram.get(n, 0) for n in range(6)},
+        "mean": round(sum(touches) / len(touches), 2) if touches else 0,
+        **{f"p{pct}": percentile(touches, pct) for pct in percentiles}
+    }
+
+    channels = {}
+    for name, column in sorted(columns.channels.items()):
+        touched = [i for i in rows if column[i]]
+        if not touched:
+            continue
+        replied = sum(1 for i in touched if stage[i] in REPLIED)
+        channels[name] = {
+            "targets": len(touched),
+            "touches": sum(column[i] for i in touched),
+            "replied": replied,
+            "reply_rate": round(replied / len(touched), 3)
+        }
+
+    return {
+        "targets": len(rows),
+        "funnel": funnel,
+        "lost": counts.get(LOST, 0),
+        "time_in_stage": time_in_stage,
+        "touches": touch_report,
+        "channels": channels,
+        "activity": dict(sorted(Counter(event_types).items()))
+    }
+
+
+def analyse(columns: TargetColumns, events: list, start: float = -math.inf, end: float = math.inf,
+            group_by: str = "total", cohort: str = "week", percentiles=(50, 90), now: float | None = None) -> list[dict]:
+    """One report per group of targets (and log events) in the [start, end) window."""
+    if group_by not in ("total", "campaign", "cohort"):
+        raise ValueError(f"Invalid group_by: {group_by}. Must be one of: total, campaign, cohort")
+    if cohort not in ("week", "month"):
+        raise ValueError(f"Invalid cohort: {cohort}. Must be week or month")
+    now = time.time() if now is None else now
+    windowed = start != -math.inf or end != math.inf
+
+    cohorts = {}
+
+    def group_of(epoch: float, campaign: int) -> str:
+        if group_by == "campaign":
+            return columns.campaigns[campaign]
+        if group_by == "cohort":
+            # One date conversion per day seen, not per target
+            day = None if math.isnan(epoch) else int(epoch // DAY)
+            if day not in cohorts:
+                cohorts[day] = cohort_key(NAN if day is None else day * DAY, cohort)
+            return cohorts[day]
+        return "all"
+
+    def in_window(epoch: float) -> bool:
+        # NaN compares False, so undated rows drop out of a windowed report
+        return not windowed or start <= epoch < end
+
+    rows = {}
+    added, campaign = columns.added, columns.campaign
+    for i in range(len(columns)):
+        if in_window(added[i]):
+            rows.setdefault(group_of(added[i], campaign[i]), []).append(i)
+    types = {}
+    for epoch, code, event_type in events:
+        if in_window(epoch):
+            types.setdefault(group_of(epoch, code), []).append(event_type)
+
+    return [
+        {"group": group, **report(columns, rows.get(group, []), types.get(group, []), now, list(percentiles))}
+        for group in sorted(set(rows) | set(types))
+    ]
+
+
+def main():
+    try:
+        raw = sys.stdin.read().strip()
+        input_data = json.loads(raw) if raw else {}
+
+        start = end = None
+        if input_data.get("from"):
+            start = datetime.combine(date.fromisoformat(input_data["from"]), datetime.min.time(), timezone.utc).timestamp()
+        if input_data.get("to"):
+            end = datetime.combine(date.fromisoformat(input_data["to"]), datetime.min.time(), timezone.utc).timestamp() + DAY
+
+        columns, events = load(campaign_folders(input_data.get("campaigns")))
+        groups = analyse(
+            columns, events,
+            start=-math.inf if start is None else start,
+            end=math.inf if end is None else end,
+            group_by=input_data.get("group_by", "total"),
+            cohort=input_data.get("cohort", "week"),
+            percentiles=input_data.get("percentiles", [50, 90]),
+        )
+
+        print(json.dumps({
+            "status": "success",
+            "targets": sum(group["targets"] for group in groups),
+            "groups": groups
+        }))
+
+    except Exception as e:
+        error_result = {
+            "status": "error",
+            "message": str(e)
+        }
+        print(json.dumps(error_result))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+campaign_log.py - Append-only campaign event log with tail and window reads.
+
+log.md used to hold a campaign's events in its frontmatter, so logging one
+event read and rewrote up to a thousand of them. The log now splits into:
+
+    log.jsonl       every event, oldest first, one per line:
+                    {"timestamp": "2026-03-01T09:12:44.120934Z", "type": "INFO", "message": "..."}
+    log.md          the view people (and the Node services) read: the newest
+                    VIEW_EVENTS events in its frontmatter, newest first, and
+                    whatever markdown body it already had
+
+plus a sparse offset index under state/.index/campaigns/<campaign>/log.marshal
+with one mark every SPARSE_EVERY events:
+
+    [byte_offset, latest timestamp of the events before it]
+
+So:
+- append() writes one line, whatever the log's size
+- tail(n) reads the file backwards from its end until it has n events
+- window(start, end) bisects the marks for the first one that can hold
+  an event at or after start and reads forward from there until end;
+  events are appended in time order, so the scan stops at the first later one
+- the index refresh only parses lines appended since the last one
+
+log.md is rebuilt from the tail (one rewrite, keeping the body the Node
+services append to) once COMPACT_BYTES of events are uncompacted or the
+oldest of them is COMPACT_AGE seconds old, checked on every append, or on
+demand by compact() (campaign_write's compact operation); reads never
+write. Campaigns logged before log.jsonl existed are backfilled from
+log.md's frontmatter events the first time they are appended to; until
+then reads serve log.md's events.
+
+Appends keep log.jsonl in time order, which window() relies on: an event
+stamped before the newest one already in the file (buffered by a batch, or
+written first by another process) takes that one's timestamp.
+
+begin() buffers appends in memory (reads don't see them) until commit()
+writes them in one go, or rollback() drops them; campaign_write's batch
+mode uses this.
+
+Usage:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from campaign_log import CampaignLog
+
+    log = CampaignLog(Path("operations/campaigns/q1-outreach"))
+    log.append("INFO", "Sequence paused")
+    log.tail(20)
+    log.window("2026-03-01", "2026-03-08")
+"""
+
+import sys
+import os
+import json
+import marshal
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+
+# Add this directory to path for shared codec imports
+sys.path.insert(0, str(Path(__file__).parent))
+import atomic_io
+import frontmatter
+
+
+INDEX_VERSION = 1
+CAMPAIGN_INDEX_DIR = Path("state") / ".index" / "campaigns"
+
+SPARSE_EVERY = 64
+VIEW_EVENTS = 1000
+COMPACT_BYTES = 32 * 1024
+COMPACT_AGE = 300
+
+READ_BLOCK = 64 * 1024
+LINE_BLOCK = 4096
+
+# Mark fields
+OFFSET, BEFORE = range(2)
+
+
+def encode_event(event: dict) -> str:
+    return json.dumps(event, ensure_ascii=False) + "\n"
+
+
+def parse_lines(chunk: bytes) -> tuple[list[tuple[int, dict]], int]:
+    """
+    (offset in chunk, event) for each complete line, and the bytes those
+    lines take up; a torn last line is left out.
+    """
+    events = []
+    offset = 0
+    for line in chunk.splitlines(keepends=True):
+        if not line.endswith(b"\n"):
+            break
+        try:
+            event = json.loads(line)
+        except ValueError:
+            event = None
+        if isinstance(event, dict):
+            events.append((offset, event))
+        offset += len(line)
+    return events, offset
+
+
+class CampaignLog:
+    """One campaign's events: log.jsonl, its sparse index and the log.md view."""
+
+    def __init__(self, campaign_path: Path, index_dir: Path = CAMPAIGN_INDEX_DIR):
+        self.campaign_path = Path(campaign_path)
+        self.path = self.campaign_path / "log.jsonl"
+        self.view_path = self.campaign_path / "log.md"
+        self.index_path = Path(index_dir) / self.campaign_path.name / "log.marshal"
+        self._index: dict | None = None
+        # Buffered appends between begin() and commit()/rollback()
+        self._pending: list[dict] | None = None
+
+    # -- writes ----------------------------------------------------------
+
+    def backfill(self) -> None:
+        """Create log.jsonl from log.md's events for campaigns logged before it existed."""
+        if self.path.exists() or not self.view_path.exists():
+            return
+        with atomic_io.locked(self.path):
+            if self.path.exists():
+                return
+            events = self._view_events()
+            atomic_io.write_text(self.path, "".join(encode_event(event) for event in reversed(events)))
+
+    def _view_events(self) -> list[dict]:
+        """log.md's frontmatter events, newest first."""
+        try:
+            data = frontmatter.read_data(self.view_path)
+        except (OSError, ValueError):
+            return []
+        events = [event for event in data.get("events", []) if isinstance(event, dict)]
+        return sorted(events, key=lambda event: str(event.get("timestamp") or ""), reverse=True)
+
+    def append(self, event_type: str, message: str) -> dict:
+        """Log one event, stamped now."""
+        event = {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "type": event_type,
+            "message": message
+        }
+        if self._pending is not None:
+            self._pending.append(event)
+            return event
+        self._write([event])
+        return event
+
+    def _write(self, events: list[dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_io.locked(self.path):
+            self.backfill()
+            latest = self._latest()
+            for event in events:
+                event["timestamp"] = latest = max(event["timestamp"], latest)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(encode_event(event) for event in events))
+            self.maybe_compact()
+
+    def _latest(self) -> str:
+        """Timestamp of the last event in log.jsonl, read from its last line only."""
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return ""
+        with f:
+            position = os.fstat(f.fileno()).st_size
+            chunk = b""
+            while position > 0 and chunk.count(b"\n") < 2:
+                step = min(LINE_BLOCK, position)
+                position -= step
+                f.seek(position)
+                chunk = f.read(step) + chunk
+        for line in reversed(chunk.splitlines(keepends=True)[1 if position else 0:]):
+            events, _ = parse_lines(line)
+            if events:
+                return str(events[0][1].get("timestamp") or "")
+        return ""
+
+    # -- index -----------------------------------------------------------
+
+    @staticmethod
+    def _empty_index() -> dict:
+        return {"version": INDEX_VERSION, "size": 0, "count": 0, "latest": "", "marks": [], "compacted": 0}
+
+    def _load_index(self) -> dict:
+        if self._index is not None:
+            return self._index
+        try:
+            index = marshal.loads(self.index_path.read_bytes())
+            if index.get("version") != INDEX_VERSION:
+                index = self._empty_index()
+        except (OSError, EOFError, ValueError, TypeError):
+            index = self._empty_index()
+        self._index = index
+        return index
+
+    def _save_index(self) -> None:
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(marshal.dumps(self._index))
+            os.replace(tmp_path, self.index_path)
+        except (OSError, ValueError):
+            # Read-only tenant; the index still serves this process
+            pass
+
+    def index(self) -> dict:
+        """The sparse index, extended over events appended since it was last refreshed."""
+        index = self._load_index()
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return index
+
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size == index["size"]:
+                return index
+            if size < index["size"]:
+                # The log was replaced; start over
+                index = self._index = self._empty_index()
+            f.seek(index["size"])
+            chunk = f.read()
+
+        events, consumed = parse_lines(chunk)
+        if not consumed:
+            return index
+        for offset, event in events:
+            if index["count"] % SPARSE_EVERY == 0:
+                index["marks"].append([index["size"] + offset, index["latest"]])
+            index["count"] += 1
+            index["latest"] = max(index["latest"], str(event.get("timestamp") or ""))
+        index["size"] += consumed
+        self._save_index()
+        return index
+
+    # -- reads -----------------------------------------------------------
+
+    def tail(self, n: int) -> list[dict]:
+        """The newest n events, newest first."""
+        if n <= 0:
+            return []
+        if not self.path.exists():
+            return self._view_events()[:n]
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return []
+
+        with f:
+            end = os.fstat(f.fileno()).st_size
+            position = end
+            chunk = b""
+            # One more newline than events wanted, so the first line read is whole
+            while position > 0 and chunk.count(b"\n") <= n:
+                step = min(READ_BLOCK, position)
+                position -= step
+                f.seek(position)
+                chunk = f.read(step) + chunk
+
+        if position > 0:
+            chunk = chunk[chunk.index(b"\n") + 1:]
+        events, _ = parse_lines(chunk)
+        return [event for _, event in reversed(events[-n:])]
+
+    def window(self, start: str | None = None, end: str | None = None) -> list[dict]:
+        """
+        Events with start <= timestamp < end (ISO strings, compared as
+        text; either bound optional), newest first.
+        """
+        if not self.path.exists():
+            return [
+                event for event in self._view_events()
+                if (not start or str(event.get("timestamp") or "") >= start)
+                and (not end or str(event.get("timestamp") or "") < end)
+            ]
+        index = self.index()
+        if not index["size"]:
+            return []
+        offset = 0
+        if start:
+            position = bisect_left([mark[BEFORE] for mark in index["marks"]], start) - 1
+            offset = index["marks"][max(position, 0)][OFFSET]
+
+        events = []
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            rest = b""
+            while offset < index["size"]:
+                chunk = rest + f.read(min(READ_BLOCK, index["size"] - offset))
+                offset += len(chunk) - len(rest)
+                lines, consumed = parse_lines(chunk)
+                rest = chunk[consumed:]
+                for _, event in lines:
+                    timestamp = str(event.get("timestamp") or "")
+                    if end and timestamp >= end:
+                        return events[::-1]
+                    if not start or timestamp >= start:
+                        events.append(event)
+        return events[::-1]
+
+    # -- compaction ------------------------------------------------------
+
+    def maybe_compact(self) -> bool:
+        if self._pending is not None:
+            return False
+        index = self._load_index()
+        try:
+            size = os.stat(self.path).st_size
+        except OSError:
+            return False
+        compacted = index["compacted"]
+        if compacted > size:
+            compacted = 0
+        elif compacted == size:
+            return False
+        elif compacted and size - compacted < COMPACT_BYTES:
+            with open(self.path, "rb") as f:
+                f.seek(compacted)
+                oldest, _ = parse_lines(f.readline())
+            if oldest:
+                try:
+                    logged = datetime.fromisoformat(oldest[0][1]["timestamp"].rstrip("Z"))
+                    if (datetime.utcnow() - logged).total_seconds() < COMPACT_AGE:
+                        return False
+                except (KeyError, AttributeError, ValueError):
+                    pass
+        self.compact(size)
+        return True
+
+    def compact(self, size: int | None = None) -> None:
+        """Rebuild log.md's events from the newest VIEW_EVENTS of log.jsonl."""
+        if size is None:
+            size = os.stat(self.path).st_size
+        events = self.tail(VIEW_EVENTS)
+
+        def attempt(expected):
+            if self.view_path.exists():
+                data, markdown = frontmatter.read(self.view_path)
+            else:
+                data, markdown = {}, "\n# Campaign Log\n"
+            data = {**data, "version": 2, "events": events}
+            frontmatter.write(self.view_path, data, markdown, expected=expected)
+
+        self.view_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_io.transaction(self.view_path, attempt)
+        index = self._load_index()
+        index["compacted"] = size
+        self._save_index()
+
+    # -- buffered writes -------------------------------------------------
+
+    def begin(self) -> None:
+        """Buffer appends in memory from now on."""
+        self._pending = []
+
+    def commit(self) -> None:
+        """Write the buffered events with one append."""
+        pending = self._pending
+        self.rollback()
+        if pending:
+            self._write(pending)
+
+    def rollback(self) -> None:
+        """Drop the buffered appends and go back to writing through."""
+        self._pending = None
@@ -6,11 +6,50 @@ Input JSON:
 {
     "campaign": "campaign-name",
     "file": "config|targets|sequence|metrics|log",  # optional, defaults to config
-    "query": "optional search term",
+    "query": "optional search term",  # searches targets (name, email, company, title)
     "target_id": "optional target ID for specific target",
-    "include_prospect": true  # optional, load prospect context for targets
+    "include_prospect": true,  # optional, load prospect context for targets
+    "offset": 0,  # optional, targets listing: skip this many targets
+    "limit": 100,  # optional, targets listing: return at most this many (default: all)
+    "fields": ["id", "prospect_slug", "campaign_stage"],  # optional, target fields to return
+    "prospect_fields": ["name", "email", "company"],  # optional, prospect context to return
+    "workers": 1,  # optional, threads reading prospect files
+    "stage": ["contacted"],  # optional, search filters (targets, both formats) ...
+    "tags": ["vip"],
+    "replied": false,  # reached replied/qualified/booked/won or not
+    "touched": true,  # touched at all or never
+    "min_days_since_touch": 7,
+    "max_days_since_touch": 30,
+    "touched_before": "2026-03-01",  # exclusive
+    "touched_after": "2026-02-01",  # inclusive
+    "sort": "last_touch_at",  # optional, last_touch_at|added_at|name|company|stage|touch_count
+    "order": "asc",  # optional, asc|desc
+    "from": "2026-03-01",  # optional, log: events on or after this day
+    "to": "2026-03-31"  # optional, log: events on or before this day
 }
 
+A targets read with any search filter or sort goes through the campaign's
+search index (campaign_search.py), which joins reference targets with
+their prospects, and returns {"targets", "total", "matched"} (plus "page"
+with offset/limit). Reference targets come back with their joined
+prospect fields under "prospect".
+
+Prospect context for a targets listing is hydrated in bulk: slugs are
+resolved through the prospects manifest (unknown ones cost no file
+access), and with prospect_fields only those are read - manifest fields
+(name, email, phone, tags) need no file at all, other frontmatter keys
+only the file's header, and body sections (business_context,
+research_notes, personalization_hooks, interaction_history) the whole
+file. Without prospect_fields each prospect comes back whole, as
+{"slug", "frontmatter", <sections>}. With offset/limit the listing's
+target list is cut to the page and the output gains
+"page": {"offset", "limit", "returned", "total", "has_more"}; the summary
+still covers every target.
+
+A log read returns the newest events from the campaign's append-only
+log.jsonl (campaign_log.py), newest first: the last `limit` of them
+(default 1000), or those between from and to (at most `limit`).
+
 Output JSON:
 {
     "status": "success",
@@ -23,24 +62,29 @@ Output JSON:
 import sys
 import json
 import re
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Add parent directory to path for shared frontmatter codec imports
+sys.path.insert(0, str(Path(__file__).parent))
+from frontmatter import (
+    read as read_frontmatter,
+    read_data as read_frontmatter_data,
+)
+from frontmatter import read_keys as read_frontmatter_keys
+from relationships import Collection, MANIFEST_FIELDS
+from campaign_targets import TargetStore
+from campaign_search import TargetSearch
+from campaign_log import CampaignLog, VIEW_EVENTS
 
-def parse_frontmatter(content: str) -> tuple[dict, str]:
-    """Parse JSON frontmatter from markdown content."""
-    pattern = r'^---json\s*\n(.*?)\n---\s*\n?(.*)$'
-    match = re.match(pattern, content, re.DOTALL)
 
-    if match:
-        try:
-            json_str = match.group(1)
-            data = json.loads(json_str)
-            markdown = match.group(2)
-            return data, markdown
-        except json.JSONDecodeError:
-            return {}, content
+SEARCH_FILTERS = [
+    "query", "stage", "tags", "replied", "touched", "min_days_since_touch", "max_days_since_touch",
+    "touched_before", "touched_after",
+]
 
-    return {}, content
+SECTION_FIELDS = ["business_context", "research_notes", "personalization_hooks", "interaction_history"]
 
 
 def get_campaign_path(campaign_name: str) -> Path:
@@ -62,8 +106,7 @@ def read_prospect(slug: str) -> dict | None:
     if not file_path.exists():
         return None
 
-    content = file_path.read_text(encoding="utf-8")
-    frontmatter, markdown = parse_frontmatter(content)
+    frontmatter, markdown = read_frontmatter(file_path)
 
     # Parse body sections
     sections = parse_body_sections(markdown)
@@ -106,6 +149,67 @@ def parse_body_sections(markdown: str) -> dict:
     return sections
 
 
+def read_prospect_fields(slug: str, fields: list[str]) -> dict | None:
+    """Only the given frontmatter keys and body sections of a prospect."""
+    file_path = get_prospects_folder() / f"{slug}.md"
+    keys = [field for field in fields if field not in SECTION_FIELDS]
+    sections = [field for field in fields if field in SECTION_FIELDS]
+
+    try:
+        if sections:
+            frontmatter, markdown = read_frontmatter(file_path)
+            frontmatter = {key: frontmatter[key] for key in keys if key in frontmatter}
+            parsed = parse_body_sections(markdown)
+            return {"slug": slug, "frontmatter": frontmatter, **{section: parsed[section] for section in sections}}
+        frontmatter, _ = read_frontmatter_keys(file_path, keys)
+        return {"slug": slug, "frontmatter": frontmatter}
+    except FileNotFoundError:
+        return None
+
+
+def hydrate_prospects(slugs: list, fields: list[str] | None = None, workers: int = 1) -> dict[str, dict | None]:
+    """Prospect context for many slugs at once: {slug: prospect or None}."""
+    unique = [slug for slug in dict.fromkeys(slugs) if slug]
+    prospects = dict.fromkeys(unique)
+    members = Collection("prospects").lookup(unique)
+    known = [slug for slug in unique if members.get(slug)]
+
+    if fields is not None and set(fields) <= set(MANIFEST_FIELDS):
+        # Answered from the manifest alone
+        for slug in known:
+            prospects[slug] = {"slug": slug, "frontmatter": {field: members[slug].get(field) for field in fields}}
+        return prospects
+
+    def read(slug):
+        return read_prospect(slug) if fields is None else read_prospect_fields(slug, fields)
+
+    if workers > 1 and len(known) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            found = list(pool.map(read, known))
+    else:
+        found = [read(slug) for slug in known]
+    prospects.update(zip(known, found))
+    return prospects
+
+
+def project(record: dict, fields: list[str] | None) -> dict:
+    """Only the given fields of a record (all of them without a projection)."""
+    if fields is None:
+        return record
+    return {field: record[field] for field in fields if field in record}
+
+
+def paginate(records: list, offset: int, limit: int | None) -> tuple[list, dict]:
+    page = records[offset:offset + limit] if limit is not None else records[offset:]
+    return page, {
+        "offset": offset,
+        "limit": limit,
+        "returned": len(page),
+        "total": len(records),
+        "has_more": offset + len(page) < len(records)
+    }
+
+
 def list_campaigns() -> list[dict]:
     """List all campaigns."""
     campaigns_dir = Path("operations") / "campaigns"
@@ -119,8 +223,7 @@ def list_campaigns() -> list[dict]:
             config_path = entry / "config.md"
             if config_path.exists():
                 try:
-                    content = config_path.read_text(encoding="utf-8")
-                    data, _ = parse_frontmatter(content)
+                    data = read_frontmatter_data(config_path)
                     campaigns.append({
                         "name": data.get("name", entry.name),
                         "id": data.get("id"),
@@ -144,22 +247,11 @@ def read_campaign_file(campaign_path: Path, file_name: str) -> tuple[dict, str]:
     if not file_path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    content = file_path.read_text(encoding="utf-8")
-    return parse_frontmatter(content)
-
-
-def search_targets(data: dict, query: str) -> list[dict]:
-    """Search targets by query string (legacy format)."""
-    targets = data.get("targets", [])
-    query_lower = query.lower()
-    results = []
-
-    for target in targets:
-        searchable = f"{target.get('name', '')} {target.get('email', '')} {target.get('company', '')} {target.get('title', '')}".lower()
-        if query_lower in searchable:
-            results.append(target)
+    if file_name == "targets":
+        # Through the target store, so pending target changes are included
+        return TargetStore(campaign_path).load()
 
-    return results
+    return read_frontmatter(file_path)
 
 
 def get_target_by_id(data: dict, target_id: str) -> dict | None:
@@ -179,7 +271,7 @@ def get_target_by_id(data: dict, target_id: str) -> dict | None:
     return None
 
 
-def get_target_with_context(data: dict, target_id: str) -> dict | None:
+def get_target_with_context(data: dict, target_id: str, prospect_fields: list[str] | None = None) -> dict | None:
     """Get a target with its prospect context (new format)."""
     if "target_references" not in data:
         return None
@@ -187,7 +279,10 @@ def get_target_with_context(data: dict, target_id: str) -> dict | None:
     for ref in data["target_references"]:
         if ref.get("id") == target_id:
             prospect_slug = ref.get("prospect_slug")
-            prospect = read_prospect(prospect_slug) if prospect_slug else None
+            if prospect_fields is None:
+                prospect = read_prospect(prospect_slug) if prospect_slug else None
+            else:
+                prospect = hydrate_prospects([prospect_slug], prospect_fields).get(prospect_slug)
             return {
                 "target": ref,
                 "prospect": prospect
@@ -202,9 +297,14 @@ def main():
 
         campaign_name = input_data.get("campaign")
         file_name = input_data.get("file", "config")
-        query = input_data.get("query")
         target_id = input_data.get("target_id")
         include_prospect = input_data.get("include_prospect", False)
+        offset = int(input_data.get("offset") or 0)
+        limit = int(input_data["limit"]) if input_data.get("limit") is not None else None
+        paginated = offset > 0 or limit is not None
+        fields = input_data.get("fields")
+        prospect_fields = input_data.get("prospect_fields")
+        workers = int(input_data.get("workers") or 1)
 
         # If no campaign specified, list all campaigns
         if not campaign_name:
@@ -228,19 +328,41 @@ def main():
             print(json.dumps(result))
             sys.exit(1)
 
+        # Search targets through the index, without loading the whole list
+        if file_name == "targets" and not target_id and any(
+            input_data.get(key) is not None for key in SEARCH_FILTERS + ["sort"]
+        ):
+            matches, total = TargetSearch(campaign_path).search(
+                **{key: input_data.get(key) for key in SEARCH_FILTERS},
+                sort=input_data.get("sort"),
+                order=input_data.get("order", "asc")
+            )
+            page, page_info = paginate(matches, offset, limit)
+            result = {
+                "status": "success",
+                "targets": [project(target, fields) for target in page],
+                "total": total,
+                "matched": len(matches),
+                "campaign_path": str(campaign_path)
+            }
+            if paginated:
+                result["page"] = page_info
+            print(json.dumps(result))
+            return
+
         # Read the requested file
         data, markdown = read_campaign_file(campaign_path, file_name)
 
-        # Handle targets file with query/target_id
+        # Handle targets file with target_id
         if file_name == "targets":
             if target_id:
                 # Get target with optional prospect context
                 if include_prospect and "target_references" in data:
-                    target_ctx = get_target_with_context(data, target_id)
+                    target_ctx = get_target_with_context(data, target_id, prospect_fields)
                     if target_ctx:
                         result = {
                             "status": "success",
-                            "target": target_ctx["target"],
+                            "target": project(target_ctx["target"], fields),
                             "prospect": target_ctx["prospect"],
                             "campaign_path": str(campaign_path)
                         }
@@ -256,7 +378,7 @@ def main():
                     if target:
                         result = {
                             "status": "success",
-                            "target": target,
+                            "target": project(target, fields),
                             "campaign_path": str(campaign_path)
                         }
                     else:
@@ -266,16 +388,6 @@ def main():
                         }
                         print(json.dumps(result))
                         sys.exit(1)
-            elif query:
-                # Search only works for legacy format
-                matches = search_targets(data, query)
-                result = {
-                    "status": "success",
-                    "targets": matches,
-                    "total": len(data.get("targets", [])),
-                    "matched": len(matches),
-                    "campaign_path": str(campaign_path)
-                }
             else:
                 # Return all targets with summary
                 # Handle both old and new format
@@ -286,17 +398,21 @@ def main():
                         stage = ref.get("campaign_stage", "unknown")
                         by_stage[stage] = by_stage.get(stage, 0) + 1
 
+                    page, page_info = paginate(refs, offset, limit)
+
                     # Optionally include prospect data
                     targets_with_context = []
                     if include_prospect:
-                        for ref in refs:
-                            prospect_slug = ref.get("prospect_slug")
-                            prospect = read_prospect(prospect_slug) if prospect_slug else None
+                        prospects = hydrate_prospects([ref.get("prospect_slug") for ref in page], prospect_fields, workers)
+                        for ref in page:
                             targets_with_context.append({
-                                "target": ref,
-                                "prospect": prospect
+                                "target": project(ref, fields),
+                                "prospect": prospects.get(ref.get("prospect_slug"))
                             })
 
+                    if paginated or fields is not None:
+                        data = {**data, "target_references": [project(ref, fields) for ref in page]}
+
                     result = {
                         "status": "success",
                         "format": "references",
@@ -311,6 +427,8 @@ def main():
 
                     if include_prospect:
                         result["targets_with_context"] = targets_with_context
+                    if paginated:
+                        result["page"] = page_info
                 else:
                     # Legacy format
                     targets = data.get("targets", [])
@@ -319,6 +437,10 @@ def main():
                         stage = t.get("stage", "unknown")
                         by_stage[stage] = by_stage.get(stage, 0) + 1
 
+                    page, page_info = paginate(targets, offset, limit)
+                    if paginated or fields is not None:
+                        data = {**data, "targets": [project(t, fields) for t in page]}
+
                     result = {
                         "status": "success",
                         "format": "legacy",
@@ -330,7 +452,18 @@ def main():
                         },
                         "campaign_path": str(campaign_path)
                     }
+                    if paginated:
+                        result["page"] = page_info
         else:
+            if file_name == "log":
+                log = CampaignLog(campaign_path)
+                if input_data.get("from") or input_data.get("to"):
+                    end = date.fromisoformat(input_data["to"]) + timedelta(days=1) if input_data.get("to") else None
+                    events = log.window(input_data.get("from"), end.isoformat() if end else None)
+                    events = events[:limit] if limit is not None else events
+                else:
+                    events = log.tail(limit if limit is not None else VIEW_EVENTS)
+                data = {**data, "events": events}
             result = {
                 "status": "success",
                 "data": data,
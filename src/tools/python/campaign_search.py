@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+campaign_search.py - Search index over a campaign's targets joined with their prospects.
+
+Reference targets (target_references) carry only a prospect slug, so
+searching them by name or company means opening every prospect file. The
+index keeps one row per target (both formats) with the fields searches
+filter and sort on:
+
+    id, key                    target id and the list it lives in
+    slug                       prospect slug (references only)
+    name, email, company, title, tags
+                               from the prospect (references) or the target (legacy)
+    stage                      campaign_stage / stage
+    last_touch, added          epoch seconds (NaN if never / unknown)
+    touch_count
+    text                       lowercased name, email, company and title
+    record                     the target record itself
+
+Layout (relative to the tenant folder):
+    state/.index/campaigns/<campaign>/search.marshal
+
+It remembers targets.md's (mtime_ns, size), how far into
+targets.changes.jsonl it has read, and the (mtime_ns, size) of every
+joined prospect file. So, per search:
+- changes appended to the target store since: only those are read and
+  applied to their rows
+- a prospect file changed: only its rows are re-joined (one header read)
+- targets.md rewritten (compaction, the Node services): rows are rebuilt,
+  re-using the joined fields of unchanged prospects
+Otherwise a search costs a stat per file and an in-memory scan of the rows.
+The refresh (read, update, save) holds search.marshal's lock (atomic_io),
+so concurrent searches don't save over each other's progress.
+
+Usage:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from campaign_search import TargetSearch
+
+    search = TargetSearch(Path("operations/campaigns/q1-outreach"))
+    hits, total = search.search(stage=["contacted"], min_days_since_touch=7, sort="last_touch_at")
+"""
+
+import sys
+import os
+import json
+import math
+import time
+import marshal
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+# Add this directory to path for the shared target store
+sys.path.insert(0, str(Path(__file__).parent))
+import atomic_io
+from frontmatter import read_keys as read_frontmatter_keys
+from campaign_targets import CAMPAIGN_INDEX_DIR, TargetStore
+from campaign_analytics import parse_time
+
+
+SEARCH_VERSION = 1
+
+PROSPECTS_DIR = Path("relationships") / "prospects"
+
+COLUMNS = ["id", "key", "slug", "name", "email", "company", "title", "tags", "stage",
+           "last_touch", "added", "touch_count", "text", "record"]
+JOINED = ["name", "email", "company", "title", "tags"]
+
+REPLIED_STAGES = {"replied", "qualified", "booked", "won"}
+
+SORT_KEYS = {
+    "last_touch_at": "last_touch",
+    "added_at": "added",
+    "name": "name",
+    "company": "company",
+    "stage": "stage",
+    "touch_count": "touch_count",
+}
+
+DAY = 86400.0
+
+
+def file_signature(path: Path) -> list | None:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def search_text(name, email, company, title) -> str:
+    return " ".join(str(value) for value in (name, email, company, title) if value).lower()
+
+
+def as_tags(tags) -> list[str]:
+    if not tags:
+        return []
+    return [str(tag).lower() for tag in (tags if isinstance(tags, list) else [tags])]
+
+
+def date_bound(value: str) -> float:
+    """A date (its start, UTC) or ISO timestamp as epoch seconds."""
+    if len(value) == 10:
+        return datetime.combine(date.fromisoformat(value), datetime.min.time(), timezone.utc).timestamp()
+    epoch = parse_time(value)
+    if math.isnan(epoch):
+        raise ValueError(f"Invalid date: {value}")
+    return epoch
+
+
+def read_changes(path: Path, offset: int) -> tuple[list[dict], int]:
+    """Target store changes from offset on (complete lines only), and the offset after them."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+    except FileNotFoundError:
+        return [], offset
+    end = chunk.rfind(b"\n") + 1
+    changes = []
+    for line in chunk[:end].splitlines():
+        try:
+            changes.append(json.loads(line))
+        except ValueError:
+            continue
+    return changes, offset + end
+
+
+class TargetSearch:
+    """A campaign's search index, refreshed on every search."""
+
+    def __init__(self, campaign_path: Path, index_dir: Path = CAMPAIGN_INDEX_DIR, prospects_dir: Path = PROSPECTS_DIR):
+        self.store = TargetStore(campaign_path, index_dir)
+        self.index_path = Path(index_dir) / Path(campaign_path).name / "search.marshal"
+        self.prospects_dir = Path(prospects_dir)
+
+    def _load(self) -> dict | None:
+        try:
+            index = marshal.loads(self.index_path.read_bytes())
+            if index.get("version") == SEARCH_VERSION:
+                return index
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        return None
+
+    def _save(self, index: dict) -> None:
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(marshal.dumps(index))
+            os.replace(tmp_path, self.index_path)
+        except (OSError, ValueError):
+            # Read-only tenant; the index still serves this search
+            pass
+
+    def _join(self, slug: str, joined: dict, signature=False) -> list:
+        """[signature, name, email, company, title, tags] of a prospect, re-read only if its file changed."""
+        path = self.prospects_dir / f"{slug}.md"
+        if signature is False:
+            signature = file_signature(path)
+        cached = joined.get(slug)
+        if cached and cached[0] == signature:
+            return cached
+
+        data = {}
+        if signature is not None:
+            try:
+                data, _ = read_frontmatter_keys(path, JOINED)
+            except (OSError, ValueError):
+                pass
+        fields = [signature, data.get("name"), data.get("email"), data.get("company"), data.get("title"),
+                  as_tags(data.get("tags"))]
+        joined[slug] = fields
+        return fields
+
+    def _row(self, record: dict, key: str, joined: dict) -> tuple:
+        """One target's values, in COLUMNS order."""
+        if key == "target_references":
+            slug = record.get("prospect_slug")
+            _, name, email, company, title, tags = self._join(slug, joined) if slug else [None] * 5 + [[]]
+            stage = record.get("campaign_stage", "unknown")
+            last_touch = parse_time(record.get("last_touch_at"))
+            touch_count = record.get("touch_count", 0) or 0
+            added = parse_time(record.get("added_at"))
+        else:
+            slug = None
+            name, email, company, title = (record.get(field) for field in ("name", "email", "company", "title"))
+            tags = as_tags(record.get("tags"))
+            stage = record.get("stage", "unknown")
+            touches = record.get("touches") or []
+            sent = [epoch for epoch in (parse_time(t.get("sent_at")) for t in touches) if not math.isnan(epoch)]
+            last_touch = max(sent) if sent else math.nan
+            touch_count = len(touches)
+            added = parse_time(record.get("created_at"))
+        return (record.get("id"), key, slug, name, email, company, title, tags, stage,
+                last_touch, added, touch_count, search_text(name, email, company, title), record)
+
+    def _rebuild(self, joined: dict) -> dict:
+        snapshot = file_signature(self.store.path)
+        changes, offset = read_changes(self.store.changes_path, 0)
+        data, _ = self.store.load(self.store.current(changes))
+
+        rows = {column: [] for column in COLUMNS}
+        for key in ("target_references", "targets"):
+            for record in data.get(key, []):
+                for column, value in zip(COLUMNS, self._row(record, key, joined)):
+                    rows[column].append(value)
+
+        slugs = set(rows["slug"])
+        return {
+            "version": SEARCH_VERSION,
+            "snapshot": snapshot,
+            "changes_offset": offset,
+            "prospects": {slug: fields for slug, fields in joined.items() if slug in slugs},
+            "rows": rows,
+        }
+
+    def _apply_changes(self, index: dict, changes: list[dict]) -> None:
+        rows, joined = index["rows"], index["prospects"]
+        positions = {target_id: i for i, target_id in enumerate(rows["id"])}
+        for change in changes:
+            if change.get("op") == "add":
+                if change["record"].get("id") in positions:
+                    continue
+                record = dict(change["record"])
+                positions[record.get("id")] = len(rows["id"])
+                for column, value in zip(COLUMNS, self._row(record, change["key"], joined)):
+                    rows[column].append(value)
+            elif change.get("id") in positions:
+                i = positions[change["id"]]
+                record = dict(rows["record"][i])
+                TargetStore._apply(record, change)
+                for column, value in zip(COLUMNS, self._row(record, rows["key"][i], joined)):
+                    rows[column][i] = value
+
+    def refresh(self) -> dict:
+        """The index, brought up to date with the targets and their prospects."""
+        with atomic_io.index_locked(self.index_path):
+            return self._refresh()
+
+    def _refresh(self) -> dict:
+        index = self._load()
+        if index is None or index["snapshot"] != file_signature(self.store.path):
+            index = self._rebuild(index["prospects"] if index is not None else {})
+            self._save(index)
+            return index
+
+        changes_size = (file_signature(self.store.changes_path) or [0, 0])[1]
+        if changes_size < index["changes_offset"]:
+            # Changes file cleared without a new snapshot; start over
+            index = self._rebuild(index["prospects"])
+            self._save(index)
+            return index
+
+        changed = False
+        changes, offset = read_changes(self.store.changes_path, index["changes_offset"])
+        if changes:
+            self._apply_changes(index, changes)
+            index["changes_offset"] = offset
+            changed = True
+
+        rows, joined = index["rows"], index["prospects"]
+        # Plain string paths: building a Path per prospect costs more than its stat()
+        folder = os.path.join(self.prospects_dir, "")
+        for i, slug in enumerate(rows["slug"]):
+            if slug is None:
+                continue
+            signature = file_signature(f"{folder}{slug}.md")
+            if joined.get(slug, [False])[0] == signature:
+                continue
+            _, name, email, company, title, tags = self._join(slug, joined, signature)
+            for column, value in zip(JOINED, (name, email, company, title, tags)):
+                rows[column][i] = value
+            rows["text"][i] = search_text(name, email, company, title)
+            changed = True
+
+        if changed:
+            self._save(index)
+        return index
+
+    def search(self, query: str | None = None, stage=None, tags: list[str] | None = None, touched: bool | None = None,
+               min_days_since_touch: float | None = None, max_days_since_touch: float | None = None,
+               touched_before: str | None = None, touched_after: str | None = None, replied: bool | None = None,
+               sort: str | None = None, order: str = "asc", now: float | None = None) -> tuple[list[dict], int]:
+        """
+        (matching targets in order, total targets in the campaign).
+
+        Filters combine with AND. touched_before is exclusive and
+        touched_after inclusive; min/max_days_since_touch are relative to
+        now. Reference targets come back with their joined prospect fields
+        under "prospect".
+        """
+        if sort is not None and sort not in SORT_KEYS:
+            raise ValueError(f"Invalid sort: {sort}. Must be one of: {', '.join(SORT_KEYS)}")
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Invalid order: {order}. Must be asc or desc")
+
+        rows = self.refresh()["rows"]
+        now = time.time() if now is None else now
+        candidates = range(len(rows["id"]))
+
+        if query:
+            text, needle = rows["text"], query.lower()
+            candidates = [i for i in candidates if needle in text[i]]
+        if stage:
+            stages = {stage} if isinstance(stage, str) else set(stage)
+            stage_column = rows["stage"]
+            candidates = [i for i in candidates if stage_column[i] in stages]
+        if replied is not None:
+            stage_column = rows["stage"]
+            candidates = [i for i in candidates if (stage_column[i] in REPLIED_STAGES) == replied]
+        if tags:
+            wanted = set(as_tags(tags))
+            tag_column = rows["tags"]
+            candidates = [i for i in candidates if wanted <= set(tag_column[i])]
+
+        last_touch = rows["last_touch"]
+        if touched is not None:
+            # NaN (never touched) fails every comparison
+            candidates = [i for i in candidates if (last_touch[i] == last_touch[i]) == touched]
+        upper, lower = math.inf, -math.inf
+        if min_days_since_touch is not None:
+            upper = min(upper, now - float(min_days_since_touch) * DAY)
+        if touched_before:
+            upper = min(upper, date_bound(touched_before))
+        if max_days_since_touch is not None:
+            lower = max(lower, now - float(max_days_since_touch) * DAY)
+        if touched_after:
+            lower = max(lower, date_bound(touched_after))
+        if upper != math.inf or lower != -math.inf:
+            candidates = [i for i in candidates if lower <= last_touch[i] < upper]
+
+        candidates = list(candidates)
+        if sort:
+            column = rows[SORT_KEYS[sort]]
+
+            def missing(i):
+                value = column[i]
+                return value is None or (isinstance(value, float) and math.isnan(value))
+
+            present = [i for i in candidates if not missing(i)]
+            present.sort(key=lambda i: column[i].lower() if isinstance(column[i], str) else column[i], reverse=order == "desc")
+            # Targets without the sort value go last either way
+            candidates = present + [i for i in candidates if missing(i)]
+
+        return [self._hit(rows, i) for i in candidates], len(rows["id"])
+
+    @staticmethod
+    def _hit(rows: dict, i: int) -> dict:
+        record = rows["record"][i]
+        if rows["key"][i] != "target_references":
+            return record
+        return {**record, "prospect": {column: rows[column][i] for column in JOINED}}
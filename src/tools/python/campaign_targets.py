@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+campaign_targets.py - Campaign target store with indexed, append-only updates.
+
+targets.md keeps every target of a campaign in one `---json` list
+("target_references" in v2 campaigns, "targets" in legacy ones), so
+rewriting it for every touch costs megabytes on a big campaign. The store
+splits a campaign's targets into:
+
+    targets.md                  snapshot (the file the Node services read and write)
+    targets.changes.jsonl       changes since the snapshot, one per line:
+                                {"at": 1736..., "op": "add", "record": {...}}
+                                {"at": 1736..., "op": "set", "id": "...", "fields": {...}}
+                                {"at": 1736..., "op": "push", "id": "...", "field": "touches", "value": {...}}
+
+and keeps an id -> (byte offset, byte length) index of the snapshot's
+records under state/.index/campaigns/<campaign>/targets.marshal, rebuilt
+whenever targets.md's (mtime_ns, size) changes. So:
+- update()/push() validate the id against the index, append one line and
+  return the record, read with one seek plus the pending changes for it
+- get() costs the same, whatever the campaign's size
+- records() (whole-list reads) loads the snapshot through the frontmatter
+  cache and replays the changes
+
+Changes are compacted into targets.md (one rewrite) once COMPACT_CHANGES
+of them are pending or the oldest is COMPACT_AGE seconds old, checked on
+every write, or on demand by flush() (campaign_write's compact operation).
+Readers going through the store always see pending changes; readers of
+targets.md itself (the Node services) see them once compacted. Each change
+has an id, and a compacted targets.md records the last one folded into it
+("folded_change"), so changes left behind by an interrupted compaction
+aren't applied twice. If targets.md is rewritten by someone else
+meanwhile (dropping that key), pending changes are applied on top of the
+new snapshot; adds of targets it already has are skipped, and changes to
+targets it no longer has are dropped.
+
+begin() buffers writes in memory (reads see them) until commit() writes
+them in one go, or rollback() drops them; campaign_write's batch mode uses
+this.
+
+Usage:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from campaign_targets import TargetStore
+
+    store = TargetStore(Path("operations/campaigns/q1-outreach"))
+    store.update(target_id, {"campaign_stage": "contacted"})
+    store.get(target_id)
+"""
+
+import sys
+import os
+import re
+import json
+import time
+import uuid
+import marshal
+from datetime import datetime
+from pathlib import Path
+
+# Add this directory to path for shared codec imports
+sys.path.insert(0, str(Path(__file__).parent))
+import atomic_io
+import frontmatter
+
+
+INDEX_VERSION = 2
+CAMPAIGN_INDEX_DIR = Path("state") / ".index" / "campaigns"
+
+COMPACT_CHANGES = 256
+COMPACT_AGE = 300
+
+LIST_KEYS = ("target_references", "targets")
+
+# Top-level list key as written by frontmatter.serialize() and the Node services (indent 2)
+LIST_START = re.compile(r'^  "(target_references|targets)": \[', re.MULTILINE)
+FOLDED = re.compile(r'^  "folded_change": "([0-9a-f]+)"', re.MULTILINE)
+
+
+def scan_records(text: str, start: int) -> list[tuple[str, int, int]] | None:
+    """(id, start, end) character spans of the list elements starting after `[` at start."""
+    decoder = json.JSONDecoder()
+    spans = []
+    pos = start
+    while True:
+        while text[pos] in " \t\r\n,":
+            pos += 1
+        if text[pos] == "]":
+            return spans
+        record, end = decoder.raw_decode(text, pos)
+        if not isinstance(record, dict):
+            return None
+        spans.append((record.get("id"), pos, end))
+        pos = end
+
+
+class TargetStore:
+    """One campaign's targets: targets.md snapshot, pending changes and an id index."""
+
+    def __init__(self, campaign_path: Path, index_dir: Path = CAMPAIGN_INDEX_DIR):
+        self.campaign_path = Path(campaign_path)
+        self.path = self.campaign_path / "targets.md"
+        self.changes_path = self.campaign_path / "targets.changes.jsonl"
+        self.index_path = Path(index_dir) / self.campaign_path.name / "targets.marshal"
+        self._index: dict | None = None
+        # Buffered writes between begin() and commit()/rollback()
+        self._pending: list[dict] | None = None
+        self._snapshot: tuple[dict, str] | None = None
+
+    # -- snapshot index --------------------------------------------------
+
+    def _build_index(self, stat: os.stat_result) -> dict:
+        raw = self.path.read_bytes()
+        text = raw.decode("utf-8")
+        index = {"version": INDEX_VERSION, "stat": [stat.st_mtime_ns, stat.st_size], "key": None, "folded": None, "ids": {}}
+
+        lists = []
+        try:
+            for match in LIST_START.finditer(text):
+                spans = scan_records(text, match.end())
+                if spans is None:
+                    lists = []
+                    break
+                lists.append((match.group(1), spans))
+        except (ValueError, IndexError):
+            lists = []
+        if not lists:
+            # Unrecognised layout (or no targets yet); get() falls back to whole-list reads
+            data, _ = frontmatter.read(self.path)
+            index["folded"] = data.get("folded_change")
+            for key in LIST_KEYS:
+                for record in data.get(key, []):
+                    index["ids"][record.get("id")] = (None, None, key)
+                if key in data and index["key"] is None:
+                    index["key"] = key
+            return index
+
+        index["key"] = lists[0][0]
+        folded = FOLDED.search(text)
+        index["folded"] = folded.group(1) if folded else None
+        ascii_only = len(raw) == len(text)
+        byte_pos = char_pos = 0
+        for key, spans in lists:
+            for target_id, start, end in spans:
+                if ascii_only:
+                    index["ids"][target_id] = (start, end - start, key)
+                    continue
+                byte_pos += len(text[char_pos:start].encode("utf-8"))
+                length = len(text[start:end].encode("utf-8"))
+                index["ids"][target_id] = (byte_pos, length, key)
+                byte_pos += length
+                char_pos = end
+        return index
+
+    def index(self) -> dict:
+        """The snapshot's id index, rebuilt if targets.md changed since it was built."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return {"version": INDEX_VERSION, "stat": None, "key": None, "folded": None, "ids": {}}
+        current = [stat.st_mtime_ns, stat.st_size]
+        if self._index is not None and self._index["stat"] == current:
+            return self._index
+
+        try:
+            index = marshal.loads(self.index_path.read_bytes())
+            if index.get("version") != INDEX_VERSION or index.get("stat") != current:
+                index = None
+        except (OSError, EOFError, ValueError, TypeError):
+            index = None
+
+        if index is None:
+            index = self._build_index(stat)
+            try:
+                self.index_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+                tmp_path.write_bytes(marshal.dumps(index))
+                os.replace(tmp_path, self.index_path)
+            except (OSError, ValueError):
+                # Read-only tenant; the index still serves this process
+                pass
+        self._index = index
+        return index
+
+    @property
+    def key(self) -> str:
+        """The list key in use; v2 ("target_references") for new or empty campaigns."""
+        if self._snapshot is not None:
+            return next((key for key in LIST_KEYS if key in self._snapshot[0]), "target_references")
+        return self.index()["key"] or "target_references"
+
+    # -- changes ---------------------------------------------------------
+
+    def current(self, changes: list[dict]) -> list[dict]:
+        """changes without those already folded into targets.md."""
+        folded = self.index()["folded"]
+        ids = [change.get("change") for change in changes]
+        if folded is None or folded not in ids:
+            return changes
+        return changes[ids.index(folded) + 1:]
+
+    def changes(self) -> list[dict]:
+        if self._snapshot is not None:
+            # A buffered replace() dropped whatever was pending on disk
+            return list(self._pending)
+        try:
+            with open(self.changes_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            lines = []
+        changes = []
+        for line in lines:
+            if not line.endswith("\n"):
+                # Torn append
+                break
+            try:
+                changes.append(json.loads(line))
+            except ValueError:
+                continue
+        return self.current(changes) + (self._pending or [])
+
+    def _append(self, change: dict) -> None:
+        change = {"at": time.time(), "change": uuid.uuid4().hex, **change}
+        if self._pending is not None:
+            self._pending.append(change)
+            return
+        with open(self.changes_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(change, ensure_ascii=False) + "\n")
+
+    @staticmethod
+    def _apply(record: dict, change: dict) -> None:
+        if change["op"] == "set":
+            record.update(change["fields"])
+        elif change["op"] == "push":
+            record.setdefault(change["field"], []).append(change["value"])
+
+    # -- reads -----------------------------------------------------------
+
+    def _snapshot_record(self, position: tuple) -> dict:
+        with open(self.path, "rb") as f:
+            f.seek(position[0])
+            return json.loads(f.read(position[1]))
+
+    def locate(self, target_id: str, changes: list[dict] | None = None) -> tuple[dict | None, str | None]:
+        """(target with its pending changes applied, list key it lives in), or (None, None)."""
+        changes = self.changes() if changes is None else changes
+        position = (None, None, None) if self._snapshot is not None else self.index()["ids"].get(target_id)
+        if position and position[0] is None:
+            # Unindexed layout
+            data, _ = self.load(changes)
+            for key in [position[2]] if position[2] else LIST_KEYS:
+                record = next((r for r in data.get(key, []) if r.get("id") == target_id), None)
+                if record:
+                    return record, key
+            return None, None
+
+        record, key = (self._snapshot_record(position), position[2]) if position else (None, None)
+        for change in changes:
+            if change["op"] == "add" and change["record"].get("id") == target_id:
+                if record is None:
+                    record, key = dict(change["record"]), change["key"]
+            elif record is not None and change.get("id") == target_id:
+                self._apply(record, change)
+        return record, key
+
+    def get(self, target_id: str) -> dict | None:
+        """One target with its pending changes applied, or None."""
+        return self.locate(target_id)[0]
+
+    def load(self, changes: list[dict] | None = None) -> tuple[dict, str]:
+        """The whole targets.md data (pending changes applied) and its markdown."""
+        if self._snapshot is not None:
+            data, markdown = json.loads(json.dumps(self._snapshot[0])), self._snapshot[1]
+        else:
+            try:
+                data, markdown = frontmatter.read(self.path)
+            except FileNotFoundError:
+                data, markdown = {"version": 2, "target_references": []}, ""
+        changes = self.changes() if changes is None else changes
+        if not changes:
+            return data, markdown
+
+        by_id = {record.get("id"): record for key in LIST_KEYS for record in data.get(key, [])}
+        for change in changes:
+            if change["op"] == "add":
+                if change["record"].get("id") in by_id:
+                    continue
+                record = dict(change["record"])
+                data.setdefault(change["key"], []).append(record)
+                by_id[record.get("id")] = record
+            elif change.get("id") in by_id:
+                self._apply(by_id[change["id"]], change)
+        data["lastUpdated"] = datetime.utcfromtimestamp(changes[-1]["at"]).isoformat() + "Z"
+        return data, markdown
+
+    def records(self, key: str | None = None) -> list[dict]:
+        """Every target in one list (default: the store's key), pending changes applied."""
+        data, _ = self.load()
+        return data.get(key or self.key, [])
+
+    # -- writes ----------------------------------------------------------
+
+    def locked(self):
+        """Hold the store's lock, e.g. around a read-modify-write of one target."""
+        return atomic_io.locked(self.path)
+
+    def add(self, record: dict, key: str | None = None) -> dict:
+        """Add a target to a list (default: the store's key)."""
+        with self.locked():
+            self._append({"op": "add", "key": key or self.key, "record": record})
+            self.maybe_compact()
+        return record
+
+    def update(self, target_id: str, fields: dict) -> dict:
+        """Set fields on one target; raises ValueError if it doesn't exist."""
+        with self.locked():
+            if self.get(target_id) is None:
+                raise ValueError(f"Target '{target_id}' not found")
+            self._append({"op": "set", "id": target_id, "fields": fields})
+            record = self.get(target_id)
+            self.maybe_compact()
+        return record
+
+    def push(self, target_id: str, field: str, value) -> dict:
+        """Append value to a list field of one target (e.g. a legacy target's touches)."""
+        with self.locked():
+            if self.get(target_id) is None:
+                raise ValueError(f"Target '{target_id}' not found")
+            self._append({"op": "push", "id": target_id, "field": field, "value": value})
+            record = self.get(target_id)
+            self.maybe_compact()
+        return record
+
+    def maybe_compact(self) -> bool:
+        if self._pending is not None:
+            return False
+        changes = self.changes()
+        if not changes:
+            return False
+        if len(changes) < COMPACT_CHANGES and time.time() - changes[0]["at"] < COMPACT_AGE:
+            return False
+        self.compact()
+        return True
+
+    def flush(self) -> bool:
+        """Compact now if any changes are pending, whatever their number or age."""
+        if self._pending is not None or not self.changes():
+            return False
+        self.compact()
+        return True
+
+    def compact(self) -> None:
+        """Fold pending changes into targets.md and clear them."""
+        def attempt(expected):
+            changes = self.changes()
+            data, markdown = self.load(changes)
+            if changes and "change" in changes[-1]:
+                data["folded_change"] = changes[-1]["change"]
+            self.replace(data, markdown, expected)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_io.transaction(self.path, attempt)
+
+    def replace(self, data: dict, markdown: str, expected=atomic_io.UNCHECKED) -> None:
+        """Write a whole new snapshot, dropping pending changes (already folded into data)."""
+        if self._pending is not None:
+            self._snapshot, self._pending = (data, markdown), []
+            return
+        with self.locked():
+            frontmatter.write(self.path, data, markdown, expected=expected)
+            try:
+                os.unlink(self.changes_path)
+            except FileNotFoundError:
+                pass
+
+    # -- buffered writes -------------------------------------------------
+
+    def begin(self) -> None:
+        """Buffer writes in memory from now on; reads see them."""
+        self._pending, self._snapshot = [], None
+
+    def commit(self) -> None:
+        """Write the buffered changes: one append, or one rewrite if a replace() was buffered."""
+        if self._pending is None:
+            return
+        if self._snapshot is not None:
+            data, markdown = self.load()
+            self.rollback()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.replace(data, markdown)
+            return
+
+        pending = self._pending
+        self.rollback()
+        if not pending:
+            return
+        with self.locked():
+            with open(self.changes_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(change, ensure_ascii=False) + "\n" for change in pending))
+            self.maybe_compact()
+
+    def rollback(self) -> None:
+        """Drop the buffered writes and go back to writing through."""
+        self._pending = self._snapshot = None
@@ -5,7 +5,7 @@ campaign_write.py - Write/update campaign data in operations/campaigns/
 Input JSON:
 {
     "campaign": "campaign-name",
-    "operation": "create|update_config|add_target|add_target_by_prospect|update_target|update_target_stage_sync|record_touch|log_event",
+    "operation": "create|update_config|add_target|add_target_by_prospect|update_target|update_target_stage_sync|record_touch|log_event|rebuild_metrics|compact",
     "data": { ... },
     "target_id": "optional target ID for target operations",
     "prospect_slug": "optional prospect slug for add_target_by_prospect"
@@ -20,6 +20,26 @@ Operations:
 - update_target_stage_sync: Update target stage and sync to prospect file
 - record_touch: Record an outreach touch for a target
 - log_event: Add event to campaign log
+- rebuild_metrics: Recount metrics from every target and report how far the
+  maintained counters had drifted
+- compact: Fold pending target changes into targets.md and rebuild log.md's
+  events from log.jsonl
+
+log_event appends one line to the campaign's log.jsonl; log.md's events
+are a view rebuilt from its tail now and then, or by compact (see
+campaign_log.py).
+
+Target writes are appended to the campaign's target store and folded into
+targets.md once enough of them are pending (see campaign_targets.py);
+compact folds them in now, for readers of targets.md itself.
+
+Metrics are maintained as deltas: adding a target, a stage transition or a
+touch adjusts the summary counters (total_targets, by_stage, emails_sent)
+in metrics.md under its lock, instead of recounting every target. If the
+counters aren't there to adjust, or don't add up (e.g. the Node services
+rewrote the summary in their own shape), they are recounted instead.
+rebuild_metrics returns:
+    "data": {"summary": {...}, "drifted": true, "drift": {"total_targets": {"recorded": 41, "counted": 42}, "by_stage": {...}}}
 
 Output JSON:
 {
@@ -28,37 +48,100 @@ Output JSON:
     "campaign_path": "operations/campaigns/q1-outreach",
     "data": { ... }
 }
+
+Batch mode - several operations in one launch:
+{
+    "campaign": "campaign-name",       // default for operations that don't name one
+    "operations": [
+        {"operation": "add_target_by_prospect", "prospect_slug": "jane-doe"},
+        {"operation": "update_target_stage_sync", "target_id": "...", "data": {"stage": "researched"}},
+        {"operation": "log_event", "campaign": "other-campaign", "data": {"type": "INFO", "message": "..."}}
+    ]
+}
+
+Each campaign file is loaded once and every write is held in memory until
+all operations have succeeded, then each changed file is written once
+(targets as one append to the target store). Files the batch only updated
+(metrics deltas, config changes) are re-read under their lock at that
+point and the updates applied again to what is there, so writes made by
+others during the batch are kept. If an operation fails nothing is
+written, and the error names it:
+{
+    "status": "success",
+    "message": "2 operations applied",
+    "results": [{"operation": "add_target_by_prospect", "status": "success", "message": "...", "campaign_path": "...", "data": { ... }}, ...]
+}
+{
+    "status": "error",
+    "message": "Operation 2 (update_target_stage_sync) failed: Target '...' not found - batch rolled back",
+    "failed": 1,
+    "results": [{...}, {"operation": "update_target_stage_sync", "status": "error", "message": "Target '...' not found"}]
+}
 """
 
 import sys
 import json
 import re
+import shutil
 import uuid
 from pathlib import Path
 from datetime import datetime
 
-
-def parse_frontmatter(content: str) -> tuple[dict, str]:
-    """Parse JSON frontmatter from markdown content."""
-    pattern = r'^---json\s*\n(.*?)\n---\s*\n?(.*)$'
-    match = re.match(pattern, content, re.DOTALL)
-
-    if match:
-        try:
-            json_str = match.group(1)
-            data = json.loads(json_str)
-            markdown = match.group(2)
-            return data, markdown
-        except json.JSONDecodeError:
-            return {}, content
-
-    return {}, content
-
-
-def serialize_frontmatter(data: dict, markdown: str) -> str:
-    """Serialize data and markdown back to frontmatter format."""
-    json_str = json.dumps(data, indent=2, ensure_ascii=False)
-    return f"---json\n{json_str}\n---\n{markdown}"
+# Add parent directory to path for shared frontmatter codec imports
+sys.path.insert(0, str(Path(__file__).parent))
+from frontmatter import (
+    read as read_frontmatter,
+    read_data as read_frontmatter_data,
+    write as write_frontmatter,
+)
+import atomic_io
+from relationships import Collection
+from campaign_targets import TargetStore
+from campaign_log import CampaignLog
+
+
+class Batch:
+    """Writes of a batch of operations, held in memory until every operation has succeeded."""
+
+    def __init__(self):
+        self.files: dict[str, tuple[dict, str]] = {}
+        self.dirty: list[str] = []
+        # fingerprint of each file when the batch first saw it
+        self.base: dict[str, tuple | None] = {}
+        # mutate functions of files the batch only updated, in order
+        self.updates: dict[str, list] = {}
+        # files the batch wrote whole (e.g. a new campaign's)
+        self.replaced: set[str] = set()
+        self.stores: dict[str, TargetStore] = {}
+        self.logs: dict[str, CampaignLog] = {}
+        self.prospects: dict[str, str] = {}
+        self.created: list[Path] = []
+
+    def commit(self):
+        # Files first: a campaign created in the batch needs targets.md before its store's changes
+        for key in self.dirty:
+            if key in self.replaced:
+                write_frontmatter(Path(key), *self.files[key], expected=self.base[key])
+            else:
+                _update_file(Path(key), self.updates[key])
+        for store in self.stores.values():
+            store.commit()
+        for log in self.logs.values():
+            log.commit()
+        for slug, stage in self.prospects.items():
+            write_prospect_stage(slug, stage)
+
+    def rollback(self):
+        for store in self.stores.values():
+            store.rollback()
+        for log in self.logs.values():
+            log.rollback()
+        for campaign_path in self.created:
+            shutil.rmtree(campaign_path, ignore_errors=True)
+
+
+# The batch being applied, if any; the helpers below route reads and writes through it
+_batch: Batch | None = None
 
 
 def sanitize_name(name: str) -> str:
@@ -153,7 +236,7 @@ def get_default_metrics() -> dict:
 def get_default_log() -> dict:
     """Get default log structure."""
     return {
-        "version": 1,
+        "version": 2,
         "events": []
     }
 
@@ -162,6 +245,16 @@ def read_campaign_file(campaign_path: Path, file_name: str) -> tuple[dict, str]:
     """Read a campaign file, return data and markdown."""
     file_path = campaign_path / f"{file_name}.md"
 
+    if _batch is not None:
+        key = str(file_path)
+        if key not in _batch.files:
+            _batch.base[key] = atomic_io.fingerprint(file_path)
+            _batch.files[key] = _read_campaign_file(file_path, file_name)
+        return _batch.files[key]
+    return _read_campaign_file(file_path, file_name)
+
+
+def _read_campaign_file(file_path: Path, file_name: str) -> tuple[dict, str]:
     if not file_path.exists():
         # Return defaults based on file type
         if file_name == "targets":
@@ -172,15 +265,75 @@ def read_campaign_file(campaign_path: Path, file_name: str) -> tuple[dict, str]:
             return get_default_log(), ""
         return {}, ""
 
-    content = file_path.read_text(encoding="utf-8")
-    return parse_frontmatter(content)
+    return read_frontmatter(file_path)
 
 
 def write_campaign_file(campaign_path: Path, file_name: str, data: dict, markdown: str = ""):
     """Write a campaign file."""
     file_path = campaign_path / f"{file_name}.md"
-    content = serialize_frontmatter(data, markdown)
-    file_path.write_text(content, encoding="utf-8")
+    if _batch is not None:
+        key = str(file_path)
+        _batch.base.setdefault(key, atomic_io.fingerprint(file_path))
+        _batch.files[key] = (data, markdown)
+        _batch.replaced.add(key)
+        _batch.updates.pop(key, None)
+        if key not in _batch.dirty:
+            _batch.dirty.append(key)
+        return
+    write_frontmatter(file_path, data, markdown)
+
+
+def target_store(campaign_path: Path) -> TargetStore:
+    """The campaign's target store (in a batch, one buffering store per campaign)."""
+    if _batch is None:
+        return TargetStore(campaign_path)
+    key = str(campaign_path)
+    if key not in _batch.stores:
+        _batch.stores[key] = TargetStore(campaign_path)
+        _batch.stores[key].begin()
+    return _batch.stores[key]
+
+
+def campaign_log(campaign_path: Path) -> CampaignLog:
+    """The campaign's event log (in a batch, one buffering log per campaign)."""
+    if _batch is None:
+        return CampaignLog(campaign_path)
+    key = str(campaign_path)
+    if key not in _batch.logs:
+        _batch.logs[key] = CampaignLog(campaign_path)
+        _batch.logs[key].begin()
+    return _batch.logs[key]
+
+
+def update_campaign_file(campaign_path: Path, file_name: str, mutate):
+    """
+    Read-modify-write a campaign file under its lock; mutate(data) changes
+    data in place and may return a result, which is passed back.
+
+    In a batch the change is made to the batch's copy, and mutate is run
+    again on the file as it is at commit, so it must only depend on data.
+    """
+    file_path = campaign_path / f"{file_name}.md"
+    if _batch is not None:
+        key = str(file_path)
+        data, _ = read_campaign_file(campaign_path, file_name)
+        result = mutate(data)
+        if key not in _batch.replaced:
+            _batch.updates.setdefault(key, []).append(mutate)
+        if key not in _batch.dirty:
+            _batch.dirty.append(key)
+        return result
+    return _update_file(file_path, [mutate])[0]
+
+
+def _update_file(file_path: Path, mutations: list) -> list:
+    def attempt(expected):
+        data, markdown = _read_campaign_file(file_path, file_path.stem)
+        results = [mutate(data) for mutate in mutations]
+        write_frontmatter(file_path, data, markdown, expected=expected)
+        return results
+
+    return atomic_io.transaction(file_path, attempt)
 
 
 def read_prospect(slug: str) -> dict | None:
@@ -191,9 +344,7 @@ def read_prospect(slug: str) -> dict | None:
     if not file_path.exists():
         return None
 
-    content = file_path.read_text(encoding="utf-8")
-    frontmatter, _ = parse_frontmatter(content)
-    return frontmatter
+    return read_frontmatter_data(file_path)
 
 
 def update_prospect_stage(slug: str, new_stage: str):
@@ -204,14 +355,22 @@ def update_prospect_stage(slug: str, new_stage: str):
     if not file_path.exists():
         raise ValueError(f"Prospect '{slug}' not found")
 
-    content = file_path.read_text(encoding="utf-8")
-    frontmatter, markdown = parse_frontmatter(content)
+    if _batch is not None:
+        _batch.prospects[slug] = new_stage
+        return
+    write_prospect_stage(slug, new_stage)
+
+
+def write_prospect_stage(slug: str, new_stage: str):
+    """Write a prospect's new stage to its file."""
+    file_path = get_prospects_folder() / f"{slug}.md"
+    frontmatter, markdown = read_frontmatter(file_path)
 
     frontmatter["stage"] = new_stage
     frontmatter["updated_at"] = datetime.utcnow().isoformat() + "Z"
 
-    new_content = serialize_frontmatter(frontmatter, markdown)
-    file_path.write_text(new_content, encoding="utf-8")
+    write_frontmatter(file_path, frontmatter, markdown)
+    Collection("prospects").touch(slug)
 
 
 def create_campaign(name: str, data: dict) -> dict:
@@ -223,6 +382,8 @@ def create_campaign(name: str, data: dict) -> dict:
 
     # Create campaign directory
     campaign_path.mkdir(parents=True, exist_ok=True)
+    if _batch is not None:
+        _batch.created.append(campaign_path)
 
     # Create config
     config = get_default_config(name)
@@ -268,13 +429,8 @@ def create_campaign(name: str, data: dict) -> dict:
     write_campaign_file(campaign_path, "metrics", metrics, "\n# Campaign Metrics\n")
 
     # Create log file
-    log_data = get_default_log()
-    log_data["events"].append({
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "type": "CREATED",
-        "message": f"Campaign '{name}' created"
-    })
-    write_campaign_file(campaign_path, "log", log_data, "\n# Campaign Log\n")
+    write_campaign_file(campaign_path, "log", get_default_log(), "\n# Campaign Log\n")
+    campaign_log(campaign_path).append("CREATED", f"Campaign '{name}' created")
 
     return config
 
@@ -286,26 +442,23 @@ def update_config(campaign_name: str, updates: dict) -> dict:
     if not campaign_path.exists():
         raise ValueError(f"Campaign '{campaign_name}' not found")
 
-    data, markdown = read_campaign_file(campaign_path, "config")
-
-    # Apply updates
-    for key in ["status", "goal", "owner_phone"]:
-        if key in updates:
-            data[key] = updates[key]
-    if "audience" in updates:
-        data["audience"].update(updates["audience"])
-    if "channels" in updates:
-        for ch, ch_data in updates["channels"].items():
-            if ch in data["channels"]:
-                data["channels"][ch].update(ch_data)
-    if "settings" in updates:
-        data["settings"].update(updates["settings"])
-
-    data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
+    def mutate(data):
+        for key in ["status", "goal", "owner_phone"]:
+            if key in updates:
+                data[key] = updates[key]
+        if "audience" in updates:
+            data["audience"].update(updates["audience"])
+        if "channels" in updates:
+            for ch, ch_data in updates["channels"].items():
+                if ch in data["channels"]:
+                    data["channels"][ch].update(ch_data)
+        if "settings" in updates:
+            data["settings"].update(updates["settings"])
 
-    write_campaign_file(campaign_path, "config", data, markdown)
+        data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
+        return data
 
-    return data
+    return update_campaign_file(campaign_path, "config", mutate)
 
 
 def add_target_by_prospect(campaign_name: str, prospect_slug: str) -> dict:
@@ -320,7 +473,7 @@ def add_target_by_prospect(campaign_name: str, prospect_slug: str) -> dict:
     if prospect is None:
         raise ValueError(f"Prospect '{prospect_slug}' not found")
 
-    data, markdown = read_campaign_file(campaign_path, "targets")
+    store = target_store(campaign_path)
 
     now = datetime.utcnow().isoformat() + "Z"
 
@@ -332,26 +485,25 @@ def add_target_by_prospect(campaign_name: str, prospect_slug: str) -> dict:
         "last_touch_at": None,
         "touch_count": 0,
         "campaign_stage": "identified",
+        "stage_changed_at": now,
         "unsubscribed": False
     }
 
     # Handle both formats
-    if "target_references" in data:
-        data["target_references"].append(target_ref)
+    if store.key == "target_references":
+        store.add(target_ref)
+        apply_metrics_delta(campaign_path, total=1, stages={"identified": 1})
     else:
         # Migrate to v2 format
+        _, markdown = store.load()
         data = {
             "version": 2,
             "lastUpdated": now,
             "target_references": [target_ref]
         }
-
-    data["lastUpdated"] = now
-
-    write_campaign_file(campaign_path, "targets", data, markdown)
-
-    # Update metrics
-    update_metrics_count_v2(campaign_path)
+        store.replace(data, markdown)
+        # The legacy targets are gone; start the counters over
+        rebuild_metrics(campaign_name)
 
     return target_ref
 
@@ -363,8 +515,6 @@ def add_target(campaign_name: str, target_data: dict) -> dict:
     if not campaign_path.exists():
         raise ValueError(f"Campaign '{campaign_name}' not found")
 
-    data, markdown = read_campaign_file(campaign_path, "targets")
-
     # Create new target
     target = {
         "id": generate_id(),
@@ -384,17 +534,11 @@ def add_target(campaign_name: str, target_data: dict) -> dict:
         "stage_changed_at": datetime.utcnow().isoformat() + "Z"
     }
 
-    # Handle legacy format
-    if "targets" not in data:
-        data["targets"] = []
-
-    data["targets"].append(target)
-    data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
-
-    write_campaign_file(campaign_path, "targets", data, markdown)
+    # Legacy targets live in their own list, alongside any references
+    target_store(campaign_path).add(target, key="targets")
 
     # Update metrics
-    update_metrics_count(campaign_path)
+    apply_metrics_delta(campaign_path, total=1, stages={target["stage"]: 1})
 
     return target
 
@@ -406,34 +550,28 @@ def update_target_stage_sync(campaign_name: str, target_id: str, new_stage: str)
     if not campaign_path.exists():
         raise ValueError(f"Campaign '{campaign_name}' not found")
 
-    data, markdown = read_campaign_file(campaign_path, "targets")
-
-    if "target_references" not in data:
-        raise ValueError("Campaign uses legacy format - use update_target instead")
-
-    # Find target reference
-    target_ref = None
-    for ref in data["target_references"]:
-        if ref["id"] == target_id:
-            target_ref = ref
-            break
+    store = target_store(campaign_path)
+    with store.locked():
+        target_ref, key = store.locate(target_id)
 
-    if not target_ref:
-        raise ValueError(f"Target '{target_id}' not found")
+        if key == "targets" or (key is None and store.key != "target_references"):
+            raise ValueError("Campaign uses legacy format - use update_target instead")
 
-    old_stage = target_ref.get("campaign_stage")
-    target_ref["campaign_stage"] = new_stage
+        if not target_ref:
+            raise ValueError(f"Target '{target_id}' not found")
 
-    data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
+        old_stage = target_ref.get("campaign_stage", "unknown")
+        fields = {"campaign_stage": new_stage}
+        if new_stage != old_stage:
+            fields["stage_changed_at"] = datetime.utcnow().isoformat() + "Z"
+        target_ref = store.update(target_id, fields)
 
-    write_campaign_file(campaign_path, "targets", data, markdown)
+        # Update metrics
+        apply_metrics_delta(campaign_path, stages=stage_delta(old_stage, new_stage))
 
     # Sync stage to prospect file
     update_prospect_stage(target_ref["prospect_slug"], new_stage)
 
-    # Update metrics
-    update_metrics_count_v2(campaign_path)
-
     return target_ref
 
 
@@ -444,47 +582,43 @@ def update_target(campaign_name: str, target_id: str, updates: dict) -> dict:
     if not campaign_path.exists():
         raise ValueError(f"Campaign '{campaign_name}' not found")
 
-    data, markdown = read_campaign_file(campaign_path, "targets")
-
-    # Try v2 format first
-    if "target_references" in data:
-        for ref in data["target_references"]:
-            if ref["id"] == target_id:
-                # Update allowed fields
-                for key in ["campaign_stage", "unsubscribed"]:
-                    if key in updates:
-                        ref[key] = updates[key]
-                if "last_touch_at" in updates:
-                    ref["last_touch_at"] = updates["last_touch_at"]
-                if "touch_count" in updates:
-                    ref["touch_count"] = updates["touch_count"]
-
-                data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
-                write_campaign_file(campaign_path, "targets", data, markdown)
-                update_metrics_count_v2(campaign_path)
-                return ref
-
-    # Try legacy format
-    if "targets" in data:
-        for target in data["targets"]:
-            if target["id"] == target_id:
-                old_stage = target.get("stage")
-                new_stage = updates.get("stage")
-
-                for key in ["stage", "name", "email", "linkedin", "phone", "company", "title", "research", "notes", "next_action", "unsubscribed"]:
-                    if key in updates:
-                        target[key] = updates[key]
-
-                if new_stage and new_stage != old_stage:
-                    target["stage_changed_at"] = datetime.utcnow().isoformat() + "Z"
+    store = target_store(campaign_path)
+    with store.locked():
+        target, key = store.locate(target_id)
+
+        # v2 format
+        if key == "target_references":
+            # Update allowed fields
+            fields = {k: updates[k] for k in ["campaign_stage", "unsubscribed", "last_touch_at", "touch_count"] if k in updates}
+            if "campaign_stage" in fields and fields["campaign_stage"] != target.get("campaign_stage"):
+                fields["stage_changed_at"] = datetime.utcnow().isoformat() + "Z"
+            ref = store.update(target_id, fields)
+            apply_metrics_delta(
+                campaign_path,
+                stages=stage_delta(target.get("campaign_stage", "unknown"), ref.get("campaign_stage", "unknown")),
+                emails_sent=ref.get("touch_count", 0) - target.get("touch_count", 0)
+            )
+            return ref
+
+        # Legacy format
+        if key == "targets":
+            old_stage = target.get("stage")
+            new_stage = updates.get("stage")
+
+            fields = {
+                k: updates[k]
+                for k in ["stage", "name", "email", "linkedin", "phone", "company", "title", "research", "notes", "next_action", "unsubscribed"]
+                if k in updates
+            }
+            if new_stage and new_stage != old_stage:
+                fields["stage_changed_at"] = datetime.utcnow().isoformat() + "Z"
 
-                data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
-                write_campaign_file(campaign_path, "targets", data, markdown)
+            target = store.update(target_id, fields)
 
-                if new_stage and new_stage != old_stage:
-                    update_metrics_count(campaign_path)
+            if new_stage and new_stage != old_stage:
+                apply_metrics_delta(campaign_path, stages=stage_delta(old_stage or "unknown", new_stage))
 
-                return target
+            return target
 
     raise ValueError(f"Target '{target_id}' not found")
 
@@ -496,54 +630,58 @@ def record_touch(campaign_name: str, target_id: str, touch_data: dict) -> dict:
     if not campaign_path.exists():
         raise ValueError(f"Campaign '{campaign_name}' not found")
 
-    data, markdown = read_campaign_file(campaign_path, "targets")
+    store = target_store(campaign_path)
+    target, key = store.locate(target_id)
 
     now = datetime.utcnow().isoformat() + "Z"
 
     # Handle v2 format
-    if "target_references" in data:
-        for ref in data["target_references"]:
-            if ref["id"] == target_id:
-                ref["last_touch_at"] = now
-                ref["touch_count"] = ref.get("touch_count", 0) + 1
+    if key == "target_references":
+        # Read-increment-write under the store's lock so concurrent touches all count
+        with store.locked():
+            target, _ = store.locate(target_id)
+            old_stage = target.get("campaign_stage", "unknown")
+            channel = touch_data.get("channel", "email")
+            by_channel = target.get("touches_by_channel", {})
+            fields = {
+                "last_touch_at": now,
+                "touch_count": target.get("touch_count", 0) + 1,
+                "touches_by_channel": {**by_channel, channel: by_channel.get(channel, 0) + 1}
+            }
 
-                # Update stage to contacted if identified or researched
-                if ref.get("campaign_stage") in ["identified", "researched"]:
-                    ref["campaign_stage"] = "contacted"
+            # Update stage to contacted if identified or researched
+            if old_stage in ["identified", "researched"]:
+                fields["campaign_stage"] = "contacted"
+                fields["stage_changed_at"] = now
 
-                data["lastUpdated"] = now
-                write_campaign_file(campaign_path, "targets", data, markdown)
-                update_metrics_count_v2(campaign_path)
+            store.update(target_id, fields)
+            apply_metrics_delta(campaign_path, stages=stage_delta(old_stage, fields.get("campaign_stage", old_stage)), emails_sent=1)
 
-                return {
-                    "id": generate_id(),
-                    "channel": touch_data.get("channel", "email"),
-                    "sent_at": now,
-                    "status": "sent"
-                }
+        return {
+            "id": generate_id(),
+            "channel": channel,
+            "sent_at": now,
+            "status": "sent"
+        }
 
     # Handle legacy format
-    if "targets" in data:
-        for target in data["targets"]:
-            if target["id"] == target_id:
-                touch = {
-                    "id": generate_id(),
-                    "channel": touch_data.get("channel", "email"),
-                    "type": touch_data.get("type", "outreach"),
-                    "subject": touch_data.get("subject"),
-                    "body_preview": touch_data.get("body_preview"),
-                    "sent_at": touch_data.get("sent_at", now),
-                    "status": touch_data.get("status", "sent"),
-                    "message_id": touch_data.get("message_id")
-                }
-
-                target["touches"].append(touch)
-                data["lastUpdated"] = now
+    if key == "targets":
+        touch = {
+            "id": generate_id(),
+            "channel": touch_data.get("channel", "email"),
+            "type": touch_data.get("type", "outreach"),
+            "subject": touch_data.get("subject"),
+            "body_preview": touch_data.get("body_preview"),
+            "sent_at": touch_data.get("sent_at", now),
+            "status": touch_data.get("status", "sent"),
+            "message_id": touch_data.get("message_id")
+        }
 
-                write_campaign_file(campaign_path, "targets", data, markdown)
-                update_touch_metrics(campaign_path, touch["channel"])
+        store.push(target_id, "touches", touch)
+        if touch["channel"] == "email":
+            apply_metrics_delta(campaign_path, emails_sent=1)
 
-                return touch
+        return touch
 
     raise ValueError(f"Target '{target_id}' not found")
 
@@ -555,211 +693,327 @@ def log_event(campaign_name: str, event_type: str, message: str) -> dict:
     if not campaign_path.exists():
         raise ValueError(f"Campaign '{campaign_name}' not found")
 
-    data, markdown = read_campaign_file(campaign_path, "log")
+    return campaign_log(campaign_path).append(event_type, message)
+
+
+def stage_delta(old_stage: str, new_stage: str) -> dict:
+    """by_stage deltas for one target moving from old_stage to new_stage."""
+    if old_stage == new_stage:
+        return {}
+    return {old_stage: -1, new_stage: 1}
+
+
+def apply_metrics_delta(campaign_path: Path, total: int = 0, stages: dict | None = None, emails_sent: int = 0):
+    """Adjust the metrics summary counters by the given deltas."""
+    if not (total or stages or emails_sent):
+        return
+
+    def mutate(metrics_data):
+        summary = metrics_data.setdefault("summary", {})
+        metrics_data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
+        if not counters_consistent(summary, stages, emails_sent):
+            # The targets already include this change
+            summary.update(count_metrics(campaign_path))
+            return
+        summary["total_targets"] = summary.get("total_targets", 0) + total
+        by_stage = summary.setdefault("by_stage", {})
+        for stage, delta in (stages or {}).items():
+            count = by_stage.get(stage, 0) + delta
+            if count:
+                by_stage[stage] = count
+            else:
+                by_stage.pop(stage, None)
+        summary["emails_sent"] = summary.get("emails_sent", 0) + emails_sent
+
+    update_campaign_file(campaign_path, "metrics", mutate)
+
+
+def counters_consistent(summary: dict, stages: dict | None = None, emails_sent: int = 0) -> bool:
+    """Whether summary's counters are all there, add up, and stay non-negative after the deltas."""
+    total, by_stage, sent = (summary.get(key) for key in ("total_targets", "by_stage", "emails_sent"))
+    if not isinstance(total, int) or not isinstance(sent, int) or not isinstance(by_stage, dict):
+        return False
+    if not all(isinstance(count, int) and count >= 0 for count in by_stage.values()):
+        return False
+    if sum(by_stage.values()) != total or sent + emails_sent < 0:
+        return False
+    return all(by_stage.get(stage, 0) + delta >= 0 for stage, delta in (stages or {}).items())
+
+
+def count_metrics(campaign_path: Path) -> dict:
+    """The summary counters recomputed from every target (both formats)."""
+    data, _ = target_store(campaign_path).load()
+    refs = data.get("target_references", [])
+    targets = data.get("targets", [])
 
-    event = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "type": event_type,
-        "message": message
-    }
+    by_stage = {}
+    emails_sent = 0
+    for ref in refs:
+        stage = ref.get("campaign_stage", "unknown")
+        by_stage[stage] = by_stage.get(stage, 0) + 1
+        emails_sent += ref.get("touch_count", 0)
+    for t in targets:
+        stage = t.get("stage", "unknown")
+        by_stage[stage] = by_stage.get(stage, 0) + 1
+        emails_sent += sum(1 for touch in t.get("touches", []) if touch.get("channel") == "email")
 
-    data["events"].insert(0, event)  # Most recent first
+    return {"total_targets": len(refs) + len(targets), "by_stage": by_stage, "emails_sent": emails_sent}
 
-    # Keep only last 1000 events
-    if len(data["events"]) > 1000:
-        data["events"] = data["events"][:1000]
 
-    write_campaign_file(campaign_path, "log", data, markdown)
+def rebuild_metrics(campaign_name: str) -> dict:
+    """Recount the metrics counters from scratch; reports where the maintained ones had drifted."""
+    campaign_path = get_campaign_path(campaign_name)
 
-    return event
+    if not campaign_path.exists():
+        raise ValueError(f"Campaign '{campaign_name}' not found")
 
+    drift = {}
+
+    def mutate(metrics_data):
+        summary = metrics_data.setdefault("summary", {})
+        for key in ["total_targets", "emails_sent"]:
+            if summary.get(key, 0) != counted[key]:
+                drift[key] = {"recorded": summary.get(key, 0), "counted": counted[key]}
+        recorded_stages = summary.get("by_stage", {})
+        stages = {
+            stage: {"recorded": recorded_stages.get(stage, 0), "counted": counted["by_stage"].get(stage, 0)}
+            for stage in sorted(set(recorded_stages) | set(counted["by_stage"]))
+            if recorded_stages.get(stage, 0) != counted["by_stage"].get(stage, 0)
+        }
+        if stages:
+            drift["by_stage"] = stages
 
-def update_metrics_count_v2(campaign_path: Path):
-    """Update target count metrics (v2 format)."""
-    targets_data, _ = read_campaign_file(campaign_path, "targets")
-    metrics_data, metrics_md = read_campaign_file(campaign_path, "metrics")
+        summary.update(counted)
+        metrics_data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
 
-    refs = targets_data.get("target_references", [])
+    # Hold the targets still between counting and writing
+    store = target_store(campaign_path)
+    with store.locked():
+        counted = count_metrics(campaign_path)
+        update_campaign_file(campaign_path, "metrics", mutate)
 
-    # Count by stage
-    by_stage = {}
-    total_touches = 0
-    for ref in refs:
-        stage = ref.get("campaign_stage", "unknown")
-        by_stage[stage] = by_stage.get(stage, 0) + 1
-        total_touches += ref.get("touch_count", 0)
+    return {"summary": counted, "drifted": bool(drift), "drift": drift}
 
-    metrics_data["summary"]["total_targets"] = len(refs)
-    metrics_data["summary"]["by_stage"] = by_stage
-    metrics_data["summary"]["emails_sent"] = total_touches
-    metrics_data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
 
-    write_campaign_file(campaign_path, "metrics", metrics_data, metrics_md)
+def compact_campaign(campaign_name: str) -> dict:
+    """Fold the campaign's pending target changes into targets.md and rebuild its log.md view."""
+    campaign_path = get_campaign_path(campaign_name)
 
+    if not campaign_path.exists():
+        raise ValueError(f"Campaign '{campaign_name}' not found")
 
-def update_metrics_count(campaign_path: Path):
-    """Update target count metrics (legacy format)."""
-    targets_data, _ = read_campaign_file(campaign_path, "targets")
-    metrics_data, metrics_md = read_campaign_file(campaign_path, "metrics")
+    store = target_store(campaign_path)
+    pending = len(store.changes())
+    folded = pending if store.flush() else 0
+
+    log = CampaignLog(campaign_path)
+    if log.path.exists():
+        with atomic_io.locked(log.path):
+            log.compact()
+    return {"target_changes": folded, "log_compacted": log.path.exists()}
+
+
+def run_operation(input_data: dict) -> dict:
+    """Apply one operation; returns its result."""
+    campaign_name = input_data.get("campaign")
+    operation = input_data.get("operation")
+    data = input_data.get("data", {})
+    target_id = input_data.get("target_id")
+    prospect_slug = input_data.get("prospect_slug")
+
+    if not operation:
+        raise ValueError("Missing required field: operation")
+
+    if operation == "create":
+        if not campaign_name:
+            campaign_name = data.get("name")
+        if not campaign_name:
+            raise ValueError("Missing campaign name")
+
+        config = create_campaign(campaign_name, data)
+        result = {
+            "status": "success",
+            "message": f"Campaign '{campaign_name}' created",
+            "campaign_path": str(get_campaign_path(campaign_name)),
+            "data": config
+        }
 
-    targets = targets_data.get("targets", [])
+    elif operation == "update_config":
+        if not campaign_name:
+            raise ValueError("Missing campaign name")
 
-    # Count by stage
-    by_stage = {}
-    for t in targets:
-        stage = t.get("stage", "unknown")
-        by_stage[stage] = by_stage.get(stage, 0) + 1
+        config = update_config(campaign_name, data)
+        result = {
+            "status": "success",
+            "message": f"Campaign '{campaign_name}' config updated",
+            "campaign_path": str(get_campaign_path(campaign_name)),
+            "data": config
+        }
 
-    metrics_data["summary"]["total_targets"] = len(targets)
-    metrics_data["summary"]["by_stage"] = by_stage
-    metrics_data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
+    elif operation == "add_target_by_prospect":
+        if not campaign_name:
+            raise ValueError("Missing campaign name")
+        if not prospect_slug:
+            prospect_slug = data.get("prospect_slug")
+        if not prospect_slug:
+            raise ValueError("Missing prospect_slug")
+
+        target_ref = add_target_by_prospect(campaign_name, prospect_slug)
+        result = {
+            "status": "success",
+            "message": f"Target reference added for prospect '{prospect_slug}'",
+            "campaign_path": str(get_campaign_path(campaign_name)),
+            "data": target_ref
+        }
 
-    write_campaign_file(campaign_path, "metrics", metrics_data, metrics_md)
+    elif operation == "add_target":
+        if not campaign_name:
+            raise ValueError("Missing campaign name")
 
+        target = add_target(campaign_name, data)
+        result = {
+            "status": "success",
+            "message": f"Target '{target['name']}' added to campaign",
+            "campaign_path": str(get_campaign_path(campaign_name)),
+            "data": target
+        }
 
-def update_touch_metrics(campaign_path: Path, channel: str):
-    """Update touch metrics."""
-    metrics_data, metrics_md = read_campaign_file(campaign_path, "metrics")
+    elif operation == "update_target_stage_sync":
+        if not campaign_name:
+            raise ValueError("Missing campaign name")
+        if not target_id:
+            raise ValueError("Missing target_id")
+
+        new_stage = data.get("stage")
+        if not new_stage:
+            raise ValueError("Missing stage in data")
+
+        target_ref = update_target_stage_sync(campaign_name, target_id, new_stage)
+        result = {
+            "status": "success",
+            "message": f"Target stage updated and synced to prospect",
+            "campaign_path": str(get_campaign_path(campaign_name)),
+            "data": target_ref
+        }
 
-    if channel == "email":
-        metrics_data["summary"]["emails_sent"] = metrics_data["summary"].get("emails_sent", 0) + 1
+    elif operation == "update_target":
+        if not campaign_name:
+            raise ValueError("Missing campaign name")
+        if not target_id:
+            raise ValueError("Missing target_id")
+
+        target = update_target(campaign_name, target_id, data)
+        result = {
+            "status": "success",
+            "message": "Target updated",
+            "campaign_path": str(get_campaign_path(campaign_name)),
+            "data": target
+        }
 
-    metrics_data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
+    elif operation == "record_touch":
+        if not campaign_name:
+            raise ValueError("Missing campaign name")
+        if not target_id:
+            raise ValueError("Missing target_id")
+
+        touch = record_touch(campaign_name, target_id, data)
+        result = {
+            "status": "success",
+            "message": f"Touch recorded for target",
+            "campaign_path": str(get_campaign_path(campaign_name)),
+            "data": touch
+        }
 
-    write_campaign_file(campaign_path, "metrics", metrics_data, metrics_md)
+    elif operation == "rebuild_metrics":
+        if not campaign_name:
+            raise ValueError("Missing campaign name")
 
+        rebuilt = rebuild_metrics(campaign_name)
+        result = {
+            "status": "success",
+            "message": "Metrics rebuilt" + (" (counters had drifted)" if rebuilt["drifted"] else ""),
+            "campaign_path": str(get_campaign_path(campaign_name)),
+            "data": rebuilt
+        }
 
-def main():
-    try:
-        input_data = json.loads(sys.stdin.read())
+    elif operation == "compact":
+        if not campaign_name:
+            raise ValueError("Missing campaign name")
 
-        campaign_name = input_data.get("campaign")
-        operation = input_data.get("operation")
-        data = input_data.get("data", {})
-        target_id = input_data.get("target_id")
-        prospect_slug = input_data.get("prospect_slug")
-
-        if not operation:
-            raise ValueError("Missing required field: operation")
-
-        if operation == "create":
-            if not campaign_name:
-                campaign_name = data.get("name")
-            if not campaign_name:
-                raise ValueError("Missing campaign name")
-
-            config = create_campaign(campaign_name, data)
-            result = {
-                "status": "success",
-                "message": f"Campaign '{campaign_name}' created",
-                "campaign_path": str(get_campaign_path(campaign_name)),
-                "data": config
-            }
+        compacted = compact_campaign(campaign_name)
+        result = {
+            "status": "success",
+            "message": "Campaign compacted",
+            "campaign_path": str(get_campaign_path(campaign_name)),
+            "data": compacted
+        }
 
-        elif operation == "update_config":
-            if not campaign_name:
-                raise ValueError("Missing campaign name")
+    elif operation == "log_event":
+        if not campaign_name:
+            raise ValueError("Missing campaign name")
+
+        event_type = data.get("type", "INFO")
+        message = data.get("message", "")
+        event = log_event(campaign_name, event_type, message)
+        result = {
+            "status": "success",
+            "message": "Event logged",
+            "campaign_path": str(get_campaign_path(campaign_name)),
+            "data": event
+        }
 
-            config = update_config(campaign_name, data)
-            result = {
-                "status": "success",
-                "message": f"Campaign '{campaign_name}' config updated",
-                "campaign_path": str(get_campaign_path(campaign_name)),
-                "data": config
-            }
+    else:
+        raise ValueError(f"Unknown operation: {operation}")
 
-        elif operation == "add_target_by_prospect":
-            if not campaign_name:
-                raise ValueError("Missing campaign name")
-            if not prospect_slug:
-                prospect_slug = data.get("prospect_slug")
-            if not prospect_slug:
-                raise ValueError("Missing prospect_slug")
-
-            target_ref = add_target_by_prospect(campaign_name, prospect_slug)
-            result = {
-                "status": "success",
-                "message": f"Target reference added for prospect '{prospect_slug}'",
-                "campaign_path": str(get_campaign_path(campaign_name)),
-                "data": target_ref
-            }
+    return result
 
-        elif operation == "add_target":
-            if not campaign_name:
-                raise ValueError("Missing campaign name")
 
-            target = add_target(campaign_name, data)
-            result = {
-                "status": "success",
-                "message": f"Target '{target['name']}' added to campaign",
-                "campaign_path": str(get_campaign_path(campaign_name)),
-                "data": target
-            }
+def run_batch(operations: list, default_campaign: str | None) -> dict:
+    """Apply operations in order, writing nothing unless all of them succeed."""
+    global _batch
+    if not isinstance(operations, list):
+        raise ValueError("operations must be a list")
 
-        elif operation == "update_target_stage_sync":
-            if not campaign_name:
-                raise ValueError("Missing campaign name")
-            if not target_id:
-                raise ValueError("Missing target_id")
-
-            new_stage = data.get("stage")
-            if not new_stage:
-                raise ValueError("Missing stage in data")
-
-            target_ref = update_target_stage_sync(campaign_name, target_id, new_stage)
-            result = {
-                "status": "success",
-                "message": f"Target stage updated and synced to prospect",
-                "campaign_path": str(get_campaign_path(campaign_name)),
-                "data": target_ref
-            }
+    _batch = Batch()
+    results = []
+    try:
+        for i, op in enumerate(operations):
+            op = {"campaign": default_campaign, **op}
+            operation = op.get("operation")
+            try:
+                results.append({"operation": operation, **run_operation(op)})
+            except Exception as e:
+                results.append({"operation": operation, "status": "error", "message": str(e)})
+                _batch.rollback()
+                return {
+                    "status": "error",
+                    "message": f"Operation {i + 1} ({operation}) failed: {e} - batch rolled back",
+                    "failed": i,
+                    "results": results
+                }
+        _batch.commit()
+    finally:
+        _batch = None
 
-        elif operation == "update_target":
-            if not campaign_name:
-                raise ValueError("Missing campaign name")
-            if not target_id:
-                raise ValueError("Missing target_id")
-
-            target = update_target(campaign_name, target_id, data)
-            result = {
-                "status": "success",
-                "message": "Target updated",
-                "campaign_path": str(get_campaign_path(campaign_name)),
-                "data": target
-            }
+    return {
+        "status": "success",
+        "message": f"{len(results)} operations applied",
+        "results": results
+    }
 
-        elif operation == "record_touch":
-            if not campaign_name:
-                raise ValueError("Missing campaign name")
-            if not target_id:
-                raise ValueError("Missing target_id")
-
-            touch = record_touch(campaign_name, target_id, data)
-            result = {
-                "status": "success",
-                "message": f"Touch recorded for target",
-                "campaign_path": str(get_campaign_path(campaign_name)),
-                "data": touch
-            }
 
-        elif operation == "log_event":
-            if not campaign_name:
-                raise ValueError("Missing campaign name")
-
-            event_type = data.get("type", "INFO")
-            message = data.get("message", "")
-            event = log_event(campaign_name, event_type, message)
-            result = {
-                "status": "success",
-                "message": "Event logged",
-                "campaign_path": str(get_campaign_path(campaign_name)),
-                "data": event
-            }
+def main():
+    try:
+        input_data = json.loads(sys.stdin.read())
 
-        else:
-            raise ValueError(f"Unknown operation: {operation}")
+        if "operations" in input_data:
+            result = run_batch(input_data["operations"], input_data.get("campaign"))
+            print(json.dumps(result))
+            if result["status"] != "success":
+                sys.exit(1)
+            return
 
-        print(json.dumps(result))
+        print(json.dumps(run_operation(input_data)))
 
     except Exception as e:
         error_result = {
@@ -29,6 +29,10 @@ import subprocess
 from pathlib import Path
 from datetime import datetime
 
+# Add this directory to path for shared write layer imports
+sys.path.insert(0, str(Path(__file__).parent))
+import atomic_io
+
 
 def load_pending_approvals() -> dict:
     """Load pending approvals file."""
@@ -44,11 +48,41 @@ def load_pending_approvals() -> dict:
     return json.loads(file_path.read_text(encoding="utf-8"))
 
 
-def save_pending_approvals(data: dict):
-    """Save pending approvals file."""
-    file_path = Path("state") / "pending_approvals.json"
+def record_outcomes(data: dict, outcomes: dict):
+    """
+    Apply execution outcomes ({action_id: changes}) to freshly read data.
+
+    Actions are executed against an earlier snapshot, so the file is re-read
+    under its lock and only the executed actions are touched; anything
+    queued or approved meanwhile is kept.
+    """
+    for action in data.get("pending", []):
+        changes = outcomes.get(action.get("id"))
+        if not changes:
+            continue
+        action.update(changes)
+
+        if changes.get("status") == "executed":
+            # Update history
+            for h in data.get("history", []):
+                if h["id"] == action["id"]:
+                    h["status"] = "executed"
+                    h["executed_at"] = action["executed_at"]
+                    break
+
+    # Remove executed from pending
+    data["pending"] = [a for a in data.get("pending", []) if a.get("status") != "executed"]
     data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
-    file_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+def save_outcomes(outcomes: dict):
+    """Record execution outcomes in the pending approvals file under its lock."""
+    file_path = Path("state") / "pending_approvals.json"
+    atomic_io.update_json(
+        file_path,
+        lambda data: record_outcomes(data, outcomes),
+        default=lambda: {"version": 1, "pending": [], "history": []}
+    )
 
 
 def execute_email(action: dict) -> dict:
@@ -195,6 +229,7 @@ def main():
         now = datetime.utcnow()
 
         results = []
+        outcomes = {}
         executed = 0
         failed = 0
 
@@ -220,28 +255,21 @@ def main():
 
             if exec_result.get("status") == "success":
                 executed += 1
-                if not dry_run:
-                    # Mark as executed
-                    action["status"] = "executed"
-                    action["executed_at"] = now.isoformat() + "Z"
-
-                    # Update history
-                    for h in data["history"]:
-                        if h["id"] == action["id"]:
-                            h["status"] = "executed"
-                            h["executed_at"] = action["executed_at"]
-                            break
+                # Mark as executed
+                outcomes[action["id"]] = {
+                    "status": "executed",
+                    "executed_at": now.isoformat() + "Z"
+                }
             else:
                 failed += 1
-                if not dry_run:
-                    # Keep as approved for retry, but log error
-                    action["last_error"] = exec_result.get("error")
-                    action["last_attempt"] = now.isoformat() + "Z"
+                # Keep as approved for retry, but log error
+                outcomes[action["id"]] = {
+                    "last_error": exec_result.get("error"),
+                    "last_attempt": now.isoformat() + "Z"
+                }
 
-        # Remove executed from pending
         if not dry_run:
-            data["pending"] = [a for a in data["pending"] if a.get("status") != "executed"]
-            save_pending_approvals(data)
+            save_outcomes(outcomes)
 
         result = {
             "status": "success",
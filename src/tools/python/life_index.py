@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+life_index.py - Persistent inverted index over a tenant's memory files.
+
+Indexes every *.md file under life/, identity/, knowledge/ and
+relationships/ so recall.py and life_read.py can answer a query without
+rescanning every file line by line.
+
+Layout (relative to the tenant folder):
+    state/.index/life/manifest.json       per-file mtime_ns, size, shards
+    state/.index/life/postings/<xx>.json  token -> {file: [locators]}
+    state/.index/life/vocab.json          shard -> [tokens]
+
+Postings are sharded by the first two characters of each token, so a query
+only loads the shards for its own tokens. A locator is either:
+- an int: 1-based line number in the raw file (frontmatter included)
+- [ordinal, [key, ...]]: a string leaf in the JSON frontmatter, with its
+  position in traversal order and its key path
+
+The index is refreshed incrementally: files whose (mtime_ns, size) changed
+since they were last indexed are re-tokenized, deleted files are dropped,
+and untouched files cost a single stat(). A refresh holds the manifest's
+lock (atomic_io) from its first stat to its last write, and starts over
+from disk if another process saved the index since it was loaded, so
+concurrent refreshes never mix one's manifest with the other's shards.
+
+Matching semantics: a line (or frontmatter value) containing the query
+has, for every word token of the query, a token that contains it (the
+query's first token may be the end of a word, its last the start of one).
+Candidates are looked up that way, through the vocabulary, then confirmed
+with the same case-insensitive substring check the tools always used. A
+query without word characters (e.g. "--") has nothing to look up and is
+checked against every line, as is one with a token shorter than
+MIN_LOOKUP characters, which would pull in most of the vocabulary.
+"""
+
+import sys
+import json
+import os
+import re
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add this directory to path for shared life store imports
+sys.path.insert(0, str(Path(__file__).parent))
+import life_store
+import frontmatter
+import atomic_io
+
+
+INDEX_VERSION = 2
+INDEX_DIR = Path("state") / ".index" / "life"
+INDEXED_ROOTS = ["life", "identity", "knowledge", "relationships"]
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Shorter query tokens are contained in most indexed tokens; scanning is cheaper
+MIN_LOOKUP = 3
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def shard_key(token: str) -> str:
+    """Shard name for a token (its first two characters)."""
+    return token[:2]
+
+
+def format_data_path(keys: list) -> str:
+    """Render a key path the way life_read's search_content does (a.b[0].c)."""
+    path = ""
+    for key in keys:
+        if isinstance(key, int):
+            path = f"{path}[{key}]"
+        else:
+            path = f"{path}.{key}" if path else key
+    return path
+
+
+def resolve_keys(data, keys: list):
+    """Walk a key path produced by iter_string_leaves."""
+    current = data
+    for key in keys:
+        try:
+            current = current[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return current
+
+
+def iter_string_leaves(obj, keys=None):
+    """Yield (keys, value) for every string leaf, in search_content order."""
+    keys = keys or []
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            yield from iter_string_leaves(value, keys + [key])
+    elif isinstance(obj, list):
+        for i, item in enumerate(obj):
+            yield from iter_string_leaves(item, keys + [i])
+    elif isinstance(obj, str):
+        yield keys, obj
+
+
+def markdown_offset(content: str, markdown: str) -> int:
+    """Number of raw lines that precede the markdown body."""
+    if not markdown or not content.endswith(markdown) or len(markdown) == len(content):
+        return 0
+    return content[:len(content) - len(markdown)].count("\n")
+
+
+def tokenize_file(file_path: Path) -> tuple[dict, int, bool]:
+    """
+    Tokenize one file.
+
+    Returns ({token: [locators]}, markdown_offset, has_frontmatter_data).
+    """
+    content = file_path.read_text(encoding="utf-8")
+    data, markdown = frontmatter.parse(content)
+
+    postings: dict[str, list] = {}
+
+    for line_no, line in enumerate(content.split("\n"), start=1):
+        for token in set(tokenize(line)):
+            postings.setdefault(token, []).append(line_no)
+
+    for ordinal, (keys, value) in enumerate(iter_string_leaves(data)):
+        for token in set(tokenize(value)):
+            postings.setdefault(token, []).append([ordinal, keys])
+
+    return postings, markdown_offset(content, markdown), bool(data)
+
+
+class LifeIndex:
+    """On-disk inverted index with incremental refresh."""
+
+    def __init__(self, index_dir: Path = INDEX_DIR, roots: list[str] | None = None):
+        self.index_dir = Path(index_dir)
+        self.postings_dir = self.index_dir / "postings"
+        self.manifest_path = self.index_dir / "manifest.json"
+        self.vocab_path = self.index_dir / "vocab.json"
+        self.roots = roots or INDEXED_ROOTS
+        self._load()
+
+    # -- storage ---------------------------------------------------------
+
+    def _load(self) -> None:
+        """(Re)load the manifest, dropping every shard read so far."""
+        # Without a current manifest, the index is rebuilt without reading old shards
+        self._rebuilding = False
+        self._loaded = atomic_io.fingerprint(self.manifest_path)
+        self.manifest = self._load_manifest()
+        self._shards: dict[str, dict] = {}
+        self._vocab: dict[str, list[str]] | None = None
+        self._dirty: set[str] = set()
+        self._manifest_dirty = False
+
+    @contextmanager
+    def _locked(self):
+        """Hold the index's lock, reloading first if another process saved it meanwhile."""
+        with atomic_io.index_locked(self.manifest_path):
+            if atomic_io.fingerprint(self.manifest_path) != self._loaded:
+                self._load()
+            yield
+
+    def _load_manifest(self) -> dict:
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            if manifest.get("version") == INDEX_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        self._rebuilding = True
+        return {"version": INDEX_VERSION, "files": {}}
+
+    def _shard(self, key: str) -> dict:
+        if key not in self._shards:
+            path = self.postings_dir / f"{key}.json"
+            try:
+                self._shards[key] = {} if self._rebuilding else json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._shards[key] = {}
+        return self._shards[key]
+
+    def vocab(self) -> dict[str, list[str]]:
+        """Every indexed token, by shard."""
+        if self._vocab is None:
+            try:
+                self._vocab = {} if self._rebuilding else json.loads(self.vocab_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._vocab = {}
+        return self._vocab
+
+    @staticmethod
+    def _write_json(path: Path, data) -> None:
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data, separators=(",", ":"), ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def save(self) -> None:
+        """Persist dirty shards and the manifest."""
+        if not self._manifest_dirty:
+            return
+        vocab = self.vocab()
+        for key in self._dirty:
+            if self._shards[key]:
+                vocab[key] = sorted(self._shards[key])
+            else:
+                vocab.pop(key, None)
+
+        self.postings_dir.mkdir(parents=True, exist_ok=True)
+        for key in self._dirty:
+            self._write_json(self.postings_dir / f"{key}.json", self._shards[key])
+        self._write_json(self.vocab_path, vocab)
+        self._write_json(self.manifest_path, self.manifest)
+        self._loaded = atomic_io.fingerprint(self.manifest_path)
+        self._dirty.clear()
+        self._manifest_dirty = False
+
+    # -- maintenance -----------------------------------------------------
+
+    def _drop(self, rel: str) -> None:
+        entry = self.manifest["files"].pop(rel, None)
+        if not entry:
+            return
+        for key in entry.get("shards", []):
+            shard = self._shard(key)
+            for token in [t for t, files in shard.items() if rel in files]:
+                del shard[token][rel]
+                if not shard[token]:
+                    del shard[token]
+            self._dirty.add(key)
+        self._manifest_dirty = True
+
+    def _add(self, rel: str, stat: os.stat_result) -> None:
+        try:
+            postings, offset, has_data = tokenize_file(Path(rel))
+        except (OSError, UnicodeDecodeError):
+            return
+
+        keys = set()
+        for token, locators in postings.items():
+            key = shard_key(token)
+            self._shard(key).setdefault(token, {})[rel] = locators
+            keys.add(key)
+
+        self._dirty.update(keys)
+        self._manifest_dirty = True
+        self.manifest["files"][rel] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "markdown_offset": offset,
+            "has_data": has_data,
+            "shards": sorted(keys)
+        }
+
+    def _is_current(self, rel: str, stat: os.stat_result) -> bool:
+        entry = self.manifest["files"].get(rel)
+        return bool(entry) and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size
+
+    def _refresh_entry(self, rel: str) -> None:
+        try:
+            stat = os.stat(rel)
+        except OSError:
+            self._drop(rel)
+            return
+        if not self._is_current(rel, stat):
+            self._drop(rel)
+            self._add(rel, stat)
+
+    def refresh_file(self, file_path: Path) -> None:
+        """Bring a single file's postings up to date and persist them."""
+        rel = Path(file_path).as_posix()
+        if Path(rel).is_dir():
+            return
+        with self._locked():
+            self._refresh_entry(rel)
+            self.save()
+
+    def refresh(self) -> None:
+        """Bring every indexed root up to date (stat-only for unchanged files)."""
+        with self._locked():
+            seen = set()
+            for root in self.roots:
+                root_path = Path(root)
+                if not root_path.is_dir():
+                    continue
+                for file_path in root_path.rglob("*.md"):
+                    rel = file_path.as_posix()
+                    seen.add(rel)
+                    self._refresh_entry(rel)
+
+            for rel in [r for r in self.manifest["files"] if r not in seen]:
+                self._drop(rel)
+
+            self.save()
+
+    # -- queries ---------------------------------------------------------
+
+    def candidates(self, query: str, files: set[str] | None = None) -> dict[str, list] | None:
+        """
+        Find locators with, for every query token, a token containing it.
+
+        Returns {file: [locators]}, a superset of the lines and values that
+        contain the query; callers confirm with a substring check. Returns
+        None if the query has no word token worth looking up (callers
+        check every line instead).
+        """
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens or any(len(token) < MIN_LOOKUP for token in query_tokens):
+            return None
+
+        vocab = self.vocab()
+        result: dict[str, set] | None = None
+        for q_token in query_tokens:
+            matches: dict[str, set] = {}
+            tokens = [token for key in vocab for token in vocab[key] if q_token in token]
+            for token in tokens:
+                postings = self._shard(shard_key(token)).get(token, {})
+                for rel, locators in postings.items():
+                    if files is not None and rel not in files:
+                        continue
+                    bucket = matches.setdefault(rel, set())
+                    for locator in locators:
+                        bucket.add(json.dumps(locator) if isinstance(locator, list) else locator)
+
+            if result is None:
+                result = matches
+            else:
+                result = {
+                    rel: result[rel] & locs
+                    for rel, locs in matches.items()
+                    if rel in result and result[rel] & locs
+                }
+            if not result:
+                return {}
+
+        return {
+            rel: [json.loads(loc) if isinstance(loc, str) else loc for loc in locs]
+            for rel, locs in (result or {}).items()
+        }
+
+    def search_lines(self, query: str, scope: list[Path] | None = None) -> dict[str, list[str]]:
+        """
+        Raw line search (recall text mode).
+
+        scope limits results to the given files or folders. Returns
+        {file: [matching stripped lines]} in line order.
+        """
+        query_lower = query.lower()
+        results = {}
+
+        candidates = self.candidates(query)
+        if candidates is None:
+            # Nothing to look up; every line of every file is a candidate
+            candidates = {rel: None for rel in self.manifest["files"]}
+        if scope is not None:
+            prefixes = [Path(p).as_posix() for p in scope]
+            candidates = {
+                rel: locs for rel, locs in candidates.items()
+                if any(rel == p or rel.startswith(p + "/") for p in prefixes)
+            }
+
+        for rel, locators in sorted(candidates.items()):
+            line_numbers = None if locators is None else sorted(loc for loc in locators if isinstance(loc, int))
+            if line_numbers == []:
+                continue
+            try:
+                lines = Path(rel).read_text(encoding="utf-8").split("\n")
+            except (OSError, UnicodeDecodeError):
+                continue
+            if line_numbers is None:
+                line_numbers = range(1, len(lines) + 1)
+            matches = [
+                lines[n - 1].strip() for n in line_numbers
+                if n <= len(lines) and query_lower in lines[n - 1].lower()
+            ]
+            if matches:
+                results[rel] = matches
+
+        return results
+
+    def search_document(self, file_path: Path, data: dict, markdown: str, query: str) -> list[dict]:
+        """
+        Structured search of one file (life_read query mode).
+
+        Returns matches in the same shape and order as life_store.search_content.
+        """
+        rel = Path(file_path).as_posix()
+        entry = self.manifest["files"].get(rel)
+        if not entry or not entry.get("has_data"):
+            # Unindexed, or data came from schema defaults rather than the file
+            return life_store.search_content(data, markdown, query)
+
+        candidates = self.candidates(query, {rel})
+        if candidates is None:
+            return life_store.search_content(data, markdown, query)
+
+        query_lower = query.lower()
+        locators = candidates.get(rel, [])
+        offset = entry.get("markdown_offset", 0)
+
+        data_hits = sorted(loc for loc in locators if isinstance(loc, list))
+        results = []
+        for _, keys in data_hits:
+            value = resolve_keys(data, keys)
+            if isinstance(value, str) and query_lower in value.lower():
+                results.append({
+                    "type": "data",
+                    "path": format_data_path(keys),
+                    "value": value,
+                    "match": query
+                })
+
+        lines = markdown.split("\n")
+        for raw_line in sorted(loc for loc in locators if isinstance(loc, int)):
+            line = raw_line - offset
+            if 1 <= line <= len(lines) and query_lower in lines[line - 1].lower():
+                results.append({
+                    "type": "markdown",
+                    "line": line,
+                    "content": lines[line - 1].strip(),
+                    "match": query
+                })
+
+        return results
@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+life_semantic.py - Offline semantic (vector) index over a tenant's memory.
+
+life_rank.py ranks by shared terms; this module ranks by vector
+similarity, so "who handles financing" can find a section about lenders
+and preapprovals. Every *.md file under life/, identity/, knowledge/,
+relationships/ and timeline/ is split into the same sections life_rank
+uses, and each section is embedded into a fixed-width float32 vector.
+
+Embedders (both fully offline):
+- a local sentence-transformers model, when PROXYSTAFF_EMBEDDING_MODEL
+  points at a model folder on disk and the package is installed
+- otherwise a hashed TF-IDF embedding: stemmed terms and their character
+  trigrams are hashed (crc32) into DIM signed buckets, weighted 1 + log(tf)
+  and L2-normalised. IDF is applied on the query side from per-bucket
+  document frequencies, so a file's vectors never go stale when the rest
+  of the corpus changes.
+
+Layout (relative to the tenant folder):
+    state/.index/semantic/vectors.f32     header + row-major float32 matrix
+    state/.index/semantic/ids.marshal     id table: per-file mtime_ns, size,
+                                          row range and section locators,
+                                          bucket document frequencies,
+                                          IVF centroids and row assignments
+
+vectors.f32 is memory-mapped for queries. Its header carries a generation
+stamp that ids.marshal must match, so a crash between the two writes is
+detected and answered with a full rebuild rather than wrong rows.
+
+Refresh is incremental: only files whose (mtime_ns, size) changed are
+re-embedded. Unchanged files' rows (and IVF assignments) are copied across
+when the matrix is rewritten. Refreshes (and persisting trained
+centroids) hold ids.marshal's lock (atomic_io) and reload first if
+another process wrote the index since it was loaded.
+
+Search is exact (every row scored) by default. Approximate search uses an
+inverted-file (IVF) index, trained on first use once there are
+IVF_MIN_ROWS rows: ~sqrt(rows) centroids by spherical k-means on a
+sample, each row assigned to its nearest centroid. A query scores only
+the rows of the NPROBE centroids closest to it. Refreshes keep the
+centroids and assign re-embedded rows to them; once the row count has
+doubled since training they are dropped and retrained on next use.
+
+Usage:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from life_semantic import LifeSemantic
+
+    index = LifeSemantic()
+    index.refresh()
+    index.search("who handles financing", limit=10)
+"""
+
+import sys
+import os
+import math
+import mmap
+import heapq
+import random
+import struct
+import marshal
+import zlib
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from operator import itemgetter, mul
+from pathlib import Path
+
+# Add this directory to path for shared codec imports
+sys.path.insert(0, str(Path(__file__).parent))
+import atomic_io
+from life_index import INDEXED_ROOTS
+from life_rank import count_terms, section_file, snippet, tokenize, trigrams
+
+
+SEMANTIC_VERSION = 1
+SEMANTIC_DIR = Path("state") / ".index" / "semantic"
+SEMANTIC_ROOTS = INDEXED_ROOTS + ["timeline"]
+
+MODEL_ENV = "PROXYSTAFF_EMBEDDING_MODEL"
+
+# Hashed TF-IDF embedding width, and the weight of a term's trigrams
+# relative to the term itself
+DIM = 256
+GRAM_WEIGHT = 0.5
+
+# IVF: trained once there are IVF_MIN_ROWS rows; a query probes NPROBE lists
+IVF_MIN_ROWS = 2000
+IVF_SAMPLE = 16
+IVF_ITERATIONS = 2
+NPROBE = 16
+
+# Hits below this cosine are bucket-collision noise
+MIN_SCORE = 0.05
+
+# vectors.f32 header: magic, generation, rows, dim
+HEADER = struct.Struct("<8sQII")
+MAGIC = b"PSVEC001"
+
+
+def _bucket(feature: str) -> tuple[int, float]:
+    """Bucket and sign for a feature (crc32 is stable across processes)."""
+    h = zlib.crc32(feature.encode("utf-8"))
+    return h % DIM, (1.0 if h & 0x80000000 else -1.0)
+
+
+class HashedEmbedder:
+    """Hashed TF-IDF vectors: stdlib only, deterministic, no model files."""
+
+    name = f"hashed-tfidf-{DIM}"
+    dim = DIM
+    uses_idf = True
+
+    @staticmethod
+    def features(counts: dict[str, int]) -> dict[str, float]:
+        features: dict[str, float] = {}
+        for term, count in counts.items():
+            weight = 1 + math.log(count)
+            features[term] = features.get(term, 0.0) + weight
+            if term.isalpha() and len(term) > 3:
+                grams = trigrams(term)
+                for gram in grams:
+                    features[gram] = features.get(gram, 0.0) + weight * GRAM_WEIGHT / len(grams)
+        return features
+
+    def embed_counts(self, counts: dict[str, int]) -> list[float]:
+        vector = [0.0] * DIM
+        for feature, weight in self.features(counts).items():
+            bucket, sign = _bucket(feature)
+            vector[bucket] += sign * weight
+        return normalize(vector)
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_counts(count_terms(text)[0]) for text in texts]
+
+    def embed_sections(self, sections: list[tuple]) -> list[list[float]]:
+        """Embed life_rank sections, reusing their term counts."""
+        return [self.embed_counts(counts) for _, _, _, _, counts, _ in sections]
+
+
+class ModelEmbedder:
+    """A sentence-transformers model loaded from a local folder."""
+
+    uses_idf = False
+
+    def __init__(self, model_path: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_path, device="cpu", local_files_only=True)
+        self.name = f"model:{Path(model_path).name}"
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        vectors = self.model.encode(texts, batch_size=32, normalize_embeddings=True)
+        return [[float(x) for x in vector] for vector in vectors]
+
+    def embed_sections(self, sections: list[tuple]) -> list[list[float]]:
+        return self.embed([text for _, _, _, text, _, _ in sections])
+
+
+def get_embedder():
+    """The local model if one is configured and loadable, else hashed TF-IDF."""
+    model_path = os.environ.get(MODEL_ENV)
+    if model_path and Path(model_path).is_dir():
+        try:
+            return ModelEmbedder(model_path)
+        except Exception:
+            # Package missing or model unreadable; stay offline on the fallback
+            pass
+    return HashedEmbedder()
+
+
+def normalize(vector: list[float]) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else vector
+
+
+def dot(a, b) -> float:
+    return sum(map(mul, a, b))
+
+
+class LifeSemantic:
+    """Vector index over memory sections, with a memory-mapped matrix."""
+
+    def __init__(self, index_dir: Path = SEMANTIC_DIR, roots: list[str] | None = None, embedder=None):
+        self.index_dir = Path(index_dir)
+        self.vectors_path = self.index_dir / "vectors.f32"
+        self.ids_path = self.index_dir / "ids.marshal"
+        self.roots = roots or SEMANTIC_ROOTS
+        self.embedder = embedder or get_embedder()
+        self._map = None
+        self._matrix = None
+        self._lists = None
+        self._load()
+
+    # -- storage ---------------------------------------------------------
+
+    def _empty_table(self) -> dict:
+        return {
+            "version": SEMANTIC_VERSION,
+            "embedder": self.embedder.name,
+            "dim": self.embedder.dim,
+            "generation": 0,
+            "rows": 0,
+            "files": {},
+            "df": {},
+            "ivf": None,
+        }
+
+    def _load_table(self) -> dict:
+        try:
+            table = marshal.loads(self.ids_path.read_bytes())
+            if (table.get("version") == SEMANTIC_VERSION
+                    and table.get("embedder") == self.embedder.name
+                    and table.get("dim") == self.embedder.dim):
+                return table
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        return self._empty_table()
+
+    def _load(self) -> None:
+        """(Re)load the id table and map its matrix."""
+        self._loaded = atomic_io.fingerprint(self.ids_path)
+        self.table = self._load_table()
+        self._map_matrix()
+
+    @contextmanager
+    def _locked(self):
+        """Hold the index's lock, reloading first if another process wrote it meanwhile."""
+        with atomic_io.index_locked(self.ids_path):
+            if atomic_io.fingerprint(self.ids_path) != self._loaded:
+                self._load()
+            yield
+
+    def _map_matrix(self) -> None:
+        """Memory-map vectors.f32, or reset the table if it doesn't match."""
+        self.close()
+        if not self.table["rows"]:
+            return
+        try:
+            with open(self.vectors_path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self.table = self._empty_table()
+            return
+
+        magic, generation, rows, dim = HEADER.unpack_from(mapped, 0) if len(mapped) >= HEADER.size else (b"", 0, 0, 0)
+        expected = HEADER.size + rows * dim * 4
+        if (magic != MAGIC or generation != self.table["generation"] or rows != self.table["rows"]
+                or dim != self.table["dim"] or len(mapped) < expected):
+            mapped.close()
+            self.table = self._empty_table()
+            return
+
+        self._map = mapped
+        self._matrix = memoryview(mapped)[HEADER.size:expected].cast("f")
+
+    def close(self) -> None:
+        """Release the memory map."""
+        if self._matrix is not None:
+            self._matrix.release()
+            self._matrix = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._lists = None
+
+    def row(self, i: int):
+        dim = self.table["dim"]
+        return self._matrix[i * dim:(i + 1) * dim]
+
+    def _write(self, matrix: array, table: dict) -> None:
+        """Replace vectors.f32, then ids.marshal, under a new generation."""
+        table["generation"] = (self.table["generation"] + 1) & 0xFFFFFFFFFFFFFFFF
+        pid = os.getpid()
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        tmp_vectors = self.vectors_path.with_name(f"{self.vectors_path.name}.{pid}.tmp")
+        with open(tmp_vectors, "wb") as f:
+            f.write(HEADER.pack(MAGIC, table["generation"], table["rows"], table["dim"]))
+            matrix.tofile(f)
+
+        tmp_ids = self.ids_path.with_name(f"{self.ids_path.name}.{pid}.tmp")
+        tmp_ids.write_bytes(marshal.dumps(table))
+
+        self.close()
+        os.replace(tmp_vectors, self.vectors_path)
+        os.replace(tmp_ids, self.ids_path)
+        self._loaded = atomic_io.fingerprint(self.ids_path)
+
+    # -- maintenance -----------------------------------------------------
+
+    def refresh(self) -> None:
+        """Re-embed changed files, drop deleted ones, rewrite the matrix if needed."""
+        with self._locked():
+            self._refresh()
+
+    def _refresh(self) -> None:
+        old_files = self.table["files"]
+        current: dict[str, os.stat_result] = {}
+        for root in self.roots:
+            root_path = Path(root)
+            if not root_path.is_dir():
+                continue
+            for file_path in root_path.rglob("*.md"):
+                try:
+                    current[file_path.as_posix()] = file_path.stat()
+                except OSError:
+                    continue
+
+        changed = {
+            rel for rel, stat in current.items()
+            if not (rel in old_files
+                    and old_files[rel]["mtime_ns"] == stat.st_mtime_ns
+                    and old_files[rel]["size"] == stat.st_size)
+        }
+        if not changed and len(current) == len(old_files):
+            return
+
+        embedded = {}
+        for rel in changed:
+            try:
+                sections = section_file(Path(rel))
+            except (OSError, UnicodeDecodeError):
+                sections = []
+            vectors = self.embedder.embed_sections(sections)
+            embedded[rel] = ([(kind, locator, line, text) for kind, locator, line, text, _, _ in sections], vectors)
+
+        dim = self.embedder.dim
+        matrix = array("f")
+        assign = array("I")
+        old_assign = array("I")
+        ivf = self.table["ivf"]
+        if ivf:
+            old_assign.frombytes(ivf["assign"])
+
+        table = self._empty_table()
+        table["generation"] = self.table["generation"]
+        df = table["df"]
+
+        for rel in sorted(current):
+            stat = current[rel]
+            start = len(matrix) // dim
+            if rel in embedded:
+                sections, vectors = embedded[rel]
+                buckets: dict[int, int] = {}
+                for vector in vectors:
+                    matrix.extend(vector)
+                    for j, x in enumerate(vector):
+                        if x:
+                            buckets[j] = buckets.get(j, 0) + 1
+                assign.extend([0] * len(vectors))
+            else:
+                entry = old_files[rel]
+                sections, buckets = entry["sections"], entry["buckets"]
+                old_start = entry["start"]
+                if sections:
+                    matrix.frombytes(self._matrix[old_start * dim:(old_start + len(sections)) * dim].tobytes())
+                if ivf:
+                    assign.extend(old_assign[old_start:old_start + len(sections)])
+                else:
+                    assign.extend([0] * len(sections))
+
+            for j, count in buckets.items():
+                df[j] = df.get(j, 0) + count
+            table["files"][rel] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "start": start,
+                "sections": sections,
+                "buckets": buckets if self.embedder.uses_idf else {},
+                "fresh": rel in embedded,
+            }
+
+        table["rows"] = len(matrix) // dim
+        if ivf and table["rows"] < 2 * ivf["trained_rows"]:
+            table["ivf"] = self._assign_fresh(ivf, matrix, assign, table)
+        for entry in table["files"].values():
+            del entry["fresh"]
+
+        try:
+            self._write(matrix, table)
+        except OSError:
+            # Read-only tenant: keep the rebuilt matrix in memory for this process
+            self.close()
+            self.table = table
+            self._matrix = memoryview(matrix)
+            return
+
+        self.table = table
+        self._map_matrix()
+
+    @staticmethod
+    def _assign_fresh(ivf: dict, matrix: array, assign: array, table: dict) -> dict:
+        """Keep the trained centroids, assigning only re-embedded rows."""
+        dim = table["dim"]
+        centroids = unpack_rows(ivf["centroids"], dim)
+        for entry in table["files"].values():
+            if entry["fresh"]:
+                for i in range(entry["start"], entry["start"] + len(entry["sections"])):
+                    assign[i] = nearest(centroids, matrix[i * dim:(i + 1) * dim].tolist())
+        return {"centroids": ivf["centroids"], "assign": assign.tobytes(), "trained_rows": ivf["trained_rows"]}
+
+    def train_ivf(self) -> None:
+        """Train centroids over the current matrix and persist them with the id table."""
+        rows = self.table["rows"]
+        centroids = train_centroids(lambda i: self.row(i).tolist(), rows, self.table["dim"])
+        assign = array("I", (nearest(centroids, self.row(i).tolist()) for i in range(rows)))
+
+        packed = array("f")
+        for centroid in centroids:
+            packed.extend(centroid)
+        self.table["ivf"] = {"centroids": packed.tobytes(), "assign": assign.tobytes(), "trained_rows": rows}
+        self._lists = None
+
+        try:
+            with atomic_io.index_locked(self.ids_path):
+                if atomic_io.fingerprint(self.ids_path) != self._loaded:
+                    # Refreshed by another process meanwhile; these centroids fit the old rows
+                    return
+                tmp_ids = self.ids_path.with_name(f"{self.ids_path.name}.{os.getpid()}.tmp")
+                tmp_ids.write_bytes(marshal.dumps(self.table))
+                os.replace(tmp_ids, self.ids_path)
+                self._loaded = atomic_io.fingerprint(self.ids_path)
+        except OSError:
+            # Read-only tenant; the centroids last for this process only
+            pass
+
+    # -- queries ---------------------------------------------------------
+
+    def query_vector(self, query: str) -> list[float]:
+        """Embed the query, applying IDF per bucket for the hashed embedder."""
+        vector = self.embedder.embed([query])[0]
+        if not self.embedder.uses_idf:
+            return vector
+        n = self.table["rows"]
+        df = self.table["df"]
+        weighted = []
+        for j, x in enumerate(vector):
+            if x:
+                d = df.get(j, 0)
+                x *= math.log(1 + (n - d + 0.5) / (d + 0.5)) ** 2
+            weighted.append(x)
+        return normalize(weighted)
+
+    def _ivf_lists(self) -> tuple[list, list[list[int]]]:
+        if self._lists is None:
+            ivf = self.table["ivf"]
+            dim = self.table["dim"]
+            centroids = unpack_rows(ivf["centroids"], dim)
+            assign = array("I")
+            assign.frombytes(ivf["assign"])
+            lists: list[list[int]] = [[] for _ in centroids]
+            for i, c in enumerate(assign):
+                lists[c].append(i)
+            self._lists = (centroids, lists)
+        return self._lists
+
+    def search(self, query: str, limit: int = 10, prefixes: list[str] | None = None,
+               approximate: bool = False, nprobe: int = NPROBE) -> dict:
+        """
+        Top sections for query by cosine similarity, best first.
+
+        prefixes limits results to files under those paths. approximate
+        probes the IVF index (training it on first use) when there are at
+        least IVF_MIN_ROWS rows; below that search is always exact. Returns
+        {"hits": [...], "sections": N, "approximate": bool, "embedder": name}.
+        """
+        if self._matrix is None and not self.table["rows"]:
+            self.refresh()
+
+        rows = self.table["rows"]
+        approximate = approximate and rows >= IVF_MIN_ROWS
+        result = {"hits": [], "sections": rows, "approximate": approximate, "embedder": self.embedder.name}
+        if not rows:
+            return result
+
+        q = self.query_vector(query)
+        nonzero = [j for j, x in enumerate(q) if x]
+        if not nonzero:
+            return result
+
+        # Row ranges per allowed file, so filtering costs nothing per row
+        owners = []
+        for rel, entry in self.table["files"].items():
+            if prefixes and not any(rel == p or rel.startswith(p + "/") for p in prefixes):
+                continue
+            if entry["sections"]:
+                owners.append((entry["start"], entry["start"] + len(entry["sections"]), rel))
+        owners.sort()
+
+        if approximate:
+            if not self.table["ivf"]:
+                self.train_ivf()
+            centroids, lists = self._ivf_lists()
+            probes = heapq.nlargest(nprobe, range(len(centroids)), key=lambda c: dot(q, centroids[c]))
+            candidates = sorted(i for c in probes for i in lists[c])
+        else:
+            candidates = None
+
+        # Sparse queries (hashed embedder) only touch their non-zero buckets
+        if len(nonzero) < len(q) // 2:
+            pick = itemgetter(*nonzero) if len(nonzero) > 1 else (lambda r, j=nonzero[0]: (r[j],))
+            q_values = [q[j] for j in nonzero]
+            score_row = lambda r: dot(q_values, pick(r))
+        else:
+            score_row = lambda r: dot(q, r)
+
+        scored = []
+        for start, end, rel in owners:
+            if candidates is None:
+                ids = range(start, end)
+            else:
+                ids = candidates[bisect_left(candidates, start):bisect_left(candidates, end)]
+            for i in ids:
+                score = score_row(self.row(i))
+                if score >= MIN_SCORE:
+                    scored.append((score, i, rel))
+
+        terms = set(tokenize(query))
+        for score, i, rel in heapq.nlargest(limit, scored):
+            entry = self.table["files"][rel]
+            kind, locator, line, text = entry["sections"][i - entry["start"]]
+            hit = {"file": rel, "type": kind, "score": round(score, 4)}
+            if kind == "data":
+                hit["path"] = locator
+            else:
+                hit["section"] = locator
+                hit["line"] = line
+            hit["snippet"] = snippet(text, terms)
+            result["hits"].append(hit)
+
+        return result
+
+
+def unpack_rows(packed: bytes, dim: int) -> list[list[float]]:
+    values = array("f")
+    values.frombytes(packed)
+    return [values[i:i + dim].tolist() for i in range(0, len(values), dim)]
+
+
+def nearest(centroids: list, vector) -> int:
+    best, best_score = 0, -2.0
+    for c, centroid in enumerate(centroids):
+        score = dot(centroid, vector)
+        if score > best_score:
+            best, best_score = c, score
+    return best
+
+
+def train_centroids(row, rows: int, dim: int) -> list:
+    """Spherical k-means on a sample of rows: ~sqrt(rows) unit centroids."""
+    k = max(1, int(math.sqrt(rows)))
+    rng = random.Random(rows)
+    sample = rng.sample(range(rows), min(rows, k * IVF_SAMPLE))
+    centroids = [row(i) for i in sample[:k]]
+
+    for _ in range(IVF_ITERATIONS):
+        sums = [[0.0] * dim for _ in centroids]
+        for i in sample:
+            vector = row(i)
+            target = sums[nearest(centroids, vector)]
+            for j, x in enumerate(vector):
+                if x:
+                    target[j] += x
+        centroids = [
+            normalize(total) if any(total) else centroids[c]
+            for c, total in enumerate(sums)
+        ]
+
+    return centroids
@@ -35,6 +35,7 @@ from pathlib import Path
 # Add parent directory to path for schema imports
 sys.path.insert(0, str(Path(__file__).parent))
 from schemas.life_schemas import get_default_data, SCHEMA_VERSION
+from frontmatter import serialize as serialize_frontmatter
 
 
 def has_frontmatter(content: str) -> bool:
@@ -121,12 +122,6 @@ def extract_contacts_data(content: str) -> dict:
     return data
 
 
-def serialize_frontmatter(data: dict, markdown: str) -> str:
-    """Serialize data and markdown to frontmatter format."""
-    json_str = json.dumps(data, indent=2, ensure_ascii=False)
-    return f"---json\n{json_str}\n---\n{markdown}"
-
-
 def migrate_file(file_path: Path, dry_run: bool = False) -> dict:
     """Migrate a single life file to frontmatter format."""
     result = {
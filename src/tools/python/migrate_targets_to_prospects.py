@@ -39,28 +39,11 @@ import re
 from pathlib import Path
 from datetime import datetime
 
-
-def parse_frontmatter(content: str) -> tuple[dict, str]:
-    """Parse JSON frontmatter from markdown content."""
-    pattern = r'^---json\s*\n(.*?)\n---\s*\n?(.*)$'
-    match = re.match(pattern, content, re.DOTALL)
-
-    if match:
-        try:
-            json_str = match.group(1)
-            data = json.loads(json_str)
-            markdown = match.group(2)
-            return data, markdown
-        except json.JSONDecodeError:
-            return {}, content
-
-    return {}, content
-
-
-def serialize_frontmatter(data: dict, markdown: str) -> str:
-    """Serialize data and markdown back to frontmatter format."""
-    json_str = json.dumps(data, indent=2, ensure_ascii=False)
-    return f"---json\n{json_str}\n---\n{markdown}"
+# Add parent directory to path for shared frontmatter codec imports
+sys.path.insert(0, str(Path(__file__).parent))
+from frontmatter import write as write_frontmatter
+from relationships import Collection
+from campaign_targets import TargetStore
 
 
 def get_campaign_path(campaign_name: str) -> Path:
@@ -101,22 +84,10 @@ def ensure_unique_slug(prospects_folder: Path, base_slug: str) -> str:
 
 def find_prospect_by_email(prospects_folder: Path, email: str) -> str | None:
     """Find an existing prospect by email address."""
-    if not prospects_folder.exists():
+    if "@" not in email:
         return None
-
-    email_lower = email.lower()
-
-    for file_path in prospects_folder.glob("*.md"):
-        try:
-            content = file_path.read_text(encoding="utf-8")
-            frontmatter, _ = parse_frontmatter(content)
-            prospect_email = frontmatter.get("email", "").lower()
-            if prospect_email == email_lower:
-                return file_path.stem
-        except Exception:
-            continue
-
-    return None
+    entry = Collection(prospects_folder.name, prospects_folder.parent).get(email)
+    return entry["slug"] if entry else None
 
 
 def create_prospect_file(
@@ -177,9 +148,9 @@ def create_prospect_file(
 
     markdown = "\n".join(markdown_parts)
 
-    content = serialize_frontmatter(frontmatter, markdown)
     file_path = prospects_folder / f"{slug}.md"
-    file_path.write_text(content, encoding="utf-8")
+    write_frontmatter(file_path, frontmatter, markdown)
+    Collection(prospects_folder.name, prospects_folder.parent).touch(slug)
 
     return slug
 
@@ -196,8 +167,8 @@ def migrate_campaign(campaign_name: str, dry_run: bool = False) -> dict:
     if not targets_path.exists():
         raise ValueError(f"Targets file not found at {targets_path}")
 
-    content = targets_path.read_text(encoding="utf-8")
-    data, markdown = parse_frontmatter(content)
+    store = TargetStore(campaign_path)
+    data, markdown = store.load()
 
     # Check if already migrated
     if "target_references" in data and "targets" not in data:
@@ -297,8 +268,7 @@ def migrate_campaign(campaign_name: str, dry_run: bool = False) -> dict:
             "target_references": new_references
         }
 
-        new_content = serialize_frontmatter(new_data, markdown)
-        targets_path.write_text(new_content, encoding="utf-8")
+        store.replace(new_data, markdown)
 
     return {
         "migrated": migrated,
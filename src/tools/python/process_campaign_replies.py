@@ -34,6 +34,10 @@ import re
 from pathlib import Path
 from datetime import datetime, timedelta
 
+# Add parent directory to path for shared frontmatter codec imports
+sys.path.insert(0, str(Path(__file__).parent))
+from campaign_targets import TargetStore
+
 
 def load_env_from_cwd():
     """Load .env file from current working directory."""
@@ -165,25 +169,16 @@ def get_campaign_target_emails(campaign_name: str = None) -> dict:
         if not targets_file.exists():
             continue
 
-        # Parse frontmatter
-        content = targets_file.read_text(encoding="utf-8")
-        match = re.match(r'^---json\s*\n(.*?)\n---', content, re.DOTALL)
-        if not match:
-            continue
-
-        try:
-            data = json.loads(match.group(1))
-            for target in data.get("targets", []):
-                email = target.get("email")
-                if email:
-                    target_emails[email.lower()] = {
-                        "campaign": campaign_path.name,
-                        "target_id": target.get("id"),
-                        "target_name": target.get("name"),
-                        "current_stage": target.get("stage")
-                    }
-        except json.JSONDecodeError:
-            continue
+        # Through the target store, so pending target changes are included
+        for target in TargetStore(campaign_path).records("targets"):
+            email = target.get("email")
+            if email:
+                target_emails[email.lower()] = {
+                    "campaign": campaign_path.name,
+                    "target_id": target.get("id"),
+                    "target_name": target.get("name"),
+                    "current_stage": target.get("stage")
+                }
 
     return target_emails
 
@@ -24,22 +24,10 @@ import json
 import re
 from pathlib import Path
 
-
-def parse_frontmatter(content: str) -> tuple[dict, str]:
-    """Parse JSON frontmatter from markdown content."""
-    pattern = r'^---json\s*\n(.*?)\n---\s*\n?(.*)$'
-    match = re.match(pattern, content, re.DOTALL)
-
-    if match:
-        try:
-            json_str = match.group(1)
-            data = json.loads(json_str)
-            markdown = match.group(2)
-            return data, markdown
-        except json.JSONDecodeError:
-            return {}, content
-
-    return {}, content
+# Add parent directory to path for shared frontmatter codec imports
+sys.path.insert(0, str(Path(__file__).parent))
+from frontmatter import read as read_frontmatter
+from relationships import Collection
 
 
 def parse_body_sections(markdown: str) -> dict:
@@ -82,8 +70,7 @@ def read_prospect(slug: str) -> dict | None:
     if not file_path.exists():
         return None
 
-    content = file_path.read_text(encoding="utf-8")
-    frontmatter, markdown = parse_frontmatter(content)
+    frontmatter, markdown = read_frontmatter(file_path)
     sections = parse_body_sections(markdown)
 
     return {
@@ -94,40 +81,19 @@ def read_prospect(slug: str) -> dict | None:
 
 
 def find_prospect_by_email(email: str) -> dict | None:
-    """Find a prospect by email address."""
-    prospects_folder = get_prospects_folder()
-
-    if not prospects_folder.exists():
+    """Find a prospect by email address (via the prospects manifest)."""
+    entry = Collection("prospects").get(email) if "@" in email else None
+    if not entry:
         return None
-
-    email_lower = email.lower()
-
-    for file_path in prospects_folder.glob("*.md"):
-        try:
-            content = file_path.read_text(encoding="utf-8")
-            frontmatter, _ = parse_frontmatter(content)
-            prospect_email = frontmatter.get("email", "").lower()
-            if prospect_email == email_lower:
-                slug = file_path.stem
-                return read_prospect(slug)
-        except Exception:
-            continue
-
-    return None
+    return read_prospect(entry["slug"])
 
 
 def list_prospects() -> list[dict]:
     """List all prospects."""
-    prospects_folder = get_prospects_folder()
-
-    if not prospects_folder.exists():
-        return []
-
     prospects = []
-    for file_path in prospects_folder.glob("*.md"):
+    for entry in Collection("prospects").entries():
         try:
-            slug = file_path.stem
-            prospect = read_prospect(slug)
+            prospect = read_prospect(entry["slug"])
             if prospect:
                 prospects.append(prospect)
         except Exception:
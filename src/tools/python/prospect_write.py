@@ -39,28 +39,13 @@ import re
 from pathlib import Path
 from datetime import datetime
 
-
-def parse_frontmatter(content: str) -> tuple[dict, str]:
-    """Parse JSON frontmatter from markdown content."""
-    pattern = r'^---json\s*\n(.*?)\n---\s*\n?(.*)$'
-    match = re.match(pattern, content, re.DOTALL)
-
-    if match:
-        try:
-            json_str = match.group(1)
-            data = json.loads(json_str)
-            markdown = match.group(2)
-            return data, markdown
-        except json.JSONDecodeError:
-            return {}, content
-
-    return {}, content
-
-
-def serialize_frontmatter(data: dict, markdown: str) -> str:
-    """Serialize data and markdown back to frontmatter format."""
-    json_str = json.dumps(data, indent=2, ensure_ascii=False)
-    return f"---json\n{json_str}\n---\n{markdown}"
+# Add parent directory to path for shared frontmatter codec imports
+sys.path.insert(0, str(Path(__file__).parent))
+from frontmatter import (
+    read as read_frontmatter,
+    write as write_frontmatter,
+)
+from relationships import Collection
 
 
 def parse_body_sections(markdown: str) -> dict:
@@ -194,9 +179,9 @@ def create_prospect(data: dict) -> tuple[str, dict]:
         ""
     )
 
-    content = serialize_frontmatter(frontmatter, markdown)
     file_path = prospects_folder / f"{slug}.md"
-    file_path.write_text(content, encoding="utf-8")
+    write_frontmatter(file_path, frontmatter, markdown)
+    Collection("prospects").touch(slug)
 
     return slug, {
         "slug": slug,
@@ -216,8 +201,7 @@ def update_prospect(slug: str, updates: dict) -> dict:
     if not file_path.exists():
         raise ValueError(f"Prospect '{slug}' not found")
 
-    content = file_path.read_text(encoding="utf-8")
-    frontmatter, markdown = parse_frontmatter(content)
+    frontmatter, markdown = read_frontmatter(file_path)
     sections = parse_body_sections(markdown)
 
     now = datetime.utcnow().isoformat() + "Z"
@@ -251,8 +235,8 @@ def update_prospect(slug: str, updates: dict) -> dict:
         sections["interaction_history"]
     )
 
-    content = serialize_frontmatter(frontmatter, markdown)
-    file_path.write_text(content, encoding="utf-8")
+    write_frontmatter(file_path, frontmatter, markdown)
+    Collection("prospects").touch(slug)
 
     return {
         "slug": slug,
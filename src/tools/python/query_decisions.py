@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+query_decisions.py - Search the decision audit log, including rotated segments.
+
+Segments whose summary (time span, counts by category) can't match the
+filters are skipped without being decompressed; see decision_log.py.
+
+Input JSON:
+{
+    "category": "ESCALATION",           // optional - a category or a list of them
+    "from": "2026-01-01",               // optional - date or "YYYY-MM-DD HH:MM:SS", inclusive
+    "to": "2026-03-31",                 // optional - date or "YYYY-MM-DD HH:MM:SS", inclusive
+    "query": "refund",                  // optional - case-insensitive substring of the description
+    "limit": 50                         // optional - newest first, default 50
+}
+
+Output JSON:
+{
+    "status": "success",
+    "decisions": [{"timestamp": "2026-03-02 10:14:00", "category": "ESCALATION", "description": "...", "segment": "2026-03-01T090000.log.gz"}],
+    "returned": 1,
+    "has_more": false,
+    "segments": {"scanned": 1, "skipped": 11}
+}
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Add this directory to path for the shared decision log
+sys.path.insert(0, str(Path(__file__).parent))
+from decision_log import (
+    DECISIONS_LOG,
+    SEGMENTS_DIR,
+    VALID_CATEGORIES,
+    parse_decisions,
+    read_segment,
+    segment_can_match,
+    segment_summaries,
+)
+
+
+def window_bound(value: str | None, end: bool) -> str | None:
+    """A from/to value as a comparable timestamp string (dates cover the whole day)."""
+    if not value:
+        return None
+    if len(value) == 10:
+        return f"{value} 23:59:59" if end else f"{value} 00:00:00"
+    return value.replace("T", " ")
+
+
+def query_decisions(categories: set[str] | None, start: str | None, end: str | None, query: str | None,
+                    limit: int, path: Path = DECISIONS_LOG, segments_dir: Path = SEGMENTS_DIR) -> dict:
+    needle = query.lower() if query else None
+
+    def keep(decision: dict) -> bool:
+        return (
+            (not categories or decision["category"] in categories)
+            and (not start or decision["timestamp"] >= start)
+            and (not end or decision["timestamp"] <= end)
+            and (not needle or needle in decision["description"].lower())
+        )
+
+    # Active log first, then segments newest first
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            active = parse_decisions(f)
+    except OSError:
+        active = []
+    sources = [(None, active)]
+
+    summaries = segment_summaries(segments_dir)
+    skipped = 0
+    for name in sorted(summaries, key=lambda n: summaries[n]["last"] or "", reverse=True):
+        if segment_can_match(summaries[name], categories, start, end):
+            sources.append((name, None))
+        else:
+            skipped += 1
+
+    found = []
+    scanned = 0
+    for name, decisions in sources:
+        if decisions is None:
+            decisions = read_segment(segments_dir / name)
+            scanned += 1
+        matches = [d for d in decisions if keep(d)]
+        matches.sort(key=lambda d: d["timestamp"], reverse=True)
+        found.extend({**d, "segment": name} for d in matches)
+        if len(found) > limit:
+            break
+
+    return {
+        "decisions": found[:limit],
+        "returned": min(len(found), limit),
+        "has_more": len(found) > limit,
+        "segments": {"scanned": scanned, "skipped": skipped}
+    }
+
+
+def main():
+    try:
+        raw = sys.stdin.read().strip()
+        input_data = json.loads(raw) if raw else {}
+
+        category = input_data.get("category")
+        categories = {category} if isinstance(category, str) else set(category or [])
+        unknown = categories - set(VALID_CATEGORIES)
+        if unknown:
+            raise ValueError(f"Invalid category: {', '.join(sorted(unknown))}. Must be one of: {', '.join(VALID_CATEGORIES)}")
+
+        result = query_decisions(
+            categories or None,
+            window_bound(input_data.get("from"), end=False),
+            window_bound(input_data.get("to"), end=True),
+            input_data.get("query"),
+            int(input_data.get("limit", 50)),
+        )
+
+        print(json.dumps({"status": "success", **result}))
+
+    except Exception as e:
+        error_result = {
+            "status": "error",
+            "message": str(e)
+        }
+        print(json.dumps(error_result))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -32,31 +32,32 @@ import uuid
 from pathlib import Path
 from datetime import datetime, timedelta
 
+# Add this directory to path for shared write layer imports
+sys.path.insert(0, str(Path(__file__).parent))
+import atomic_io
+
+
+PENDING_APPROVALS_FILE = Path("state") / "pending_approvals.json"
 
-def load_pending_approvals() -> dict:
-    """Load pending approvals file."""
-    state_dir = Path("state")
-    file_path = state_dir / "pending_approvals.json"
-
-    if not file_path.exists():
-        state_dir.mkdir(parents=True, exist_ok=True)
-        data = {
-            "version": 1,
-            "lastUpdated": datetime.utcnow().isoformat() + "Z",
-            "pending": [],
-            "history": []
-        }
-        save_pending_approvals(data)
-        return data
 
-    return json.loads(file_path.read_text(encoding="utf-8"))
+def new_pending_approvals() -> dict:
+    """Initial contents of the pending approvals file."""
+    return {
+        "version": 1,
+        "lastUpdated": datetime.utcnow().isoformat() + "Z",
+        "pending": [],
+        "history": []
+    }
 
 
-def save_pending_approvals(data: dict):
-    """Save pending approvals file."""
-    file_path = Path("state") / "pending_approvals.json"
-    data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
-    file_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+def update_pending_approvals(mutate):
+    """Apply mutate(data) to the pending approvals file under its lock."""
+    def stamped(data: dict):
+        result = mutate(data)
+        data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
+        return result
+
+    return atomic_io.update_json(PENDING_APPROVALS_FILE, stamped, default=new_pending_approvals)
 
 
 def main():
@@ -69,8 +70,6 @@ def main():
             if not input_data.get(field):
                 raise ValueError(f"Missing required field: {field}")
 
-        data = load_pending_approvals()
-
         now = datetime.utcnow()
         expires = now + timedelta(days=3)  # 3 day expiry
 
@@ -93,8 +92,7 @@ def main():
             "status": "pending"
         }
 
-        data["pending"].append(action)
-        save_pending_approvals(data)
+        update_pending_approvals(lambda data: data["pending"].append(action))
 
         result = {
             "status": "success",
@@ -1,19 +1,31 @@
 #!/usr/bin/env python3
 """
-recall.py - Search the tenant's life/ folder for content.
+recall.py - Search the tenant's memory (life/, identity/, knowledge/,
+relationships/) for content.
 
-This tool now uses life_read.py for structured data access while
-maintaining backwards compatibility with text search.
+This tool uses the shared life_store module (the library behind
+life_read.py) for structured data access, in-process, while
+maintaining backwards compatibility with text search. Text search
+is answered from the persistent index in life_index.py.
 
 Input JSON:
 {
     "query": "search term",
-    "category": "all|knowledge|events|relationships|identity|patterns|boundaries",
+    "category": "all|knowledge|events|relationships|identity|patterns|boundaries",  // semantic mode also: timeline
 
     // NEW: Structured data options
     "file": "contacts|business|patterns|...",  // Specific file to read
     "path": "contacts[0].name",  // Dot notation path to specific field
-    "structured": true  // Return structured data instead of text search
+    "structured": true,  // Return structured data instead of text search
+
+    // Ranked search (BM25 over fields and markdown sections, typo tolerant)
+    "ranked": true,
+    "limit": 10,  // Top-k hits to return (default 10)
+
+    // Or pick the search mode explicitly: "text" (default), "ranked", or
+    // "semantic" (offline vector similarity, also covers timeline/)
+    "mode": "semantic",
+    "approximate": false  // semantic only: probe the IVF index instead of every vector
 }
 
 Output JSON:
@@ -24,45 +36,36 @@ Output JSON:
 
     // When structured=true or file+path specified:
     "data": { ... structured JSON ... },
-    "markdown": "..."
+    "markdown": "...",
+
+    // When ranked=true, results are hits best-first:
+    //   {"file", "type": "data", "path", "score", "snippet"} or
+    //   {"file", "type": "markdown", "section", "line", "score", "snippet"}
+    "expansions": {"shwing": ["show"]},  // typo'd terms and what they matched
+
+    // When mode="semantic", results have the ranked hit shape (score is
+    // cosine similarity), plus:
+    "embedder": "hashed-tfidf-256",
+    "approximate": false
 }
 """
 
 import sys
 import json
-import subprocess
 from pathlib import Path
 
+# Add parent directory to path for shared life store imports
+sys.path.insert(0, str(Path(__file__).parent))
+import life_store
+from life_index import LifeIndex, INDEXED_ROOTS
+from life_rank import LifeRank
+from life_semantic import LifeSemantic
 
-def call_life_read(file_name: str, query: str | None = None, path: str | None = None) -> dict:
-    """Call life_read.py with the given parameters."""
-    script_path = Path(__file__).parent / "life_read.py"
-
-    input_data = {"file": file_name}
-    if query:
-        input_data["query"] = query
-    if path:
-        input_data["path"] = path
 
+def call_life_read(file_name: str, query: str | None = None, path: str | None = None, index=None) -> dict:
+    """Read a life file in-process, returning life_read.py's result shape."""
     try:
-        result = subprocess.run(
-            [sys.executable, str(script_path)],
-            input=json.dumps(input_data),
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-
-        if result.returncode == 0:
-            return json.loads(result.stdout)
-        else:
-            try:
-                return json.loads(result.stdout)
-            except:
-                return {"status": "error", "message": result.stderr or "Unknown error"}
-
-    except subprocess.TimeoutExpired:
-        return {"status": "error", "message": "life_read.py timed out"}
+        return life_store.read(file_name, query=query, path=path, index=index)
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -91,38 +94,74 @@ def get_all_life_files() -> list[str]:
     ]
 
 
-def get_search_paths(category: str) -> list[Path]:
-    """Get paths to search based on category."""
+def get_search_scope(category: str) -> list[Path]:
+    """Get the files and folders to search for a category (V2 folders plus legacy life/)."""
     life_dir = Path("life")
 
-    if not life_dir.exists():
-        return []
-
     if category == "all":
-        return list(life_dir.rglob("*.md"))
+        return [Path(root) for root in INDEXED_ROOTS]
 
     category_map = {
-        "knowledge": life_dir / "knowledge",
-        "events": life_dir / "events",
-        "relationships": life_dir / "relationships",
+        "knowledge": [life_dir / "knowledge", Path("knowledge")],
+        "events": [life_dir / "events"],
+        "relationships": [life_dir / "relationships", Path("relationships")],
+        "identity": [life_dir / "identity.md", Path("identity")],
+        "patterns": [life_dir / "patterns.md"],
+        "questions": [life_dir / "questions.md"],
+        "boundaries": [life_dir / "boundaries.md"],
     }
 
-    if category in category_map:
-        search_dir = category_map[category]
-        if search_dir.exists():
-            return list(search_dir.rglob("*.md"))
+    return category_map.get(category, [])
 
-    root_files = {
-        "patterns": life_dir / "patterns.md",
-        "questions": life_dir / "questions.md",
-        "identity": life_dir / "identity.md",
-        "boundaries": life_dir / "boundaries.md",
-    }
 
-    if category in root_files and root_files[category].exists():
-        return [root_files[category]]
+def scan_scope(scope: list[Path], query: str) -> dict[str, list[str]]:
+    """Scan files directly (used when the index is unavailable)."""
+    results = {}
+    for entry in scope:
+        files = sorted(entry.rglob("*.md")) if entry.is_dir() else [entry] if entry.exists() else []
+        for file_path in files:
+            matches = search_file(file_path, query)
+            if matches:
+                results[file_path.as_posix()] = matches
+    return results
+
+
+def text_search(category: str, query: str) -> dict[str, list[str]]:
+    """Search memory files line by line via the persistent life index."""
+    scope = get_search_scope(category)
+    if not scope:
+        return {}
+
+    try:
+        index = LifeIndex()
+        index.refresh()
+        return index.search_lines(query, scope)
+    except OSError:
+        return scan_scope(scope, query)
+
+
+def ranked_search(category: str, query: str, limit: int = 10) -> dict:
+    """Top-k sections of memory for query, scored with BM25 (see life_rank.py)."""
+    scope = get_search_scope(category)
+    if not scope:
+        return {"hits": [], "expansions": {}}
+
+    ranker = LifeRank()
+    ranker.refresh()
+    prefixes = None if category == "all" else [p.as_posix() for p in scope]
+    return ranker.search(query, limit=limit, prefixes=prefixes)
 
-    return []
+
+def semantic_search(category: str, query: str, limit: int = 10, approximate: bool = False) -> dict:
+    """Top-k sections of memory and timeline by vector similarity (see life_semantic.py)."""
+    scope = [Path("timeline")] if category == "timeline" else get_search_scope(category)
+    if not scope:
+        return {"hits": [], "embedder": None, "approximate": False}
+
+    index = LifeSemantic()
+    index.refresh()
+    prefixes = None if category == "all" else [p.as_posix() for p in scope]
+    return index.search(query, limit=limit, prefixes=prefixes, approximate=approximate)
 
 
 def main():
@@ -134,6 +173,8 @@ def main():
         file_name = input_data.get("file")
         path = input_data.get("path")
         structured = input_data.get("structured", False)
+        mode = input_data.get("mode", "ranked" if input_data.get("ranked") else "text")
+        limit = int(input_data.get("limit", 10))
 
         # Mode 1: Direct file read with optional path
         if file_name:
@@ -144,8 +185,9 @@ def main():
         # Mode 2: Structured search across files
         if structured and query:
             all_results = []
+            index = LifeIndex()
             for file in get_all_life_files():
-                result = call_life_read(file, query)
+                result = call_life_read(file, query, index=index)
                 if result.get("status") == "success":
                     search_info = result.get("search", {})
                     if search_info.get("total", 0) > 0:
@@ -164,22 +206,48 @@ def main():
             }))
             return
 
-        # Mode 3: Text search (backwards compatible)
         if not query:
             raise ValueError("Missing required field: query (or file)")
 
-        search_paths = get_search_paths(category)
+        if mode not in ("text", "ranked", "semantic"):
+            raise ValueError(f"Unknown mode: {mode} (expected text, ranked or semantic)")
+
+        # Mode 3: Ranked search, best sections first
+        if mode == "ranked":
+            ranking = ranked_search(category, query, limit)
+            print(json.dumps({
+                "status": "success",
+                "results": ranking["hits"],
+                "total_matches": len(ranking["hits"]),
+                "expansions": ranking["expansions"],
+                "ranked": True
+            }))
+            return
+
+        # Mode 4: Semantic search, most similar sections first
+        if mode == "semantic":
+            ranking = semantic_search(category, query, limit, bool(input_data.get("approximate", False)))
+            print(json.dumps({
+                "status": "success",
+                "results": ranking["hits"],
+                "total_matches": len(ranking["hits"]),
+                "embedder": ranking["embedder"],
+                "approximate": ranking["approximate"],
+                "semantic": True
+            }))
+            return
+
+        # Mode 5: Text search (backwards compatible)
+
         results = []
         total_matches = 0
 
-        for file_path in search_paths:
-            matches = search_file(file_path, query)
-            if matches:
-                results.append({
-                    "file": str(file_path),
-                    "matches": matches[:10]
-                })
-                total_matches += len(matches)
+        for file_path, matches in text_search(category, query).items():
+            results.append({
+                "file": file_path,
+                "matches": matches[:10]
+            })
+            total_matches += len(matches)
 
         result = {
             "status": "success",
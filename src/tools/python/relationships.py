@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+relationships.py - Folder-backed relationship collections with a manifest index.
+
+relationships/clients/, relationships/prospects/ and relationships/contacts/
+hold one `---json` markdown file per person (<slug>.md). Each folder keeps a
+compact index of its members in _manifest.json:
+
+{
+    "version": 1,
+    "members": {
+        "jane-doe": {
+            "slug": "jane-doe", "name": "Jane Doe", "email": "jane@example.com",
+            "phone": "555-1234", "tags": ["buyer"], "mtime": 1736..., "size": 812
+        }
+    }
+}
+
+entries(), get(), lookup() and filter() answer from the manifest without
+opening member files. The manifest is kept current incrementally:
+- touch()/put()/delete() update a single entry when a member is written
+- refresh() costs one stat() per member and re-reads only the frontmatter
+  header of files whose mtime/size changed (e.g. written by the Node
+  services), so it is safe to call before every query
+- lookup() does the same for just the slugs asked for
+
+Usage:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from relationships import Collection
+
+    prospects = Collection("prospects")
+    prospects.entries()
+    prospects.get("jane@example.com")          # slug, email or phone
+    prospects.filter(tag="buyer", query="jane")
+    prospects.load("jane-doe")                 # full frontmatter + markdown
+    prospects.touch("jane-doe")                # after writing the file yourself
+"""
+
+import sys
+import os
+import json
+from pathlib import Path
+
+# Add this directory to path for shared codec imports
+sys.path.insert(0, str(Path(__file__).parent))
+import frontmatter
+import atomic_io
+
+
+MANIFEST_NAME = "_manifest.json"
+MANIFEST_VERSION = 1
+MANIFEST_FIELDS = ["name", "email", "phone", "tags"]
+
+RELATIONSHIPS_DIR = Path("relationships")
+
+# Collection names, plus the V1 names life_store maps onto them
+COLLECTIONS = {
+    "clients": "clients",
+    "prospects": "prospects",
+    "contacts": "contacts",
+    "people": "contacts",
+    "relationships": "contacts",
+}
+
+
+def normalize_phone(phone) -> str:
+    """Digits of a phone number, for matching regardless of formatting."""
+    return "".join(c for c in str(phone or "") if c.isdigit())
+
+
+def new_manifest() -> dict:
+    return {"version": MANIFEST_VERSION, "members": {}}
+
+
+def is_collection(file_name: str) -> bool:
+    """Whether a life file name refers to a folder-backed collection."""
+    return file_name in COLLECTIONS
+
+
+class Collection:
+    """One relationships/<name>/ folder and its manifest."""
+
+    def __init__(self, name: str, root: Path = RELATIONSHIPS_DIR):
+        self.name = COLLECTIONS.get(name, name)
+        self.folder = Path(root) / self.name
+        self.manifest_path = self.folder / MANIFEST_NAME
+        self._members: dict | None = None
+
+    # -- manifest --------------------------------------------------------
+
+    def _load_manifest(self) -> dict:
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return new_manifest()
+
+    def _save(self, changed: dict, removed: list[str]) -> None:
+        """Merge changed/removed entries into the manifest on disk."""
+        def apply(manifest: dict):
+            if manifest.get("version") != MANIFEST_VERSION:
+                manifest.clear()
+                manifest.update(new_manifest())
+            manifest["members"].update(changed)
+            for slug in removed:
+                manifest["members"].pop(slug, None)
+
+        try:
+            atomic_io.update_json(self.manifest_path, apply, default=new_manifest, indent=None)
+        except ValueError:
+            # Corrupt manifest; rebuild it from what we know
+            manifest = new_manifest()
+            manifest["members"] = {**(self._members or {}), **changed}
+            for slug in removed:
+                manifest["members"].pop(slug, None)
+            atomic_io.write_json(self.manifest_path, manifest, indent=None)
+
+    def member_path(self, slug: str) -> Path:
+        return self.folder / f"{slug}.md"
+
+    def _entry(self, slug: str, stat: os.stat_result) -> dict:
+        """Build a manifest entry from a member's frontmatter header."""
+        data, _ = frontmatter.read_keys(self.member_path(slug), MANIFEST_FIELDS)
+        entry = {"slug": slug}
+        for field in MANIFEST_FIELDS:
+            entry[field] = data.get(field)
+        tags = entry["tags"]
+        entry["tags"] = tags if isinstance(tags, list) else [tags] if tags else []
+        entry["mtime"] = stat.st_mtime_ns
+        entry["size"] = stat.st_size
+        return entry
+
+    def refresh(self) -> dict:
+        """Bring the manifest up to date with the folder. Returns {slug: entry}."""
+        if not self.folder.is_dir():
+            self._members = {}
+            return self._members
+
+        members = self._load_manifest()["members"]
+        changed = {}
+        seen = set()
+
+        with os.scandir(self.folder) as entries:
+            for dir_entry in entries:
+                name = dir_entry.name
+                if not name.endswith(".md") or name.startswith(("_", ".")) or not dir_entry.is_file():
+                    continue
+                slug = name[:-3]
+                seen.add(slug)
+                stat = dir_entry.stat()
+                current = members.get(slug)
+                if current and current.get("mtime") == stat.st_mtime_ns and current.get("size") == stat.st_size:
+                    continue
+                try:
+                    changed[slug] = self._entry(slug, stat)
+                except (OSError, UnicodeDecodeError):
+                    continue
+
+        removed = [slug for slug in members if slug not in seen]
+        members.update(changed)
+        for slug in removed:
+            del members[slug]
+
+        self._members = members
+        if changed or removed:
+            self._save(changed, removed)
+        return members
+
+    @property
+    def members(self) -> dict:
+        if self._members is None:
+            self.refresh()
+        return self._members
+
+    # -- queries ---------------------------------------------------------
+
+    def entries(self) -> list[dict]:
+        """Every member's manifest entry, ordered by slug."""
+        return [dict(self.members[slug]) for slug in sorted(self.members)]
+
+    def get(self, key: str) -> dict | None:
+        """Find a member by slug, email (case-insensitive) or phone (digits only)."""
+        if not key:
+            return None
+
+        members = self.members
+        if key in members:
+            return dict(members[key])
+
+        if "@" in key:
+            key_lower = key.lower()
+            for entry in members.values():
+                if (entry.get("email") or "").lower() == key_lower:
+                    return dict(entry)
+            return None
+
+        digits = normalize_phone(key)
+        if len(digits) >= 7:
+            for entry in members.values():
+                if normalize_phone(entry.get("phone")) == digits:
+                    return dict(entry)
+
+        return None
+
+    def lookup(self, slugs: list[str]) -> dict[str, dict | None]:
+        """
+        Manifest entries for the given slugs only: {slug: entry or None}.
+        Costs one stat() per slug (re-reading the header of changed files)
+        instead of refreshing the whole collection.
+        """
+        members = self._members if self._members is not None else self._load_manifest()["members"]
+        found = {}
+        changed = {}
+        removed = []
+
+        for slug in dict.fromkeys(slugs):
+            if not slug or slug.startswith(("_", ".")) or "/" in slug:
+                continue
+            try:
+                stat = os.stat(self.member_path(slug))
+            except OSError:
+                found[slug] = None
+                if slug in members:
+                    removed.append(slug)
+                continue
+            current = members.get(slug)
+            if not (current and current.get("mtime") == stat.st_mtime_ns and current.get("size") == stat.st_size):
+                try:
+                    current = changed[slug] = self._entry(slug, stat)
+                except (OSError, UnicodeDecodeError):
+                    found[slug] = None
+                    continue
+            found[slug] = dict(current)
+
+        if changed or removed:
+            if self._members is not None:
+                self._members.update(changed)
+                for slug in removed:
+                    self._members.pop(slug, None)
+            self._save(changed, removed)
+        return found
+
+    def filter(self, query: str | None = None, tag: str | None = None, tags: list[str] | None = None, **fields) -> list[dict]:
+        """
+        Members matching every given criterion, ordered by slug.
+
+        query: case-insensitive substring of slug, name, email, phone or a tag
+        tag/tags: member has the tag(s) (case-insensitive)
+        fields: exact match on a manifest field, e.g. email="jane@example.com"
+        """
+        wanted_tags = {t.lower() for t in (tags or [])}
+        if tag:
+            wanted_tags.add(tag.lower())
+        query_lower = query.lower() if query else None
+
+        results = []
+        for slug in sorted(self.members):
+            entry = self.members[slug]
+            member_tags = {str(t).lower() for t in entry.get("tags") or []}
+
+            if wanted_tags and not wanted_tags <= member_tags:
+                continue
+
+            if query_lower:
+                haystack = [slug, entry.get("name"), entry.get("email"), entry.get("phone"), *member_tags]
+                if not any(query_lower in str(value).lower() for value in haystack if value):
+                    continue
+
+            if any(not _matches(entry.get(field), value) for field, value in fields.items()):
+                continue
+
+            results.append(dict(entry))
+
+        return results
+
+    def load(self, key: str) -> dict | None:
+        """Full member (frontmatter and markdown) by slug, email or phone."""
+        entry = self.get(key)
+        if not entry:
+            return None
+        try:
+            data, markdown = frontmatter.read(self.member_path(entry["slug"]))
+        except FileNotFoundError:
+            return None
+        return {"slug": entry["slug"], "frontmatter": data, "markdown": markdown}
+
+    # -- writes ----------------------------------------------------------
+
+    def touch(self, slug: str) -> dict | None:
+        """
+        Update one member's manifest entry after its file was written or
+        deleted: one stat and one header read, merged into the manifest
+        without refreshing the rest of the collection.
+        """
+        try:
+            entry = self._entry(slug, os.stat(self.member_path(slug)))
+        except FileNotFoundError:
+            if self._members is not None:
+                self._members.pop(slug, None)
+            self._save({}, [slug])
+            return None
+
+        if self._members is not None:
+            self._members[slug] = entry
+        self._save({slug: entry}, [])
+        return dict(entry)
+
+    def put(self, slug: str, data: dict, markdown: str = "") -> dict:
+        """Write a member file and update its manifest entry."""
+        self.folder.mkdir(parents=True, exist_ok=True)
+        frontmatter.write(self.member_path(slug), data, markdown)
+        return self.touch(slug)
+
+    def delete(self, slug: str) -> bool:
+        """Delete a member file and its manifest entry."""
+        try:
+            self.member_path(slug).unlink()
+        except FileNotFoundError:
+            return False
+        self.touch(slug)
+        return True
+
+
+def _matches(actual, expected) -> bool:
+    if isinstance(actual, str) and isinstance(expected, str):
+        return actual.lower() == expected.lower()
+    return actual == expected
@@ -2,7 +2,8 @@
 """
 remember.py - Save content to the tenant's life/ folder.
 
-This tool now uses the structured life_write.py for updates when possible,
+This tool uses the shared life_store module (the library behind
+life_write.py) for structured updates when possible,
 falling back to markdown append for unstructured content.
 
 Input JSON:
@@ -16,6 +17,8 @@ Input JSON:
         "field": "contacts",  // Array field to append to
         "data": { "name": "John", "role": "Client" }  // Structured data
     }
+    // or a list of {field, data} entries, saved in a single write:
+    "structured": [ { "field": "facts", "data": {...} }, ... ]
 }
 
 Output JSON:
@@ -28,10 +31,13 @@ Output JSON:
 
 import sys
 import json
-import subprocess
 from datetime import datetime
 from pathlib import Path
 
+# Add parent directory to path for shared life store imports
+sys.path.insert(0, str(Path(__file__).parent))
+import life_store
+
 
 def get_life_file_name(category: str, file: str | None) -> str:
     """Map category to life file name."""
@@ -55,41 +61,17 @@ def get_life_file_name(category: str, file: str | None) -> str:
 
 
 def call_life_write(file_name: str, operation: str, path: str | None, value, markdown: str | None = None) -> dict:
-    """Call life_write.py with the given parameters."""
-    script_path = Path(__file__).parent / "life_write.py"
-
-    input_data = {
-        "file": file_name,
-        "operation": operation,
-    }
+    """Apply a life_write operation in-process, returning life_write.py's result shape."""
+    try:
+        return life_store.write(file_name, operation, path, value, markdown)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
 
-    if path:
-        input_data["path"] = path
-    if value is not None:
-        input_data["value"] = value
-    if markdown:
-        input_data["markdown"] = markdown
 
+def call_life_apply(file_name: str, operations: list[dict]) -> dict:
+    """Apply a batch of life_write operations in one read-modify-write."""
     try:
-        result = subprocess.run(
-            [sys.executable, str(script_path)],
-            input=json.dumps(input_data),
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-
-        if result.returncode == 0:
-            return json.loads(result.stdout)
-        else:
-            # Parse error from stderr or stdout
-            try:
-                return json.loads(result.stdout)
-            except:
-                return {"status": "error", "message": result.stderr or "Unknown error"}
-
-    except subprocess.TimeoutExpired:
-        return {"status": "error", "message": "life_write.py timed out"}
+        return life_store.apply(file_name, operations)
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -121,24 +103,31 @@ def main():
 
         # Handle structured data (new approach)
         if structured:
-            field = structured.get("field")
-            data = structured.get("data", {})
+            entries = structured if isinstance(structured, list) else [structured]
+            operations = []
+
+            for entry in entries:
+                field = entry.get("field")
+                data = entry.get("data", {})
+
+                if not field:
+                    raise ValueError("structured.field is required when using structured data")
 
-            if not field:
-                raise ValueError("structured.field is required when using structured data")
+                # Add timestamp if not present
+                if isinstance(data, dict) and "learnedAt" not in data and "observedAt" not in data:
+                    data["learnedAt"] = datetime.utcnow().isoformat() + "Z"
 
-            # Add timestamp if not present
-            if isinstance(data, dict) and "learnedAt" not in data and "observedAt" not in data:
-                data["learnedAt"] = datetime.utcnow().isoformat() + "Z"
+                # Append to the specified array field
+                operations.append({"op": "append", "path": field, "value": data})
 
-            # Append to the specified array field
-            result = call_life_write(file_name, "append", field, data)
+            result = call_life_apply(file_name, operations)
 
             if result.get("status") == "success":
+                fields = ", ".join(dict.fromkeys(op["path"] for op in operations))
                 print(json.dumps({
                     "status": "success",
                     "file": result.get("file_path", f"life/{file_name}.md"),
-                    "message": f"Structured data saved to {field}",
+                    "message": f"Structured data saved to {fields}",
                     "structured": True
                 }))
             else:
@@ -6,6 +6,7 @@ from .life_schemas import (
     get_schema,
     get_default_data,
     validate_data,
+    validate_paths,
 )
 
 __all__ = [
@@ -15,4 +16,5 @@ __all__ = [
     "get_schema",
     "get_default_data",
     "validate_data",
+    "validate_paths",
 ]
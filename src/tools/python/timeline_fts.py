@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+timeline_fts.py - Positional full-text index and query language for timeline events.
+
+Query language (used by timeline_search's "q" field):
+    escrow inspection           both words (AND is implicit)
+    escrow OR appraisal         either word
+    escrow NOT denver           NOT (or a leading "-") excludes
+    "rate lock"                 exact phrase (consecutive words)
+    apprais*                    any word starting with "apprais"
+    (offer OR counter) denver   parentheses group
+    type:TOOL                   event type
+    from:2026-01-01 to:2026-03-31
+                                date range; these always narrow the whole
+                                query, wherever they appear
+
+NOT binds tighter than AND, and AND tighter than OR. Words match whole
+lowercase tokens of the event header and content. A word that contains
+punctuation ("***1678", "e-mail") is matched as a phrase of its tokens.
+
+Index layout (relative to the tenant folder):
+    state/.index/timeline/fts/days/YYYY-MM-DD.marshal    tier 0: one day
+    state/.index/timeline/fts/months/YYYY-MM.marshal     tier 1: a closed month
+
+A segment holds a doc table (one row per event: date, byte offset, byte
+length, time, type, header hash, in date order) and postings {term: (doc
+ids, position end offsets, positions)} as packed uint32 arrays. A query
+decodes the doc ids of its own terms only, and positions only for phrases.
+
+Day segments are built incrementally from the day's sidecar index
+(timeline_index.py): events appended since the last refresh are tokenized
+and appended to the segment. Once a month is over, its day segments are
+merged into one month segment and deleted, so a year-long query loads
+twelve month segments plus the current month's days. A month segment
+records each day file's (mtime_ns, size) and is rebuilt if one changes.
+Each segment is read, extended and written under its own lock (atomic_io),
+so concurrent refreshes don't interleave their reads and writes of it.
+"""
+
+import sys
+import os
+import re
+import marshal
+from array import array
+from itertools import repeat
+from operator import add
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add this directory to path for the shared timeline index
+sys.path.insert(0, str(Path(__file__).parent))
+import atomic_io
+from timeline_index import DayIndex, TIMELINE_DIR, TIMELINE_INDEX_DIR, OFFSET, LENGTH, TIME, TYPE, HASH
+
+
+FTS_VERSION = 1
+FTS_DIR = TIMELINE_INDEX_DIR / "fts"
+
+TOKEN_PATTERN = re.compile(r"\w+")
+QUERY_TOKEN = re.compile(r'\s*(\(|\)|"[^"]*"?|[^\s()"]+)')
+
+# Doc table fields
+DOC_DATE, DOC_OFFSET, DOC_LENGTH, DOC_TIME, DOC_TYPE, DOC_HASH = range(6)
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+# -- query parsing -------------------------------------------------------
+
+class QueryError(ValueError):
+    """The query string couldn't be parsed."""
+
+
+def parse_query(text: str) -> tuple:
+    """
+    Parse a query into (node, date_from, date_to).
+
+    Nodes are tuples: ("term", t), ("prefix", p), ("phrase", [t, ...]), ("type", T),
+    ("and", a, b), ("or", a, b), ("not", a) and ("all",).
+    """
+    tokens = [m.group(1) for m in QUERY_TOKEN.finditer(text)]
+    date_from = date_to = None
+    remaining = []
+    for token in tokens:
+        field, _, value = token.partition(":")
+        if field.lower() in ("from", "to") and value:
+            try:
+                parsed = date.fromisoformat(value)
+            except ValueError:
+                raise QueryError(f"Invalid date in {token} (expected YYYY-MM-DD)")
+            if field.lower() == "from":
+                date_from = parsed
+            else:
+                date_to = parsed
+        else:
+            remaining.append(token)
+
+    parser = _Parser(remaining)
+    node = parser.parse_or() if remaining else ("all",)
+    if parser.pos < len(remaining):
+        raise QueryError(f"Unexpected '{remaining[parser.pos]}' in query")
+    return node, date_from, date_to
+
+
+class _Parser:
+    def __init__(self, tokens: list[str]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self) -> str | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self) -> str:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse_or(self) -> tuple:
+        node = self.parse_and()
+        while self.peek() == "OR":
+            self.take()
+            node = ("or", node, self.parse_and())
+        return node
+
+    def parse_and(self) -> tuple:
+        node = self.parse_not()
+        while self.peek() not in (None, "OR", ")"):
+            if self.peek() == "AND":
+                self.take()
+            node = ("and", node, self.parse_not())
+        return node
+
+    def parse_not(self) -> tuple:
+        token = self.peek()
+        if token == "NOT":
+            self.take()
+            return ("not", self.parse_not())
+        if token and token.startswith("-") and len(token) > 1:
+            self.tokens[self.pos] = token[1:]
+            return ("not", self.parse_atom())
+        return self.parse_atom()
+
+    def parse_atom(self) -> tuple:
+        token = self.peek()
+        if token is None or token in ("OR", "AND", ")"):
+            raise QueryError(f"Expected a word, phrase or '(' but got {token or 'end of query'}")
+        self.take()
+
+        if token == "(":
+            node = self.parse_or()
+            if self.peek() != ")":
+                raise QueryError("Missing ')' in query")
+            self.take()
+            return node
+        if token.startswith('"'):
+            return words_node(token.strip('"'))
+
+        field, _, value = token.partition(":")
+        if field.lower() == "type" and value:
+            return ("type", value.upper())
+        if token.endswith("*") and len(tokenize(token)) == 1:
+            return ("prefix", tokenize(token)[0])
+        return words_node(token)
+
+
+def words_node(text: str) -> tuple:
+    terms = tokenize(text)
+    if not terms:
+        raise QueryError(f"Nothing searchable in '{text}'")
+    return ("term", terms[0]) if len(terms) == 1 else ("phrase", terms)
+
+
+# -- segments ------------------------------------------------------------
+
+def _uint32(data: bytes) -> array:
+    values = array("I")
+    values.frombytes(data)
+    return values
+
+
+def pack_postings(postings: dict[str, dict[int, list[int]]]) -> dict[str, tuple]:
+    """term -> {doc: positions} (docs ascending) to term -> (ids, ends, positions) bytes."""
+    packed = {}
+    for term, docs in postings.items():
+        ends = array("I")
+        positions = array("I")
+        for doc_positions in docs.values():
+            positions.extend(doc_positions)
+            ends.append(len(positions))
+        packed[term] = (array("I", docs).tobytes(), ends.tobytes(), positions.tobytes())
+    return packed
+
+
+def unpack_postings(packed: tuple | None) -> dict[int, array]:
+    """One term's packed postings back to {doc: positions}."""
+    if not packed:
+        return {}
+    ids, ends, positions = (_uint32(part) for part in packed)
+    docs = {}
+    start = 0
+    for doc, end in zip(ids, ends):
+        docs[doc] = positions[start:end]
+        start = end
+    return docs
+
+
+def merge_postings(parts: list[tuple[int, dict]]) -> dict[str, tuple]:
+    """Concatenate packed segments [(doc_base, postings)] without decoding positions."""
+    merged: dict[str, list[array]] = {}
+    for base, postings in parts:
+        for term, (ids, ends, positions) in postings.items():
+            target = merged.get(term)
+            if target is None:
+                target = merged[term] = [array("I"), array("I"), array("I")]
+            target[0].extend(map(add, _uint32(ids), repeat(base)))
+            target[1].extend(map(add, _uint32(ends), repeat(len(target[2]))))
+            target[2].frombytes(positions)
+    return {term: tuple(part.tobytes() for part in target) for term, target in merged.items()}
+
+
+def index_events(day: DayIndex, entries: list[list], first_doc: int, postings: dict) -> list[tuple]:
+    """Tokenize events into postings (term -> doc -> positions); returns their doc rows."""
+    docs = []
+    with open(day.path, "rb") as f:
+        for doc, entry in enumerate(entries, start=first_doc):
+            event = day.read_event(entry, f)
+            for position, term in enumerate(tokenize(f"{event['header']} {event['content']}")):
+                postings.setdefault(term, {}).setdefault(doc, []).append(position)
+            docs.append((day.date, entry[OFFSET], entry[LENGTH], entry[TIME], entry[TYPE], entry[HASH]))
+    return docs
+
+
+def doc_matches(doc: tuple, entry: list) -> bool:
+    return (doc[DOC_OFFSET], doc[DOC_LENGTH], doc[DOC_HASH]) == (entry[OFFSET], entry[LENGTH], entry[HASH])
+
+
+class Segment:
+    """A loaded segment: doc table plus lazily decoded postings."""
+
+    def __init__(self, data: dict):
+        self.docs = data["docs"]
+        self.postings = data["postings"]
+        self._ids: dict[str, array] = {}
+        self._positions: dict[str, dict] = {}
+
+    def ids(self, term: str) -> array:
+        """Docs containing term (no positions decoded)."""
+        if term not in self._ids:
+            packed = self.postings.get(term)
+            self._ids[term] = _uint32(packed[0]) if packed else array("I")
+        return self._ids[term]
+
+    def positions(self, term: str) -> dict[int, array]:
+        if term not in self._positions:
+            self._positions[term] = unpack_postings(self.postings.get(term))
+        return self._positions[term]
+
+    def evaluate(self, node: tuple, universe: set[int]) -> set[int]:
+        """Doc ids in universe matching node."""
+        kind = node[0]
+        if kind == "all":
+            return set(universe)
+        if kind == "term":
+            return universe.intersection(self.ids(node[1]))
+        if kind == "prefix":
+            found = set()
+            for term in self.postings:
+                if term.startswith(node[1]):
+                    found.update(universe.intersection(self.ids(term)))
+            return found
+        if kind == "type":
+            return {i for i in universe if self.docs[i][DOC_TYPE] == node[1]}
+        if kind == "phrase":
+            return self._phrase(node[1], universe)
+        if kind == "not":
+            return universe - self.evaluate(node[1], universe)
+        if kind == "and":
+            left = self.evaluate(node[1], universe)
+            return self.evaluate(node[2], left) if left else left
+        if kind == "or":
+            return self.evaluate(node[1], universe) | self.evaluate(node[2], universe)
+        raise QueryError(f"Unknown query node: {kind}")
+
+    def _phrase(self, terms: list[str], universe: set[int]) -> set[int]:
+        candidates = universe.intersection(*(self.ids(term) for term in terms))
+        columns = [self.positions(term) for term in terms] if candidates else []
+        found = set()
+        for doc in candidates:
+            starts = set(columns[0][doc])
+            for i, column in enumerate(columns[1:], start=1):
+                starts &= {p - i for p in column[doc]}
+                if not starts:
+                    break
+            if starts:
+                found.add(doc)
+        return found
+
+
+class TimelineFTS:
+    """Tiered positional index over timeline/ day files."""
+
+    def __init__(self, timeline_dir: Path = TIMELINE_DIR, index_dir: Path = FTS_DIR, today: date | None = None):
+        self.timeline_dir = Path(timeline_dir)
+        self.days_dir = Path(index_dir) / "days"
+        self.months_dir = Path(index_dir) / "months"
+        self.today = today or date.today()
+        self._segments: dict[str, Segment | None] = {}
+        self._matches: dict[tuple, list[int]] = {}
+
+    # -- storage ---------------------------------------------------------
+
+    @staticmethod
+    def _read(path: Path) -> dict | None:
+        try:
+            data = marshal.loads(path.read_bytes())
+            if data.get("version") == FTS_VERSION:
+                return data
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        return None
+
+    @staticmethod
+    def _write(path: Path, data: dict) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(marshal.dumps(data))
+            os.replace(tmp_path, path)
+        except OSError:
+            # Read-only tenant; the segment still serves this process
+            pass
+
+    # -- tier 0: days ----------------------------------------------------
+
+    def day_segment(self, date_str: str, write: bool = True) -> dict:
+        """The day's segment, extended with events appended since it was built."""
+        path = self.days_dir / f"{date_str}.marshal"
+        if not write:
+            return self._day_segment(date_str, path, write)
+        with atomic_io.index_locked(path):
+            return self._day_segment(date_str, path, write)
+
+    def _day_segment(self, date_str: str, path: Path, write: bool) -> dict:
+        day = DayIndex(date_str, timeline_dir=self.timeline_dir)
+        day.refresh()
+        data = self._read(path)
+
+        n = len(data["docs"]) if data else 0
+        if data and n <= len(day.entries) and (n == 0 or doc_matches(data["docs"][-1], day.entries[n - 1])):
+            if n == len(day.entries):
+                return data
+            postings = {term: unpack_postings(packed) for term, packed in data["postings"].items()}
+            docs = data["docs"] + index_events(day, day.entries[n:], n, postings)
+        else:
+            postings = {}
+            docs = index_events(day, day.entries, 0, postings) if day.entries else []
+
+        data = {"version": FTS_VERSION, "docs": docs, "postings": pack_postings(postings)}
+        if write:
+            self._write(path, data)
+        return data
+
+    # -- tier 1: months --------------------------------------------------
+
+    def _day_stats(self, month: str) -> dict:
+        stats = {}
+        for path in sorted(self.timeline_dir.glob(f"{month}-[0-3][0-9].md")):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            stats[path.stem] = [stat.st_mtime_ns, stat.st_size]
+        return stats
+
+    def month_segment(self, month: str) -> dict:
+        """A closed month's merged segment, rebuilt if any of its day files changed."""
+        path = self.months_dir / f"{month}.marshal"
+        with atomic_io.index_locked(path):
+            return self._month_segment(month, path)
+
+    def _month_segment(self, month: str, path: Path) -> dict:
+        stats = self._day_stats(month)
+        data = self._read(path)
+        if data and data["days"] == stats:
+            return data
+
+        # Merge the day segments, renumbering docs after the previous days
+        docs = []
+        parts = []
+        for date_str in stats:
+            day = self.day_segment(date_str, write=False)
+            parts.append((len(docs), day["postings"]))
+            docs.extend(day["docs"])
+
+        data = {"version": FTS_VERSION, "days": stats, "docs": docs, "postings": merge_postings(parts)}
+        self._write(path, data)
+        for date_str in stats:
+            try:
+                os.unlink(self.days_dir / f"{date_str}.marshal")
+            except OSError:
+                pass
+        return data
+
+    # -- queries ---------------------------------------------------------
+
+    def segment_key(self, day: date) -> str:
+        """Month key for days in a closed month, else the day itself."""
+        if (day.year, day.month) < (self.today.year, self.today.month):
+            return day.strftime("%Y-%m")
+        return day.isoformat()
+
+    def segment(self, key: str) -> Segment | None:
+        if key not in self._segments:
+            if len(key) == 7:
+                data = self.month_segment(key)
+            elif (self.timeline_dir / f"{key}.md").exists():
+                data = self.day_segment(key)
+            else:
+                data = None
+            self._segments[key] = Segment(data) if data and data["docs"] else None
+        return self._segments[key]
+
+    def segment_keys(self, start: date, end: date) -> list[str]:
+        keys = []
+        current = start
+        while current <= end:
+            key = self.segment_key(current)
+            if key not in keys:
+                keys.append(key)
+            current += timedelta(days=1)
+        return keys
+
+    def match(self, node: tuple, key: str, first: str | None = None, last: str | None = None) -> list[tuple]:
+        """Matching doc rows of one segment whose date is within [first, last], in doc order."""
+        segment = self.segment(key)
+        if segment is None:
+            return []
+        cache_key = (key, repr(node))
+        if cache_key not in self._matches:
+            self._matches[cache_key] = sorted(segment.evaluate(node, set(range(len(segment.docs)))))
+        docs = segment.docs
+        matched = self._matches[cache_key]
+        if (first is None or docs[0][DOC_DATE] >= first) and (last is None or docs[-1][DOC_DATE] <= last):
+            return [docs[i] for i in matched]
+        return [
+            docs[i] for i in matched
+            if (first is None or docs[i][DOC_DATE] >= first) and (last is None or docs[i][DOC_DATE] <= last)
+        ]
+
+    def count(self, node: tuple, start: date, end: date) -> int:
+        """Number of events between start and end (inclusive) matching node."""
+        first, last = start.isoformat(), end.isoformat()
+        return sum(len(self.match(node, key, first, last)) for key in self.segment_keys(start, end))
+
+    def day_matches(self, node: tuple, day: date) -> list[list]:
+        """The day's matching events as sidecar-style records, in file order."""
+        date_str = day.isoformat()
+        return [
+            [doc[DOC_OFFSET], doc[DOC_LENGTH], doc[DOC_TIME], doc[DOC_TYPE], doc[DOC_HASH]]
+            for doc in self.match(node, self.segment_key(day), date_str, date_str)
+        ]
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+timeline_index.py - Seekable sidecar index for timeline day files.
+
+The Node TimelineService appends events to timeline/YYYY-MM-DD.md as:
+
+    ### HH:MM:SS [TYPE] header
+    content...
+
+    ---
+
+Each day file gets a sidecar with one record per event:
+
+    [byte_offset, byte_length, "HH:MM:SS", "TYPE", header_crc32]
+
+so a search can filter on time and type from the sidecar and seek straight
+to the events it needs, instead of reading and regex-splitting the whole
+journal. Events are delimited by their header lines, not by "---", so
+content containing "---" stays in one event.
+
+Layout (relative to the tenant folder):
+    state/.index/timeline/YYYY-MM-DD.jsonl   one JSON record per line
+
+Day files are append-only, so the sidecar is appended to as well: a
+refresh re-reads the file from the start of the last indexed event (in
+case it was still being written) and appends records for everything after
+it. If the file shrank or the last indexed header no longer hashes the
+same, the day is re-indexed from scratch.
+
+Usage:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from timeline_index import DayIndex
+
+    day = DayIndex("2026-01-08")
+    day.refresh()
+    for entry in day.entries:
+        if entry[3] == "TOOL":
+            print(day.read_event(entry))
+"""
+
+import sys
+import os
+import re
+import json
+import zlib
+from pathlib import Path
+
+# Add this directory to path for shared atomic write imports
+sys.path.insert(0, str(Path(__file__).parent))
+import atomic_io
+
+
+TIMELINE_DIR = Path("timeline")
+TIMELINE_INDEX_DIR = Path("state") / ".index" / "timeline"
+
+EVENT_HEADER = re.compile(rb"^### (\d{2}:\d{2}:\d{2}) \[([A-Z]+)\] (.+?)\r?$", re.MULTILINE)
+
+# Record fields
+OFFSET, LENGTH, TIME, TYPE, HASH = range(5)
+
+
+def header_hash(line: bytes) -> int:
+    return zlib.crc32(line.rstrip(b"\r\n"))
+
+
+def scan_events(chunk: bytes, base: int) -> list[list]:
+    """Records for every event header in chunk (which starts at byte base)."""
+    matches = list(EVENT_HEADER.finditer(chunk))
+    records = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(chunk)
+        records.append([
+            base + match.start(),
+            end - match.start(),
+            match.group(1).decode("ascii"),
+            match.group(2).decode("ascii"),
+            header_hash(match.group(0)),
+        ])
+    return records
+
+
+def parse_event(date_str: str, block: bytes) -> dict:
+    """Turn one event's bytes into the timeline_search event shape."""
+    lines = block.decode("utf-8", errors="replace").split("\n")
+    match = EVENT_HEADER.match(lines[0].encode("utf-8"))
+
+    content_lines = [line.strip() for line in lines[1:] if line.strip()]
+    # Drop the entry separator TimelineService writes after each event
+    while content_lines and content_lines[-1] == "---":
+        content_lines.pop()
+
+    return {
+        "date": date_str,
+        "time": match.group(1).decode("ascii") if match else "",
+        "type": match.group(2).decode("ascii") if match else "",
+        "header": match.group(3).decode("utf-8", errors="replace") if match else lines[0],
+        "content": "\n".join(content_lines)
+    }
+
+
+class DayIndex:
+    """Sidecar event index for one timeline day file."""
+
+    def __init__(self, date_str: str, timeline_dir: Path = TIMELINE_DIR, index_dir: Path = TIMELINE_INDEX_DIR):
+        self.date = date_str
+        self.path = Path(timeline_dir) / f"{date_str}.md"
+        self.sidecar_path = Path(index_dir) / f"{date_str}.jsonl"
+        self.entries: list[list] = []
+        self._loaded = False
+
+    # -- storage ---------------------------------------------------------
+
+    def _load(self) -> None:
+        self._loaded = True
+        self.entries = []
+        try:
+            lines = self.sidecar_path.read_text(encoding="utf-8").splitlines()
+            self.entries = json.loads(f"[{','.join(lines)}]")
+        except OSError:
+            pass
+        except ValueError:
+            # Torn append; rebuild from the day file
+            self.entries = []
+
+    def _write(self, kept: int, records: list[list]) -> None:
+        """Keep the first `kept` sidecar lines and append records after them."""
+        lines = [json.dumps(record, separators=(",", ":")) + "\n" for record in records]
+        self.sidecar_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with atomic_io.locked(self.sidecar_path):
+            if kept == 0:
+                atomic_io.write_text(self.sidecar_path, "".join(lines))
+                return
+            with open(self.sidecar_path, "r+b") as f:
+                for _ in range(kept):
+                    f.readline()
+                f.truncate(f.tell())
+                f.write("".join(lines).encode("utf-8"))
+
+    # -- maintenance -----------------------------------------------------
+
+    def _verified(self, f, size: int) -> bool:
+        """The last indexed event is still where (and what) the sidecar says."""
+        last = self.entries[-1]
+        if size < last[OFFSET] + last[LENGTH]:
+            return False
+        f.seek(last[OFFSET])
+        return header_hash(f.readline()) == last[HASH]
+
+    def refresh(self) -> list[list]:
+        """
+        Index events appended since the last refresh.
+
+        Returns the records that were (re)indexed; a full rebuild returns
+        every record.
+        """
+        if not self._loaded:
+            self._load()
+
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            if self.entries:
+                self.entries = []
+                try:
+                    os.unlink(self.sidecar_path)
+                except OSError:
+                    pass
+            return []
+
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if self.entries and self._verified(f, size):
+                last = self.entries[-1]
+                if size == last[OFFSET] + last[LENGTH]:
+                    return []
+                kept = len(self.entries) - 1
+                start = last[OFFSET]
+            else:
+                kept, start = 0, 0
+
+            f.seek(start)
+            records = scan_events(f.read(), start)
+
+        if not records and not self.entries:
+            return []
+        self.entries = self.entries[:kept] + records
+        try:
+            self._write(kept, records)
+        except OSError:
+            # Read-only tenant; the index still serves this process
+            pass
+        return records
+
+    # -- reads -----------------------------------------------------------
+
+    def read_event(self, entry: list, f=None) -> dict:
+        """Seek to one event and parse it."""
+        if f is None:
+            with open(self.path, "rb") as f:
+                return self.read_event(entry, f)
+        f.seek(entry[OFFSET])
+        return parse_event(self.date, f.read(entry[LENGTH]))
+
+    def read_events(self, entries: list[list]) -> list[dict]:
+        """Parse several events with one open file handle."""
+        if not entries:
+            return []
+        with open(self.path, "rb") as f:
+            return [self.read_event(entry, f) for entry in entries]
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+life_mutations.py - In-place mutation engine for life file frontmatter.
+
+Applies a batch of JSON-Patch-style operations directly to a frontmatter
+document instead of deep-copying the whole document for every change:
+
+    batch = MutationBatch(data)
+    batch.apply("append", "facts", {"id": "f1", "fact": "..."})
+    batch.apply("merge", "preferences", {"responseLength": "short"})
+    batch.rollback()   # restores data exactly, if something went wrong
+
+Operations (same semantics life_write has always had):
+- set: Replace value at path (or entire data if no path)
+- merge: Deep merge value into existing data (at path, if given)
+- append: Append to array at path; dicts with an existing id are upserted
+- remove: Remove item from array at path (value is the index, {"id": ...}
+  or the item itself)
+
+Every change records the previous value in an undo journal, so rollback
+costs O(changes) rather than a snapshot of the whole document. Arrays that
+are upserted by id get an id -> index map on first use, making repeated
+upserts into large arrays (contacts, patterns, facts) O(1) each.
+"""
+
+OPERATIONS = ["set", "merge", "append", "remove"]
+
+_MISSING = object()
+
+
+class MutationBatch:
+    """A set of in-place changes to one document, with rollback."""
+
+    def __init__(self, data: dict):
+        self.data = data
+        # Paths whose subtree was written ("" = whole document), e.g.
+        # "preferences" or "work[12]"; removals add nothing to validate
+        self.touched: list[str] = []
+        self._undo: list[tuple] = []
+        self._id_maps: dict[str, tuple[list, dict]] = {}
+
+    # -- journal ---------------------------------------------------------
+
+    def _assign(self, container: dict, key, value) -> None:
+        self._undo.append(("key", container, key, container.get(key, _MISSING)))
+        container[key] = value
+
+    def rollback(self) -> None:
+        """Undo every change made through this batch, newest first."""
+        while self._undo:
+            entry = self._undo.pop()
+            kind = entry[0]
+            if kind == "key":
+                _, container, key, old = entry
+                if old is _MISSING:
+                    container.pop(key, None)
+                else:
+                    container[key] = old
+            elif kind == "append":
+                entry[1].pop()
+            elif kind == "item":
+                _, array, index, old = entry
+                array[index] = old
+            elif kind == "pop":
+                _, array, index, old = entry
+                array.insert(index, old)
+            elif kind == "replace_all":
+                _, container, old_items = entry
+                container.clear()
+                container.update(old_items)
+        self._id_maps.clear()
+        self.touched.clear()
+
+    # -- path helpers ----------------------------------------------------
+
+    def _parent(self, path: str, create: bool, replace_non_dict: bool = False) -> tuple[dict, str]:
+        """Walk to the dict holding the last key of path."""
+        keys = path.split(".")
+        current = self.data
+
+        for key in keys[:-1]:
+            child = current.get(key, _MISSING) if isinstance(current, dict) else _MISSING
+            if child is _MISSING or (replace_non_dict and not isinstance(child, dict)):
+                if not create:
+                    raise ValueError(f"Path {path} not found")
+                child = {}
+                self._assign(current, key, child)
+            if not isinstance(child, dict):
+                raise ValueError(f"Path {path} not found")
+            current = child
+
+        return current, keys[-1]
+
+    def _array(self, path: str, create: bool) -> list:
+        parent, key = self._parent(path, create=create)
+        if key not in parent:
+            if not create:
+                raise ValueError(f"Path {path} is not an array")
+            self._assign(parent, key, [])
+        array = parent[key]
+        if not isinstance(array, list):
+            raise ValueError(f"Path {path} is not an array")
+        return array
+
+    def _id_index(self, path: str, array: list) -> dict:
+        cached = self._id_maps.get(path)
+        if cached and cached[0] is array:
+            return cached[1]
+        index = {}
+        for i, item in enumerate(array):
+            if isinstance(item, dict) and "id" in item:
+                index.setdefault(item["id"], i)
+        self._id_maps[path] = (array, index)
+        return index
+
+    # -- operations ------------------------------------------------------
+
+    def apply(self, operation: str, path: str | None, value) -> None:
+        """Apply one operation in place."""
+        if operation == "set":
+            self._set(path, value)
+        elif operation == "merge":
+            self._merge(path, value)
+        elif operation == "append":
+            if not path:
+                raise ValueError("append operation requires path to array")
+            if value is None:
+                raise ValueError("append operation requires value")
+            self._append(path, value)
+        elif operation == "remove":
+            if not path:
+                raise ValueError("remove operation requires path to array")
+            if value is None:
+                raise ValueError("remove operation requires value (item or index)")
+            self._remove(path, value)
+        else:
+            raise ValueError(f"Invalid operation: {operation}. Must be set, merge, append, or remove")
+
+    def _set(self, path: str | None, value) -> None:
+        if not path:
+            if not isinstance(value, dict):
+                raise ValueError("set operation requires dict value when no path specified")
+            self._undo.append(("replace_all", self.data, dict(self.data)))
+            self.data.clear()
+            self.data.update(value)
+            self._id_maps.clear()
+            self.touched.append("")
+            return
+
+        parent, key = self._parent(path, create=True, replace_non_dict=True)
+        self._assign(parent, key, value)
+        self.touched.append(path)
+
+    def _merge_into(self, target: dict, update: dict) -> None:
+        for key, value in update.items():
+            existing = target.get(key, _MISSING)
+            if isinstance(existing, dict) and isinstance(value, dict):
+                self._merge_into(existing, value)
+            else:
+                self._assign(target, key, value)
+
+    def _merge(self, path: str | None, value) -> None:
+        if not value or not isinstance(value, dict):
+            return
+
+        if not path:
+            self._merge_into(self.data, value)
+            self.touched.extend(value.keys())
+            return
+
+        # Find the existing value at path without creating anything
+        current = self.data
+        for key in path.split("."):
+            if isinstance(current, dict) and key in current:
+                current = current[key]
+            else:
+                current = _MISSING
+                break
+
+        if isinstance(current, dict):
+            self._merge_into(current, value)
+            self.touched.append(path)
+        else:
+            self._set(path, value)
+
+    def _append(self, path: str, value) -> None:
+        array = self._array(path, create=True)
+
+        # Upsert by id if value has an id
+        if isinstance(value, dict) and "id" in value:
+            ids = self._id_index(path, array)
+            position = ids.get(value["id"])
+            if position is not None:
+                self._undo.append(("item", array, position, array[position]))
+                array[position] = value
+                self.touched.append(f"{path}[{position}]")
+                return
+            ids[value["id"]] = len(array)
+
+        self._undo.append(("append", array))
+        array.append(value)
+        self.touched.append(f"{path}[{len(array) - 1}]")
+
+    def _remove(self, path: str, value) -> None:
+        parent, key = self._parent(path, create=False)
+        array = parent.get(key)
+        if not isinstance(array, list):
+            raise ValueError(f"Path {path} is not an array")
+
+        if isinstance(value, int):
+            # Remove by index
+            if 0 <= value < len(array):
+                self._undo.append(("pop", array, value, array[value]))
+                array.pop(value)
+        elif isinstance(value, dict) and "id" in value:
+            # Remove by id match
+            self._assign(parent, key, [
+                item for item in array
+                if not (isinstance(item, dict) and item.get("id") == value["id"])
+            ])
+        else:
+            # Remove by value match
+            self._assign(parent, key, [item for item in array if item != value])
+
+        self._id_maps.pop(path, None)
+
+
+def apply_operations(data: dict, operations: list[dict]) -> MutationBatch:
+    """
+    Apply a list of {"op", "path", "value"} operations to data in place.
+
+    All-or-nothing: if any operation fails, data is rolled back and the
+    error is re-raised with the failing operation's position.
+    """
+    batch = MutationBatch(data)
+
+    for i, op in enumerate(operations):
+        if not isinstance(op, dict):
+            batch.rollback()
+            raise ValueError(f"Operation {i} must be an object")
+        try:
+            batch.apply(op.get("op") or op.get("operation"), op.get("path"), op.get("value"))
+        except ValueError as e:
+            batch.rollback()
+            if len(operations) == 1:
+                raise
+            raise ValueError(f"Operation {i} failed: {e}") from e
+
+    return batch
@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+life_store.py - In-process access to structured life files.
+
+Shared library behind life_read.py, life_write.py, recall.py, remember.py
+and the context loaders. Importing it instead of spawning a
+`python life_read.py` subprocess per file keeps a recall to a single
+interpreter startup.
+
+Usage:
+    sys.path.insert(0, str(Path(__file__).parent))
+    import life_store
+
+    life_store.read("identity")                       # same dict life_read.py prints
+    life_store.search("patterns", "morning")
+    life_store.merge("identity", {"timezone": "America/Denver"})
+    life_store.append("patterns", "work", {"pattern": "..."})
+    life_store.remove("questions", "pending", {"id": "abc123"})
+    life_store.write("identity", "set", "name", "Jane")
+    life_store.apply("patterns", [                    # one read-modify-write
+        {"op": "append", "path": "work", "value": {...}},
+        {"op": "merge", "path": "preferences", "value": {...}},
+    ])
+    life_store.read("prospects", query="jane")         # folder collections answer
+    life_store.read("prospects", path="jane-doe.email")  # from _manifest.json
+
+All functions resolve paths relative to the current working directory
+(the tenant folder) and raise ValueError on bad input, exactly like the
+CLI tools they replace.
+"""
+
+import sys
+import uuid
+from pathlib import Path
+from datetime import datetime
+
+# Add this directory to path for schema imports
+sys.path.insert(0, str(Path(__file__).parent))
+from schemas.life_schemas import get_default_data, validate_paths, SCHEMA_VERSION
+import frontmatter
+import atomic_io
+from life_mutations import OPERATIONS as WRITE_OPERATIONS, apply_operations
+from relationships import Collection, MANIFEST_FIELDS
+
+
+def get_life_file_path(file_name: str) -> Path:
+    """Get the full path to a life/identity/knowledge file."""
+    # V2 structure directories
+    identity_dir = Path("identity")
+    knowledge_dir = Path("knowledge")
+    relationships_dir = Path("relationships")
+
+    # V1 legacy directory (for backward compatibility)
+    life_dir = Path("life")
+
+    # Map short names to full paths - V2 structure first, V1 fallback
+    file_map = {
+        # V2 identity/ files
+        "profile": identity_dir / "profile.md",
+        "voice": identity_dir / "voice.md",
+        # V2 knowledge/ files
+        "services": knowledge_dir / "services.md",
+        "pricing": knowledge_dir / "pricing.md",
+        "faqs": knowledge_dir / "faqs.md",
+        "policies": knowledge_dir / "policies.md",
+        # V2 relationships/ (folder-based)
+        "clients": relationships_dir / "clients",
+        "prospects": relationships_dir / "prospects",
+        "contacts": relationships_dir / "contacts",
+
+        # V1 legacy mappings (backward compatibility)
+        "identity": identity_dir / "profile.md",  # V1 identity → V2 profile
+        "boundaries": life_dir / "boundaries.md",
+        "patterns": life_dir / "patterns.md",
+        "questions": life_dir / "questions.md",
+        "business": knowledge_dir / "services.md",  # V1 business → V2 services
+        "procedures": knowledge_dir / "policies.md",  # V1 procedures → V2 policies
+        "people": relationships_dir / "contacts",  # V1 people → V2 contacts folder
+        "relationships": relationships_dir / "contacts",
+    }
+
+    # If it's a known short name, use the mapping
+    if file_name in file_map:
+        return file_map[file_name]
+
+    # Check if it's a path starting with known directories
+    for prefix in ["identity/", "knowledge/", "relationships/", "operations/", "timeline/", "data/"]:
+        if file_name.startswith(prefix):
+            return Path(file_name)
+
+    # Legacy: treat as relative path within life/ (V1 compatibility)
+    if not file_name.startswith("life/"):
+        return life_dir / file_name
+
+    return Path(file_name)
+
+
+def get_nested_value(data: dict, path: str):
+    """Get a value from nested dict using dot notation path."""
+    if not path:
+        return data
+
+    keys = path.split(".")
+    current = data
+
+    for key in keys:
+        if isinstance(current, dict) and key in current:
+            current = current[key]
+        elif isinstance(current, list):
+            try:
+                index = int(key)
+                current = current[index]
+            except (ValueError, IndexError):
+                return None
+        else:
+            return None
+
+    return current
+
+
+def generate_id() -> str:
+    """Generate a simple unique ID."""
+    return str(uuid.uuid4())[:8]
+
+
+def search_content(data: dict, markdown: str, query: str) -> list[dict]:
+    """
+    Search for query in both structured data and markdown.
+    Returns list of matches with context.
+    """
+    results = []
+    query_lower = query.lower()
+
+    # Search in structured data
+    def search_dict(obj, path=""):
+        if isinstance(obj, dict):
+            for key, value in obj.items():
+                new_path = f"{path}.{key}" if path else key
+                search_dict(value, new_path)
+        elif isinstance(obj, list):
+            for i, item in enumerate(obj):
+                new_path = f"{path}[{i}]"
+                search_dict(item, new_path)
+        elif isinstance(obj, str) and query_lower in obj.lower():
+            results.append({
+                "type": "data",
+                "path": path,
+                "value": obj,
+                "match": query
+            })
+
+    search_dict(data)
+
+    # Search in markdown
+    lines = markdown.split("\n")
+    for i, line in enumerate(lines):
+        if query_lower in line.lower():
+            results.append({
+                "type": "markdown",
+                "line": i + 1,
+                "content": line.strip(),
+                "match": query
+            })
+
+    return results
+
+
+def search_indexed(file_path: Path, data: dict, markdown: str, query: str, index=None) -> list[dict]:
+    """
+    search_content backed by the persistent life index (see life_index.py).
+
+    Falls back to a direct scan if the index can't be read or written.
+    """
+    try:
+        if index is None:
+            from life_index import LifeIndex
+            index = LifeIndex()
+        index.refresh_file(file_path)
+        return index.search_document(file_path, data, markdown, query)
+    except OSError:
+        return search_content(data, markdown, query)
+
+
+def load(file_name: str) -> tuple[Path, dict, str, bool]:
+    """
+    Load a life file.
+
+    Returns (file_path, data, markdown, exists). Missing files and files
+    without frontmatter yield the default data for their schema.
+    """
+    file_path = get_life_file_path(file_name)
+
+    if not file_path.exists():
+        return file_path, get_default_data(file_name), "", False
+
+    data, markdown = frontmatter.read(file_path)
+
+    # If no structured data found, use defaults
+    if not data:
+        data = get_default_data(file_name)
+
+    return file_path, data, markdown, True
+
+
+def project(file_name: str, paths: list[str]) -> tuple[Path, dict]:
+    """
+    Get the values at several dot paths of an existing life file.
+
+    Only the frontmatter header is read, and on a cache hit only the
+    top-level keys the paths start with are decoded. Returns
+    (file_path, {path: value}); missing paths map to None.
+    """
+    file_path = get_life_file_path(file_name)
+    data, has_data = frontmatter.read_keys(file_path, {p.split(".")[0] for p in paths})
+
+    # If no structured data found, use defaults
+    if not has_data:
+        data = get_default_data(file_name)
+
+    return file_path, {p: get_nested_value(data, p) for p in paths}
+
+
+def collection_value(collection: Collection, path: str):
+    """
+    Get "<member>[.<field path>]" from a collection.
+
+    The member may be named by slug, email or phone. Manifest fields are
+    answered from the manifest; anything else reads the member's header.
+    """
+    # Longest member key first, so emails with dots still resolve
+    cuts = [i for i, c in enumerate(path) if c == "."]
+    for cut in [len(path)] + cuts[::-1]:
+        entry = collection.get(path[:cut])
+        if entry:
+            break
+    else:
+        return None
+
+    field = path[cut + 1:]
+    if not field:
+        return entry
+    if field in MANIFEST_FIELDS:
+        return entry[field]
+
+    data, _ = frontmatter.read_keys(collection.member_path(entry["slug"]), {field.split(".")[0]})
+    return get_nested_value(data, field)
+
+
+def collection_matches(members: list[dict], query: str) -> list[dict]:
+    """search_content-style matches for manifest entries containing query."""
+    matches = []
+    query_lower = query.lower()
+
+    for entry in members:
+        slug = entry["slug"]
+        fields = [(f"{slug}.{field}", entry.get(field)) for field in MANIFEST_FIELDS if field != "tags"]
+        fields += [(f"{slug}.tags[{i}]", tag) for i, tag in enumerate(entry.get("tags") or [])]
+
+        found = [
+            {"type": "data", "path": field_path, "value": value, "match": query}
+            for field_path, value in fields
+            if isinstance(value, str) and query_lower in value.lower()
+        ]
+        matches += found or [{"type": "data", "path": slug, "value": slug, "match": query}]
+
+    return matches
+
+
+def read_collection(file_path: Path, query: str | None = None, path: str | list[str] | None = None) -> dict:
+    """read() for a folder-backed relationships collection (see relationships.py)."""
+    collection = Collection(file_path.name, file_path.parent)
+
+    if path:
+        paths = path if isinstance(path, list) else [path]
+        values = {p: collection_value(collection, p) for p in paths}
+        result = {"status": "success", "data": values if isinstance(path, list) else values[path]}
+        result["paths" if isinstance(path, list) else "path"] = path
+        result.update({"file_path": str(file_path), "exists": True})
+        return result
+
+    result = {
+        "status": "success",
+        "data": {"members": collection.entries()},
+        "markdown": "",
+        "file_path": str(file_path),
+        "exists": True,
+        "collection": collection.name
+    }
+
+    if query:
+        matches = collection_matches(collection.filter(query=query), query)
+        result["search"] = {
+            "query": query,
+            "matches": matches,
+            "total": len(matches)
+        }
+
+    return result
+
+
+def read(file_name: str, query: str | None = None, path: str | list[str] | None = None, index=None) -> dict:
+    """
+    Read a life file, optionally projecting path(s) or searching for a query.
+
+    path may be a single dot path (result data is its value) or a list of
+    paths (result data is {path: value}).
+
+    Pass a shared LifeIndex as index when searching many files in one call.
+    Returns the same result dict that life_read.py prints.
+    """
+    if not file_name:
+        raise ValueError("Missing required field: file")
+
+    # Folder collections (clients, prospects, contacts) are read via their manifest
+    collection_path = get_life_file_path(file_name)
+    if collection_path.is_dir():
+        return read_collection(collection_path, query, path)
+
+    # Handle path query (get specific fields) without touching the body
+    if path and get_life_file_path(file_name).is_file():
+        if isinstance(path, list):
+            file_path, values = project(file_name, path)
+            return {
+                "status": "success",
+                "data": values,
+                "paths": path,
+                "file_path": str(file_path),
+                "exists": True
+            }
+
+        file_path, values = project(file_name, [path])
+        return {
+            "status": "success",
+            "data": values[path],
+            "path": path,
+            "file_path": str(file_path),
+            "exists": True
+        }
+
+    file_path, data, markdown, exists = load(file_name)
+
+    if not exists:
+        return {
+            "status": "success",
+            "data": data,
+            "markdown": "",
+            "file_path": str(file_path),
+            "exists": False
+        }
+
+    result = {
+        "status": "success",
+        "data": data,
+        "markdown": markdown,
+        "file_path": str(file_path),
+        "exists": True
+    }
+
+    # Handle search query
+    if query:
+        matches = search_indexed(file_path, data, markdown, query, index)
+        result["search"] = {
+            "query": query,
+            "matches": matches,
+            "total": len(matches)
+        }
+
+    return result
+
+
+def search(file_name: str, query: str, index=None) -> dict:
+    """Search a single life file. Shorthand for read(file_name, query=query)."""
+    return read(file_name, query=query, index=index)
+
+
+def prepare_operation(data: dict, operation: str, path: str | None, value) -> None:
+    """Fill in what life_write adds to a value before applying it."""
+    if operation == "set" and not path and isinstance(value, dict):
+        # Preserve version
+        value["version"] = data.get("version", SCHEMA_VERSION)
+
+    if operation == "append" and isinstance(value, dict) and "id" not in value:
+        # Auto-generate ID if value is dict without id
+        value["id"] = generate_id()
+
+
+def normalize_operations(operations: list) -> list[dict]:
+    """Validate a batch of {"op", "path", "value"} operations."""
+    if not isinstance(operations, list) or not operations:
+        raise ValueError("operations must be a non-empty list")
+
+    normalized = []
+    for i, op in enumerate(operations):
+        if not isinstance(op, dict):
+            raise ValueError(f"Operation {i} must be an object")
+        name = op.get("op") or op.get("operation", "merge")
+        if name not in WRITE_OPERATIONS:
+            raise ValueError(f"Operation {i}: invalid operation: {name}. Must be set, merge, append, or remove")
+        normalized.append({"op": name, "path": op.get("path"), "value": op.get("value")})
+
+    return normalized
+
+
+def apply(file_name: str, operations: list, markdown: str | None = None) -> dict:
+    """
+    Apply a batch of operations to a life file in one read-modify-write.
+
+    Operations are applied in place, in order (see life_mutations.py). If
+    any of them fails, nothing is written and the error is raised. The
+    whole read-modify-write runs under the file's lock (see atomic_io.py),
+    so concurrent writers never lose each other's changes.
+    """
+    if not file_name:
+        raise ValueError("Missing required field: file")
+
+    operations = normalize_operations(operations)
+
+    file_path = get_life_file_path(file_name)
+
+    # Ensure parent directory exists
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def attempt(expected):
+        _, data, existing_markdown, _ = load(file_name)
+
+        for op in operations:
+            prepare_operation(data, op["op"], op["path"], op["value"])
+        batch = apply_operations(data, operations)
+
+        # Update lastUpdated timestamp
+        data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
+
+        # Append markdown if provided
+        if markdown:
+            if existing_markdown and not existing_markdown.endswith("\n"):
+                existing_markdown += "\n"
+            existing_markdown += f"\n{markdown}\n"
+
+        # Validate only what this batch wrote; be permissive and report
+        # problems as warnings instead of failing the write
+        is_valid, errors = validate_paths(file_name, data, batch.touched)
+
+        # Write back to file, unless another process changed it meanwhile
+        frontmatter.write(file_path, data, existing_markdown, expected=expected)
+        return data, errors
+
+    data, errors = atomic_io.transaction(file_path, attempt)
+
+    # Keep the collection manifest current when a relationships member changes
+    if file_path.parent.parent.name == "relationships":
+        Collection(file_path.parent.name, file_path.parent.parent).touch(file_path.stem)
+
+    result = {
+        "status": "success",
+        "file_path": str(file_path),
+        "message": f"Updated {file_name} successfully",
+        "operations": len(operations),
+        "data": data
+    }
+    if errors:
+        result["warnings"] = errors
+    return result
+
+
+def write(
+    file_name: str,
+    operation: str = "merge",
+    path: str | None = None,
+    value=None,
+    markdown: str | None = None
+) -> dict:
+    """
+    Apply a single write operation to a life file and save it.
+
+    Returns the same result dict that life_write.py prints.
+    """
+    if not file_name:
+        raise ValueError("Missing required field: file")
+
+    if operation not in WRITE_OPERATIONS:
+        raise ValueError(f"Invalid operation: {operation}. Must be set, merge, append, or remove")
+
+    result = apply(file_name, [{"op": operation, "path": path, "value": value}], markdown)
+    del result["operations"]
+    result["operation"] = operation
+    return result
+
+
+def merge(file_name: str, value: dict, path: str | None = None, markdown: str | None = None) -> dict:
+    """Deep merge value into a life file (at path, if given)."""
+    return write(file_name, "merge", path, value, markdown)
+
+
+def append(file_name: str, path: str, value, markdown: str | None = None) -> dict:
+    """Append value to the array at path, upserting dicts by id."""
+    return write(file_name, "append", path, value, markdown)
+
+
+def remove(file_name: str, path: str, value) -> dict:
+    """Remove an item (by index, id or value) from the array at path."""
+    return write(file_name, "remove", path, value)
@@ -9,6 +9,8 @@ Each life file uses JSON frontmatter format:
 # Markdown content below...
 """
 
+import copy
+
 # Schema version - increment when making breaking changes
 SCHEMA_VERSION = 1
 
@@ -502,31 +504,63 @@ def get_schema(file_name: str) -> dict | None:
 def get_default_data(file_name: str) -> dict:
     """Get default empty data structure for a life file."""
     base_name = file_name.split("/")[-1].replace(".md", "")
-    return DEFAULT_DATA.get(base_name, {"version": SCHEMA_VERSION}).copy()
+    # Deep copy: callers mutate the result in place (see life_mutations.py)
+    return copy.deepcopy(DEFAULT_DATA.get(base_name, {"version": SCHEMA_VERSION}))
 
 
-def validate_data(file_name: str, data: dict) -> tuple[bool, list[str]]:
+_validators = None
+
+
+def get_validator(file_name: str) -> dict | None:
     """
-    Validate data against schema.
-    Returns (is_valid, list of error messages).
+    Compiled validator index for a life file's schema (see validators.py).
 
-    Note: This is a simple validation without jsonschema dependency.
-    For production, consider using jsonschema library.
+    Validators are loaded on first use, not at import time.
     """
-    errors = []
-    schema = get_schema(file_name)
+    global _validators
 
+    schema = get_schema(file_name)
     if not schema:
+        return None
+
+    if _validators is None:
+        from .validators import load
+
+        schemas = {
+            name: value for name, value in globals().items()
+            if name.endswith("_SCHEMA") and any(value is s for s in SCHEMA_MAP.values())
+        }
+        _validators = {id(schemas[name]): index for name, index in load(schemas).items()}
+
+    return _validators.get(id(schema))
+
+
+def validate_data(file_name: str, data: dict) -> tuple[bool, list[str]]:
+    """
+    Validate data against schema.
+    Returns (is_valid, list of path-qualified error messages).
+    """
+    from .validators import validate
+
+    index = get_validator(file_name)
+    if not index:
         return True, []  # No schema = accept anything
 
-    # Check required fields
-    required = schema.get("required", [])
-    for field in required:
-        if field not in data:
-            errors.append(f"Missing required field: {field}")
+    errors = validate(index, data)
+    return len(errors) == 0, errors
+
+
+def validate_paths(file_name: str, data: dict, paths: list[str]) -> tuple[bool, list[str]]:
+    """
+    Validate only the subtrees at paths (as recorded by a MutationBatch).
+
+    An empty path means the whole document. Returns (is_valid, errors).
+    """
+    from .validators import validate_paths as validate_subtrees
 
-    # Check version
-    if "version" in data and not isinstance(data["version"], int):
-        errors.append("version must be an integer")
+    index = get_validator(file_name)
+    if not index:
+        return True, []
 
+    errors = validate_subtrees(index, data, paths)
     return len(errors) == 0, errors
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+validators.py - Compiled validators for the life file schemas.
+
+Each schema in life_schemas.py is compiled into plain Python functions, one
+per schema node, so validating a document is a run of isinstance() checks
+instead of a walk over the schema dicts. Scalar fields are checked inline
+by their parent; objects and arrays get their own function.
+
+The generated code object is marshalled to
+__pycache__/life_validators.<digest>.marshal next to this file, so only the
+first process after a schema change pays for code generation. The digest
+covers the schemas, this compiler's version and the interpreter's bytecode
+magic number, so a stale artifact is never loaded.
+
+Supported keywords: type, properties, required, items, enum, minimum and
+maximum. "format" is an annotation only, as in JSON Schema by default.
+
+Errors are path-qualified ("work[3].confidence must be one of: ...") and
+every error in the document is reported in one pass.
+"""
+
+import os
+import re
+import json
+import hashlib
+import marshal
+import importlib.util
+from pathlib import Path
+
+
+COMPILER_VERSION = 1
+CACHE_DIR = Path(__file__).parent / "__pycache__"
+
+TYPE_CHECKS = {
+    "object": ("isinstance({v}, dict)", "an object"),
+    "array": ("isinstance({v}, list)", "an array"),
+    "string": ("isinstance({v}, str)", "a string"),
+    "integer": ("(isinstance({v}, int) and not isinstance({v}, bool))", "an integer"),
+    "number": ("(isinstance({v}, (int, float)) and not isinstance({v}, bool))", "a number"),
+    "boolean": ("isinstance({v}, bool)", "a boolean"),
+}
+
+PRELUDE = '''
+_MISSING = object()
+
+def _join(path, key):
+    return f"{path}.{key}" if path else key
+
+def _label(path):
+    return path or "data"
+'''
+
+
+def is_container(schema: dict) -> bool:
+    return schema.get("type") in ("object", "array") or "properties" in schema or "items" in schema
+
+
+class Compiler:
+    """Generates Python source for a set of named schemas."""
+
+    def __init__(self):
+        self.lines: list[str] = [PRELUDE]
+        self.functions: dict[int, str] = {}
+        self.index: dict[str, dict] = {}
+
+    def scalar_checks(self, schema: dict, var: str, label: str) -> list[str]:
+        """
+        Inline checks for a scalar value held in var.
+
+        label is a Python expression for the value's path. Returns an
+        if/elif chain so each value reports at most one error.
+        """
+        checks = []
+        kind = schema.get("type")
+
+        if kind in TYPE_CHECKS:
+            test, description = TYPE_CHECKS[kind]
+            checks.append((f"not {test.format(v=var)}", f" must be {description}"))
+
+        if "enum" in schema:
+            allowed = ", ".join(str(v) for v in schema["enum"])
+            checks.append((f"{var} not in {tuple(schema['enum'])!r}", f" must be one of: {allowed}"))
+
+        if kind in ("integer", "number"):
+            if "minimum" in schema:
+                checks.append((f"{var} < {schema['minimum']!r}", f" must be >= {schema['minimum']}"))
+            if "maximum" in schema:
+                checks.append((f"{var} > {schema['maximum']!r}", f" must be <= {schema['maximum']}"))
+
+        lines = []
+        for i, (test, message) in enumerate(checks):
+            keyword = "if" if i == 0 else "elif"
+            lines.append(f"{keyword} {test}:")
+            lines.append(f"    errors.append({label} + {message!r})")
+        return lines
+
+    def node(self, schema: dict) -> str:
+        """Emit a validator function for schema, returning its name."""
+        key = id(schema)
+        if key in self.functions:
+            return self.functions[key]
+
+        name = f"_v{len(self.functions)}"
+        self.functions[key] = name
+        body: list[str] = []
+
+        if not is_container(schema):
+            body += self.scalar_checks(schema, "value", "_label(path)")
+        else:
+            kind = "object" if schema.get("type") == "object" or "properties" in schema else "array"
+            test, description = TYPE_CHECKS[kind]
+            body.append(f"if not {test.format(v='value')}:")
+            body.append(f"    errors.append(_label(path) + {' must be ' + description!r})")
+            body.append("    return")
+            body += self.object_body(schema) if kind == "object" else self.array_body(schema)
+
+        self.lines.append(f"def {name}(value, path, errors):")
+        self.lines += ["    " + line for line in body] or ["    pass"]
+        self.lines.append("")
+        return name
+
+    def object_body(self, schema: dict) -> list[str]:
+        body = []
+        for field in schema.get("required", []):
+            body.append(f"if {field!r} not in value:")
+            body.append(f"    errors.append('Missing required field: ' + _join(path, {field!r}))")
+
+        for field, child in schema.get("properties", {}).items():
+            if is_container(child):
+                child_name = self.node(child)
+                body.append(f"x = value.get({field!r}, _MISSING)")
+                body.append("if x is not _MISSING:")
+                body.append(f"    {child_name}(x, _join(path, {field!r}), errors)")
+                continue
+
+            checks = self.scalar_checks(child, "x", f"_join(path, {field!r})")
+            if checks:
+                body.append(f"x = value.get({field!r}, _MISSING)")
+                body.append("if x is not _MISSING:")
+                body += ["    " + line for line in checks]
+        return body
+
+    def array_body(self, schema: dict) -> list[str]:
+        items = schema.get("items")
+        if not items:
+            return []
+
+        if is_container(items):
+            child_name = self.node(items)
+            return [
+                "for i, x in enumerate(value):",
+                f"    {child_name}(x, f'{{path}}[{{i}}]', errors)",
+            ]
+
+        checks = self.scalar_checks(items, "x", "f'{path}[{i}]'")
+        if not checks:
+            return []
+        return ["for i, x in enumerate(value):"] + ["    " + line for line in checks]
+
+    def register(self, schema_name: str, schema: dict) -> None:
+        """Compile a top-level schema and index every node by its path pattern."""
+        index = {}
+
+        def walk(node: dict, pattern: str):
+            index[pattern] = [
+                self.node(node),
+                node.get("type"),
+                sorted(node.get("properties", {})),
+                list(node.get("required", [])),
+            ]
+            for field, child in node.get("properties", {}).items():
+                walk(child, f"{pattern}.{field}" if pattern else field)
+            if isinstance(node.get("items"), dict):
+                walk(node["items"], f"{pattern}[]")
+
+        walk(schema, "")
+        self.index[schema_name] = index
+
+    def source(self) -> str:
+        return "\n".join(self.lines) + f"\nINDEX = {self.index!r}\n"
+
+
+def generate(schemas: dict[str, dict]) -> str:
+    """Python source defining validators and INDEX for the given schemas."""
+    compiler = Compiler()
+    for name, schema in schemas.items():
+        compiler.register(name, schema)
+    return compiler.source()
+
+
+def _digest(schemas: dict[str, dict]) -> str:
+    payload = json.dumps(
+        [COMPILER_VERSION, importlib.util.MAGIC_NUMBER.hex(), schemas],
+        sort_keys=True
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def load(schemas: dict[str, dict]) -> dict[str, dict]:
+    """
+    Load (or compile and cache) validators for the given schemas.
+
+    Returns {schema_name: {pattern: (function, type, properties, required)}}.
+    """
+    artifact = CACHE_DIR / f"life_validators.{_digest(schemas)}.marshal"
+
+    try:
+        code = marshal.loads(artifact.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        code = compile(generate(schemas), str(artifact), "exec")
+        try:
+            CACHE_DIR.mkdir(exist_ok=True)
+            tmp_path = artifact.with_name(f"{artifact.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(marshal.dumps(code))
+            os.replace(tmp_path, artifact)
+        except OSError:
+            # Read-only install; validators still work, just rebuilt per process
+            pass
+
+    namespace: dict = {}
+    exec(code, namespace)
+
+    return {
+        schema_name: {
+            pattern: (namespace[fn], kind, frozenset(props), tuple(required))
+            for pattern, (fn, kind, props, required) in index.items()
+        }
+        for schema_name, index in namespace["INDEX"].items()
+    }
+
+
+def parse_path(path: str) -> list:
+    """Split "work[3].examples" into ["work", 3, "examples"]."""
+    keys = []
+    for part in path.split("."):
+        name, _, rest = part.partition("[")
+        if name:
+            keys.append(name)
+        if rest:
+            keys += [int(i) for i in re.findall(r"\d+", "[" + rest)]
+    return keys
+
+
+def validate(index: dict, data) -> list[str]:
+    """Validate a whole document against a compiled schema index."""
+    errors: list[str] = []
+    index[""][0](data, "", errors)
+    return errors
+
+
+def validate_paths(index: dict, data: dict, paths: list[str]) -> list[str]:
+    """
+    Validate only the subtrees at the given paths (plus root required fields).
+
+    Each path is checked against the deepest schema node covering it. A path
+    into a key the schema doesn't declare is accepted, as undeclared
+    properties always are.
+    """
+    errors: list[str] = []
+
+    for field in index[""][3]:
+        if field not in data:
+            errors.append(f"Missing required field: {field}")
+
+    checked = set()
+    for path in paths:
+        if path in checked:
+            continue
+        checked.add(path)
+
+        if not path:
+            return validate(index, data)
+
+        keys = parse_path(path)
+        value = data
+        pattern = ""
+        label = ""
+        entry = index[""]
+
+        for key in keys:
+            child_pattern = f"{pattern}[]" if isinstance(key, int) else (f"{pattern}.{key}" if pattern else key)
+            child_entry = index.get(child_pattern)
+            if child_entry is None:
+                break
+            try:
+                value = value[key]
+            except (KeyError, IndexError, TypeError):
+                value = None
+                break
+            pattern, entry = child_pattern, child_entry
+            label = f"{label}[{key}]" if isinstance(key, int) else (f"{label}.{key}" if label else key)
+        else:
+            entry[0](value, label, errors)
+            continue
+
+        if value is None:
+            continue
+
+        # Path leaves the schema at an undeclared key: only the node's own
+        # type can have been affected (set replaces non-dicts on the way)
+        if pattern and entry[1] == "object" and not isinstance(value, dict):
+            errors.append(f"{label} must be an object")
+        elif pattern and entry[1] == "array" and not isinstance(value, list):
+            errors.append(f"{label} must be an array")
+
+    return errors
@@ -21,6 +21,10 @@ import sys
 import json
 from datetime import datetime
 
+# Shared write layer (atomic_io) lives in the tenant's shared_tools folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared_tools'))
+import atomic_io
+
 def get_buyers_file_path():
     """Get path to buyers.json file."""
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -41,8 +45,7 @@ def load_buyers():
 def save_buyers(data):
     """Save buyers to file."""
     file_path = get_buyers_file_path()
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    atomic_io.write_json(file_path, data)
 
 def main():
     input_data = json.loads(sys.stdin.read()) if not sys.stdin.isatty() else {}
@@ -158,4 +161,6 @@ def main():
     sys.exit(1)
 
 if __name__ == '__main__':
-    main()
+    # Hold the lock for the whole load-modify-save so parallel runs can't lose updates
+    with atomic_io.locked(get_buyers_file_path()):
+        main()
@@ -23,6 +23,10 @@ import json
 from datetime import datetime
 import uuid
 
+# Shared write layer (atomic_io) lives in the tenant's shared_tools folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared_tools'))
+import atomic_io
+
 def get_deals_file_path():
     """Get path to deals.json file."""
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -48,12 +52,19 @@ def load_deals():
 
     return {"deals": []}
 
-def save_deals(data):
-    """Save deals to file."""
+def save_deals(data, expected=atomic_io.UNCHECKED):
+    """Save deals to file (atomically; see atomic_io.write_text for expected)."""
     file_path = get_deals_file_path()
+    atomic_io.write_json(file_path, data, expected=expected)
+
+def add_deal(deal):
+    """Append a deal under the deals file lock, so parallel saves can't drop one."""
+    def attempt(expected):
+        data = load_deals()
+        data["deals"].append(deal)
+        save_deals(data, expected)
 
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    atomic_io.transaction(get_deals_file_path(), attempt)
 
 def main():
     input_data = json.loads(sys.stdin.read()) if not sys.stdin.isatty() else {}
@@ -97,9 +108,7 @@ def main():
     }
 
     # Load existing deals and add new one
-    data = load_deals()
-    data["deals"].append(deal)
-    save_deals(data)
+    add_deal(deal)
 
     result = {
         "success": True,
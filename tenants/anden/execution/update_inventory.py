@@ -21,6 +21,10 @@ import sys
 import json
 from datetime import datetime
 
+# Shared write layer (atomic_io) lives in the tenant's shared_tools folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared_tools'))
+import atomic_io
+
 VALID_STATUSES = ['found', 'approved', 'rejected', 'purchased', 'listed', 'sold', 'expired']
 
 def get_deals_file_path():
@@ -49,8 +53,7 @@ def load_deals():
 def save_deals(data):
     """Save deals to file."""
     file_path = get_deals_file_path()
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    atomic_io.write_json(file_path, data)
 
 def load_listings():
     """Load listings from file."""
@@ -66,8 +69,7 @@ def load_listings():
 def save_listings(data):
     """Save listings to file."""
     file_path = get_listings_file_path()
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    atomic_io.write_json(file_path, data)
 
 def calculate_profit(deal, sold_price):
     """Calculate actual profit from sale."""
@@ -195,4 +197,6 @@ def main():
     }, indent=2))
 
 if __name__ == '__main__':
-    main()
+    # Hold the lock for the whole load-modify-save so parallel runs can't lose updates
+    with atomic_io.locked(get_deals_file_path()):
+        main()
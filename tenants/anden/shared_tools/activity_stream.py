@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+activity_stream.py - One newest-first history across every activity log.
+
+"What happened with X this week" spans four logs with four formats:
+
+    timeline     timeline/YYYY-MM-DD.md        (via the timeline_index sidecars)
+    events       life/events/YYYY-MM.jsonl     (via life_events)
+    decisions    history/decisions.log + rotated segments (via decision_log)
+    campaigns    operations/campaigns/*/log.jsonl (via campaign_log) and
+                 the "### HH:MM:SS [TYPE]" entries of log.md
+
+Each source is a generator yielding (timestamp, activity) newest first,
+one day / month / segment / campaign log at a time and only within the
+requested window, and heapq.merge interleaves them lazily. Memory stays
+bounded by the largest single chunk, and reading stops as soon as `limit`
+activities have been produced.
+
+Entity filters narrow every source in the same pass:
+- prospect: a prospect slug, email or phone; matches its slug, name,
+  email, phone and the masked "***1234" form the timeline uses
+- email:    an address, matched as text
+- campaign: a campaign name; its own log always matches, other sources
+  match on the campaign name or folder
+- query:    free text
+Text matches are case-insensitive substrings; all given filters must match.
+
+Input JSON:
+{
+    "from": "2026-03-01",            // optional - inclusive (default: 7 days before "to")
+    "to": "2026-03-07",              // optional - inclusive (default: today)
+    "sources": ["timeline", "events", "decisions", "campaigns"],   // optional
+    "prospect": "jane-doe",          // optional
+    "email": "jane@example.com",     // optional
+    "campaign": "q1-outreach",       // optional
+    "query": "escrow",               // optional
+    "limit": 50                      // optional, default 50
+}
+
+Output JSON:
+{
+    "status": "success",
+    "activities": [
+        {"timestamp": "2026-03-06 14:02:11", "source": "timeline", "kind": "MESSAGE", "text": "..."},
+        {"timestamp": "2026-03-06 09:00:00", "source": "campaigns", "kind": "touch", "text": "...", "campaign": "q1-outreach"}
+    ],
+    "returned": 2,
+    "has_more": false
+}
+"""
+
+import sys
+import re
+import json
+import heapq
+from datetime import date, datetime, timedelta
+from itertools import islice
+from pathlib import Path
+
+# Add this directory to path for the shared log readers
+sys.path.insert(0, str(Path(__file__).parent))
+from frontmatter import read as read_frontmatter
+from relationships import Collection, normalize_phone
+from timeline_index import DayIndex, TIME
+from life_events import MonthLog, list_months, TIMESTAMP
+from campaign_log import CampaignLog
+from decision_log import DECISIONS_LOG, SEGMENTS_DIR, parse_decisions, read_segment, segment_summaries
+
+
+SOURCES = ("timeline", "events", "decisions", "campaigns")
+
+CAMPAIGNS_DIR = Path("operations") / "campaigns"
+
+CAMPAIGN_DAY = re.compile(r"^## (\d{4}-\d{2}-\d{2})\s*$")
+CAMPAIGN_ENTRY = re.compile(r"^### (\d{2}:\d{2}:\d{2}) \[([A-Z_]+)\] (.*)$")
+
+
+def normalize_timestamp(value: str) -> str:
+    """ISO timestamps (UTC "Z" ones converted to local time) as "YYYY-MM-DD HH:MM:SS"."""
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return str(value or "")
+    if parsed.tzinfo:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.strftime("%Y-%m-%d %H:%M:%S")
+
+
+# -- sources (each yields (timestamp, activity) newest first) -------------
+
+def timeline_source(start: date, end: date):
+    current = end
+    while current >= start:
+        day = DayIndex(current.isoformat())
+        day.refresh()
+        entries = sorted(day.entries, key=lambda entry: entry[TIME], reverse=True)
+        for event in day.read_events(entries):
+            text = f"{event['header']}\n{event['content']}" if event["content"] else event["header"]
+            yield f"{event['date']} {event['time']}", {"source": "timeline", "kind": event["type"], "text": text}
+        current -= timedelta(days=1)
+
+
+def events_source(start: date, end: date):
+    first, last = start.isoformat(), f"{end.isoformat()} 99:99"
+    for month in reversed(list_months()):
+        if month > last[:7]:
+            continue
+        if month < first[:7]:
+            break
+        log = MonthLog(month)
+        log.refresh()
+        entries = sorted(
+            (entry for entry in log.entries if first <= entry[TIMESTAMP] <= last),
+            key=lambda entry: entry[TIMESTAMP], reverse=True
+        )
+        for event in log.read(entries):
+            yield f"{event['timestamp']}:00", {"source": "events", "kind": event["importance"], "text": event["event"]}
+
+
+def decisions_source(start: date, end: date):
+    first, last = start.isoformat(), f"{end.isoformat()} 23:59:59"
+
+    def decisions(records):
+        records = [d for d in records if first <= d["timestamp"] <= last]
+        records.sort(key=lambda d: d["timestamp"], reverse=True)
+        for d in records:
+            yield d["timestamp"], {"source": "decisions", "kind": d["category"], "text": d["description"]}
+
+    try:
+        with open(DECISIONS_LOG, "r", encoding="utf-8") as f:
+            active = parse_decisions(f)
+    except OSError:
+        active = []
+
+    # Segments hold older entries than the active log, and don't overlap each other
+    summaries = segment_summaries(SEGMENTS_DIR)
+    segments = [
+        name for name in sorted(summaries, key=lambda n: summaries[n]["last"] or "", reverse=True)
+        if summaries[name]["entries"] and summaries[name]["last"] >= first and summaries[name]["first"] <= last
+    ]
+    yield from decisions(active)
+    for name in segments:
+        yield from decisions(read_segment(SEGMENTS_DIR / name))
+
+
+def campaign_log(path: Path, start: date, end: date) -> list[tuple[str, str, str]]:
+    """
+    (timestamp, kind, text) for the entries of a campaign log around the
+    window, in any order: its logged events (a day either side, as they
+    are UTC) and the entries of log.md's body, whose "## day" / "### time"
+    headings are UTC as well. All timestamps come back in local time.
+    """
+    events = CampaignLog(path.parent).window(
+        (start - timedelta(days=1)).isoformat(), (end + timedelta(days=2)).isoformat()
+    )
+    entries = [
+        (normalize_timestamp(event.get("timestamp")), event.get("type", ""), event.get("message", ""))
+        for event in events
+    ]
+
+    _, markdown = read_frontmatter(path)
+
+    day = None
+    body_start = len(entries)
+    for line in markdown.splitlines():
+        day_match = CAMPAIGN_DAY.match(line)
+        entry_match = CAMPAIGN_ENTRY.match(line)
+        if day_match:
+            day = day_match.group(1)
+        elif entry_match and day:
+            timestamp = normalize_timestamp(f"{day}T{entry_match.group(1)}Z")
+            entries.append((timestamp, entry_match.group(2), entry_match.group(3)))
+        elif line.startswith("- ") and len(entries) > body_start:
+            timestamp, kind, text = entries[-1]
+            entries[-1] = (timestamp, kind, f"{text}\n{line}")
+    return entries
+
+
+def campaign_source(path: Path, start: date, end: date):
+    first, last = start.isoformat(), f"{end.isoformat()} 23:59:59"
+    try:
+        entries = campaign_log(path, start, end)
+    except (OSError, ValueError):
+        return
+    campaign = path.parent.name
+    for timestamp, kind, text in sorted(entries, reverse=True):
+        if first <= timestamp <= last:
+            yield timestamp, {"source": "campaigns", "kind": kind, "text": text, "campaign": campaign}
+
+
+def campaign_paths(campaign: str | None = None) -> list[Path]:
+    if campaign:
+        path = CAMPAIGNS_DIR / re.sub(r"[^a-z0-9-]", "-", campaign.lower()) / "log.md"
+        return [path] if path.exists() else []
+    return sorted(CAMPAIGNS_DIR.glob("*/log.md"))
+
+
+# -- entity filters ------------------------------------------------------
+
+def prospect_needles(key: str) -> list[str]:
+    """Text forms a prospect shows up as: slug, name, email, phone and masked phone."""
+    needles = [key]
+    phones = [key] if len(normalize_phone(key)) >= 7 else []
+    entry = Collection("prospects").get(key)
+    if entry:
+        needles += [entry["slug"], entry.get("name") or "", entry.get("email") or "", entry.get("phone") or ""]
+        phones.append(entry.get("phone"))
+    for phone in phones:
+        digits = normalize_phone(phone)
+        if len(digits) >= 4:
+            needles.append(f"***{digits[-4:]}")
+    return [needle.lower() for needle in needles if needle]
+
+
+def build_filters(prospect: str | None, email: str | None, campaign: str | None, query: str | None) -> list:
+    """One predicate per given filter; an activity must pass them all."""
+    filters = []
+
+    def text_filter(needles):
+        return lambda activity: any(needle in activity["text"].lower() for needle in needles)
+
+    if prospect:
+        filters.append(text_filter(prospect_needles(prospect)))
+    if email:
+        filters.append(text_filter([email.lower()]))
+    if campaign:
+        folder = re.sub(r"[^a-z0-9-]", "-", campaign.lower())
+        in_text = text_filter({campaign.lower(), folder})
+        filters.append(lambda activity: activity.get("campaign") == folder or in_text(activity))
+    if query:
+        filters.append(text_filter([query.lower()]))
+    return filters
+
+
+def activity_stream(start: date, end: date, sources=SOURCES, prospect: str | None = None, email: str | None = None,
+                    campaign: str | None = None, query: str | None = None):
+    """Lazily merged (timestamp, activity) pairs between start and end, newest first."""
+    unknown = [source for source in sources if source not in SOURCES]
+    if unknown:
+        raise ValueError(f"Unknown source(s): {', '.join(unknown)} (expected {', '.join(SOURCES)})")
+
+    streams = []
+    if "timeline" in sources:
+        streams.append(timeline_source(start, end))
+    if "events" in sources:
+        streams.append(events_source(start, end))
+    if "decisions" in sources:
+        streams.append(decisions_source(start, end))
+    if "campaigns" in sources:
+        streams.extend(campaign_source(path, start, end) for path in campaign_paths(campaign))
+
+    filters = build_filters(prospect, email, campaign, query)
+    for timestamp, activity in heapq.merge(*streams, key=lambda item: item[0], reverse=True):
+        if all(keep(activity) for keep in filters):
+            yield timestamp, activity
+
+
+def main():
+    try:
+        raw = sys.stdin.read().strip()
+        input_data = json.loads(raw) if raw else {}
+
+        end = date.fromisoformat(input_data["to"]) if input_data.get("to") else date.today()
+        start = date.fromisoformat(input_data["from"]) if input_data.get("from") else end - timedelta(days=7)
+        limit = int(input_data.get("limit", 50))
+
+        stream = activity_stream(
+            start, end,
+            sources=input_data.get("sources") or SOURCES,
+            prospect=input_data.get("prospect"),
+            email=input_data.get("email"),
+            campaign=input_data.get("campaign"),
+            query=input_data.get("query"),
+        )
+        activities = [{"timestamp": timestamp, **activity} for timestamp, activity in islice(stream, limit + 1)]
+
+        print(json.dumps({
+            "status": "success",
+            "activities": activities[:limit],
+            "returned": len(activities[:limit]),
+            "has_more": len(activities) > limit
+        }))
+
+    except Exception as e:
+        error_result = {
+            "status": "error",
+            "message": str(e)
+        }
+        print(json.dumps(error_result))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+decision_log.py - Rotation and summaries for history/decisions.log.
+
+log_decision.py appends one line per decision:
+
+    [YYYY-MM-DD HH:MM:SS] [CATEGORY] Decision description
+
+Before each append the active log is rotated if it has grown past
+MAX_LOG_BYTES or its first entry is from an earlier month: it is gzipped
+into a segment and a fresh log (with the usual header) takes its place.
+Each segment gets a summary recorded next to it:
+
+    {"first": "2026-01-02 09:00:00", "last": "2026-01-31 17:45:10",
+     "entries": 412, "categories": {"ACTION": 390, "ESCALATION": 22}}
+
+so query_decisions.py can skip every segment whose time span or categories
+can't match, and only decompress the rest. The active log is small by
+construction and is always scanned.
+
+Layout (relative to the tenant folder):
+    history/decisions.log                           active log
+    history/decisions/YYYY-MM-DDTHHMMSS.log.gz      rotated segments
+    history/decisions/segments.json                 {segment name: summary}
+
+Segments missing from segments.json (e.g. after a crash mid-rotation) are
+summarised the first time they are queried.
+"""
+
+import sys
+import os
+import re
+import gzip
+import json
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+# Add this directory to path for shared atomic write imports
+sys.path.insert(0, str(Path(__file__).parent))
+import atomic_io
+
+
+HISTORY_DIR = Path("history")
+DECISIONS_LOG = HISTORY_DIR / "decisions.log"
+SEGMENTS_DIR = HISTORY_DIR / "decisions"
+
+MAX_LOG_BYTES = 1024 * 1024
+
+VALID_CATEGORIES = ["ACTION", "ESCALATION", "BOUNDARY", "STATE_CHANGE"]
+
+LOG_HEADER = """# Decision Log
+# Format: [TIMESTAMP] [CATEGORY] Decision description
+# Categories: ACTION, ESCALATION, BOUNDARY, STATE_CHANGE
+
+"""
+
+DECISION_LINE = re.compile(r"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] \[([A-Z_]+)\] (.*)$")
+
+
+def parse_decisions(lines) -> list[dict]:
+    """Decision records from log lines; unmatched lines continue the previous description."""
+    decisions = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        match = DECISION_LINE.match(line)
+        if match:
+            decisions.append({"timestamp": match.group(1), "category": match.group(2), "description": match.group(3)})
+        elif decisions and line.strip() and not line.startswith("# "):
+            decisions[-1]["description"] += f"\n{line}"
+    return decisions
+
+
+def summarize(decisions: list[dict]) -> dict:
+    return {
+        "first": decisions[0]["timestamp"] if decisions else None,
+        "last": decisions[-1]["timestamp"] if decisions else None,
+        "entries": len(decisions),
+        "categories": dict(Counter(d["category"] for d in decisions)),
+    }
+
+
+def first_timestamp(path: Path) -> str | None:
+    """Timestamp of the first decision in a log, reading only up to it."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                match = DECISION_LINE.match(line)
+                if match:
+                    return match.group(1)
+    except OSError:
+        pass
+    return None
+
+
+def needs_rotation(path: Path, now: datetime) -> bool:
+    try:
+        if path.stat().st_size > MAX_LOG_BYTES:
+            return True
+    except OSError:
+        return False
+    first = first_timestamp(path)
+    return first is not None and first[:7] < now.strftime("%Y-%m")
+
+
+def rotate(path: Path = DECISIONS_LOG, segments_dir: Path = SEGMENTS_DIR) -> str | None:
+    """Gzip the active log into a segment and start a fresh one. Returns the segment name."""
+    with atomic_io.locked(path):
+        text = path.read_text(encoding="utf-8")
+        decisions = parse_decisions(text.splitlines())
+        if not decisions:
+            return None
+
+        segments_dir.mkdir(parents=True, exist_ok=True)
+        stem = decisions[0]["timestamp"].replace(" ", "T").replace(":", "")
+        name = f"{stem}.log.gz"
+        suffix = 1
+        while (segments_dir / name).exists():
+            suffix += 1
+            name = f"{stem}-{suffix}.log.gz"
+
+        tmp_path = segments_dir / f"{name}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, segments_dir / name)
+
+        def record(data):
+            data[name] = summarize(decisions)
+
+        atomic_io.update_json(segments_dir / "segments.json", record, default=dict)
+        atomic_io.write_text(path, LOG_HEADER)
+        return name
+
+
+def append_decision(category: str, description: str, now: datetime | None = None,
+                    path: Path = DECISIONS_LOG, segments_dir: Path = SEGMENTS_DIR) -> None:
+    """Rotate if due, then append one decision line."""
+    now = now or datetime.now()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_io.locked(path):
+        if needs_rotation(path, now):
+            rotate(path, segments_dir)
+        if not path.exists():
+            atomic_io.write_text(path, LOG_HEADER)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] [{category}] {description}\n")
+
+
+def read_segment(path: Path) -> list[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return parse_decisions(f)
+
+
+def segment_summaries(segments_dir: Path = SEGMENTS_DIR) -> dict[str, dict]:
+    """Summary of every segment on disk, summarising any that aren't recorded yet."""
+    try:
+        names = sorted(p.name for p in segments_dir.iterdir() if p.name.endswith(".log.gz"))
+    except OSError:
+        return {}
+    index_path = segments_dir / "segments.json"
+    try:
+        summaries = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        summaries = {}
+
+    missing = {name: summarize(read_segment(segments_dir / name)) for name in names if name not in summaries}
+    if missing:
+        try:
+            atomic_io.update_json(index_path, lambda data: data.update(missing), default=dict)
+        except OSError:
+            # Read-only tenant; summaries still serve this query
+            pass
+        summaries.update(missing)
+    return {name: summaries[name] for name in names}
+
+
+def segment_can_match(summary: dict, categories: set[str] | None, start: str | None, end: str | None) -> bool:
+    if not summary["entries"]:
+        return False
+    if start and summary["last"] < start:
+        return False
+    if end and summary["first"] > end:
+        return False
+    return not categories or any(summary["categories"].get(c) for c in categories)
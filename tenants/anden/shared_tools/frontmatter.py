@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+frontmatter.py - Shared codec and parse cache for `---json` markdown files.
+
+Every life, campaign and prospect file uses the same format:
+---json
+{ ... structured data ... }
+---
+# Markdown content here
+
+parse() splits on the header and closing `---` line with plain string
+searches, so the markdown body is never run through a regex.
+
+read()/read_data()/read_keys() add a read-through cache keyed by
+(path, mtime_ns, size):
+- in-process, parsed documents are kept as marshal blobs, one per top-level
+  key (every caller gets its own copy, so mutating the returned dict is
+  safe, and read_keys() only decodes the keys it asks for)
+- across tool calls, the same blobs are persisted as a sidecar under
+  state/.index/frontmatter/, so an unchanged file is parsed at most once
+  per tenant until it is modified
+
+read_data() and read_keys() never read the markdown body: on a cache miss
+only the header lines are read from disk.
+
+Usage:
+    sys.path.insert(0, str(Path(__file__).parent))
+    import frontmatter
+
+    data, markdown = frontmatter.read(Path("life/patterns.md"))
+    data = frontmatter.read_data(Path("relationships/prospects/jane.md"))
+    data, _ = frontmatter.read_keys(Path("identity/profile.md"), ["name"])
+    frontmatter.write(Path("life/patterns.md"), data, markdown)
+"""
+
+import sys
+import json
+import hashlib
+import marshal
+import os
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import atomic_io
+
+
+CACHE_VERSION = 2
+CACHE_DIR = Path("state") / ".index" / "frontmatter"
+
+HEADER = "---json"
+DELIMITER = "\n---"
+READ_CHUNK = 1 << 16
+
+_memory: dict[str, bytes] = {}
+
+
+def split(content: str) -> tuple[str | None, int]:
+    """
+    Locate the JSON header region without scanning the body.
+
+    Returns (json_str, body_offset). json_str is None when the content has
+    no `---json` header.
+    """
+    if not content.startswith(HEADER):
+        return None, 0
+
+    header_end = content.find("\n")
+    if header_end == -1 or content[len(HEADER):header_end].strip():
+        return None, 0
+
+    close = content.find(DELIMITER, header_end)
+    if close == -1:
+        return None, 0
+
+    # Skip the delimiter and any whitespace before the markdown body
+    body = close + len(DELIMITER)
+    length = len(content)
+    while body < length and content[body].isspace():
+        body += 1
+
+    return content[header_end + 1:close], body
+
+
+def _decode(json_str: str | None, body: int) -> tuple[dict, int]:
+    """Decode a header located by split()/read_header()."""
+    if json_str is None:
+        return {}, 0
+
+    try:
+        data = json.loads(json_str)
+    except json.JSONDecodeError:
+        # Invalid JSON, treat the whole file as markdown
+        return {}, 0
+
+    if not isinstance(data, dict):
+        return {}, 0
+
+    return data, body
+
+
+def parse_with_offset(content: str) -> tuple[dict, int]:
+    """Parse frontmatter, returning (data, offset of the markdown body)."""
+    return _decode(*split(content))
+
+
+def read_header(file_path: Path) -> tuple[str | None, int]:
+    """
+    Like split(), but reads the file only as far as the end of the header.
+
+    Returns (json_str, body_offset) with the offset counted in characters
+    of the decoded text, exactly as split() would report it.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        text = ""
+        header_end = -1
+        close = -1
+        searched = 0
+        eof = False
+
+        while close == -1:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                return None, 0
+            text += chunk
+
+            if not text.startswith(HEADER[:len(text)]):
+                return None, 0
+
+            if header_end == -1:
+                header_end = text.find("\n")
+                if header_end == -1:
+                    continue
+                if text[len(HEADER):header_end].strip():
+                    return None, 0
+                searched = header_end
+
+            close = text.find(DELIMITER, searched)
+            searched = max(header_end, len(text) - len(DELIMITER) + 1)
+
+        # Skip the delimiter and any whitespace before the markdown body
+        body = close + len(DELIMITER)
+        while not eof:
+            while body < len(text) and text[body].isspace():
+                body += 1
+            if body < len(text):
+                break
+            chunk = f.read(READ_CHUNK)
+            eof = not chunk
+            text += chunk
+
+    return text[header_end + 1:close], body
+
+
+def parse(content: str) -> tuple[dict, str]:
+    """
+    Parse JSON frontmatter from markdown content.
+
+    Returns (data_dict, markdown_content).
+    If no frontmatter, returns (empty_dict, original_content).
+    """
+    data, body = parse_with_offset(content)
+    return data, content[body:]
+
+
+def serialize(data: dict, markdown: str) -> str:
+    """Serialize data and markdown back to frontmatter format."""
+    json_str = json.dumps(data, indent=2, ensure_ascii=False)
+    return f"---json\n{json_str}\n---\n{markdown}"
+
+
+def _cache_key(file_path: Path) -> str:
+    return os.path.abspath(file_path)
+
+
+def _sidecar_path(key: str) -> Path:
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{digest}.marshal"
+
+
+def _load_cached(key: str, stat: os.stat_result) -> tuple[dict, int] | None:
+    """Return ({key: blob}, body_offset) if a cache entry matches the file's stat."""
+    blob = _memory.get(key)
+
+    if blob is None:
+        try:
+            blob = _sidecar_path(key).read_bytes()
+        except OSError:
+            return None
+
+    try:
+        version, mtime_ns, size, fields, body = marshal.loads(blob)
+    except (EOFError, ValueError, TypeError):
+        return None
+
+    if version != CACHE_VERSION or mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+        return None
+
+    _memory[key] = blob
+    return fields, body
+
+
+def _store_cached(key: str, stat: os.stat_result, data: dict, body: int) -> None:
+    fields = {name: marshal.dumps(value) for name, value in data.items()}
+    blob = marshal.dumps((CACHE_VERSION, stat.st_mtime_ns, stat.st_size, fields, body))
+    _memory[key] = blob
+
+    try:
+        sidecar = _sidecar_path(key)
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(blob)
+        os.replace(tmp_path, sidecar)
+    except (OSError, ValueError):
+        # The sidecar is an optimisation; the in-process cache still applies
+        pass
+
+
+def _read(file_path: Path, want_markdown: bool, keys=None) -> tuple[dict, str | None, bool]:
+    file_path = Path(file_path)
+    key = _cache_key(file_path)
+    stat = os.stat(file_path)
+
+    cached = _load_cached(key, stat)
+    if cached is not None:
+        fields, body = cached
+        data = {
+            name: marshal.loads(blob) for name, blob in fields.items()
+            if keys is None or name in keys
+        }
+        if not want_markdown:
+            return data, None, bool(fields)
+        return data, file_path.read_text(encoding="utf-8")[body:], bool(fields)
+
+    if want_markdown:
+        content = file_path.read_text(encoding="utf-8")
+        data, body = parse_with_offset(content)
+    else:
+        data, body = _decode(*read_header(file_path))
+
+    try:
+        _store_cached(key, stat, data, body)
+    except ValueError:
+        # Data marshal can't represent; skip caching this file
+        pass
+
+    has_data = bool(data)
+    if keys is not None:
+        data = {name: value for name, value in data.items() if name in keys}
+
+    return data, content[body:] if want_markdown else None, has_data
+
+
+def read(file_path: Path) -> tuple[dict, str]:
+    """
+    Read and parse a frontmatter file through the cache.
+
+    Returns (data_dict, markdown_content), like parse(). Raises
+    FileNotFoundError if the file does not exist.
+    """
+    data, markdown, _ = _read(file_path, want_markdown=True)
+    return data, markdown
+
+
+def read_data(file_path: Path) -> dict:
+    """Read only the frontmatter data; on a cache hit the file is not opened."""
+    data, _, _ = _read(file_path, want_markdown=False)
+    return data
+
+
+def read_keys(file_path: Path, keys) -> tuple[dict, bool]:
+    """
+    Read only the given top-level keys of the frontmatter data.
+
+    Returns (data, has_data): keys that aren't present are left out of data,
+    and has_data tells whether the file has any frontmatter data at all. On
+    a cache hit only the requested keys are decoded.
+    """
+    data, _, has_data = _read(file_path, want_markdown=False, keys=set(keys))
+    return data, has_data
+
+
+def write(file_path: Path, data: dict, markdown: str, expected=atomic_io.UNCHECKED) -> None:
+    """
+    Atomically write a frontmatter file, priming the cache with the result.
+
+    expected is passed through to atomic_io.write_text() for conflict checks.
+    """
+    file_path = Path(file_path)
+    content = serialize(data, markdown)
+    atomic_io.write_text(file_path, content, expected=expected)
+
+    if "\r" in content:
+        # read_text() translates newlines, so offsets into content would drift
+        return
+
+    try:
+        _, body = split(content)
+        _store_cached(_cache_key(file_path), os.stat(file_path), data, body)
+    except (OSError, ValueError):
+        pass
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+life_events.py - Structured monthly events log with an offset index.
+
+log_event.py writes each event twice: the human-readable line in
+life/events/YYYY-MM.md, and a JSON record next to it:
+
+    life/events/YYYY-MM.jsonl
+    {"timestamp": "2026-01-08 14:03", "importance": "high", "event": "..."}
+
+Each month gets a small offset index with one record per event:
+
+    [byte_offset, byte_length, "YYYY-MM-DD HH:MM", "importance"]
+
+so a read filters on date and importance from the index and seeks straight
+to the lines it needs. High-importance events of every month are also kept
+in one summary file, along with the JSONL size each month was indexed at:
+listing them stats each month and opens only the ones that have any (or
+that grew since).
+
+Layout (relative to the tenant folder):
+    state/.index/events/YYYY-MM.jsonl   one JSON record per line
+    state/.index/events/high.json       {"YYYY-MM": {"size": n, "high": [[offset, length, timestamp], ...]}}
+
+The JSONL is append-only, so its index is appended to as well: a refresh
+indexes the lines after the last indexed one. If the file shrank or the
+last indexed line no longer parses to the same record, the month is
+re-indexed from scratch. Months logged before the JSONL existed are
+backfilled from their markdown the first time they are read or appended to.
+
+Input JSON (reader):
+{
+    "from": "2026-01-01",           // optional - inclusive
+    "to": "2026-03-31",             // optional - inclusive
+    "importance": "high",           // optional - a level or a list of levels
+    "limit": 50                     // optional - newest first, default 50
+}
+
+Output JSON:
+{
+    "status": "success",
+    "events": [{"timestamp": "2026-03-30 09:12", "importance": "high", "event": "...", "month": "2026-03"}],
+    "returned": 1,
+    "has_more": false
+}
+"""
+
+import sys
+import os
+import re
+import json
+from datetime import date, datetime
+from pathlib import Path
+
+# Add this directory to path for shared atomic write imports
+sys.path.insert(0, str(Path(__file__).parent))
+import atomic_io
+
+
+EVENTS_DIR = Path("life") / "events"
+EVENTS_INDEX_DIR = Path("state") / ".index" / "events"
+
+IMPORTANCE_LEVELS = ("high", "medium", "low")
+IMPORTANCE_MARKERS = {"high": "[!]", "medium": "[-]", "low": "[.]"}
+
+MARKDOWN_EVENT = re.compile(r"^\[(!|-|\.)\] \*\*(\d{4}-\d{2}-\d{2} \d{2}:\d{2})\*\* - (.*)$")
+MONTH_FILE = re.compile(r"^\d{4}-\d{2}$")
+
+# Record fields
+OFFSET, LENGTH, TIMESTAMP, IMPORTANCE = range(4)
+
+
+def encode_record(timestamp: str, importance: str, event: str) -> bytes:
+    record = {"timestamp": timestamp, "importance": importance, "event": event}
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def parse_markdown(text: str) -> list[tuple[str, str, str]]:
+    """(timestamp, importance, event) for each event line of a month's markdown."""
+    levels = {marker[1]: level for level, marker in IMPORTANCE_MARKERS.items()}
+    events = []
+    for line in text.splitlines():
+        match = MARKDOWN_EVENT.match(line)
+        if match:
+            events.append((match.group(2), levels[match.group(1)], match.group(3)))
+        elif events and line.strip() and not line.startswith("# "):
+            # Continuation of a multi-line event
+            timestamp, importance, event = events[-1]
+            events[-1] = (timestamp, importance, f"{event}\n{line}")
+    return events
+
+
+def month_range(start: date | None, end: date | None) -> tuple[str, str]:
+    return (start.strftime("%Y-%m") if start else "0000-00", end.strftime("%Y-%m") if end else "9999-99")
+
+
+class MonthLog:
+    """One month's JSONL events and their offset index."""
+
+    def __init__(self, month: str, events_dir: Path = EVENTS_DIR, index_dir: Path = EVENTS_INDEX_DIR):
+        self.month = month
+        self.path = Path(events_dir) / f"{month}.jsonl"
+        self.markdown_path = Path(events_dir) / f"{month}.md"
+        self.index_path = Path(index_dir) / f"{month}.jsonl"
+        self.high_path = Path(index_dir) / "high.json"
+        self.entries: list[list] = []
+        self._loaded = False
+
+    # -- writes ----------------------------------------------------------
+
+    def backfill(self) -> None:
+        """Create the JSONL from the markdown for months logged before it existed."""
+        with atomic_io.locked(self.path):
+            if self.path.exists() or not self.markdown_path.exists():
+                return
+            events = parse_markdown(self.markdown_path.read_text(encoding="utf-8"))
+            atomic_io.write_text(self.path, b"".join(encode_record(*event) for event in events).decode("utf-8"))
+
+    def append(self, timestamp: str, importance: str, event: str) -> None:
+        """Append one record (the markdown line is written by the caller)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_io.locked(self.path):
+            self.backfill()
+            with open(self.path, "ab") as f:
+                f.write(encode_record(timestamp, importance, event))
+
+    # -- index -----------------------------------------------------------
+
+    def _load(self) -> None:
+        self._loaded = True
+        self.entries = []
+        try:
+            lines = self.index_path.read_text(encoding="utf-8").splitlines()
+            self.entries = json.loads(f"[{','.join(lines)}]")
+        except OSError:
+            pass
+        except ValueError:
+            # Torn append; rebuild from the JSONL
+            self.entries = []
+
+    def _write(self, kept: int, records: list[list]) -> None:
+        """Keep the first `kept` index lines and append records after them."""
+        lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with atomic_io.locked(self.index_path):
+            if kept == 0:
+                atomic_io.write_text(self.index_path, lines)
+                return
+            with open(self.index_path, "r+b") as f:
+                for _ in range(kept):
+                    f.readline()
+                f.truncate(f.tell())
+                f.write(lines.encode("utf-8"))
+
+    def _write_high(self) -> None:
+        """Record this month's high events and the JSONL size they cover."""
+        last = self.entries[-1] if self.entries else None
+        summary = {
+            "size": last[OFFSET] + last[LENGTH] if last else 0,
+            "high": [[e[OFFSET], e[LENGTH], e[TIMESTAMP]] for e in self.entries if e[IMPORTANCE] == "high"],
+        }
+
+        def update(data):
+            data[self.month] = summary
+
+        self.high_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_io.update_json(self.high_path, update, default=dict, indent=None)
+
+    def _verified(self, f, size: int) -> bool:
+        """The last indexed line is still where (and what) the index says."""
+        last = self.entries[-1]
+        if size < last[OFFSET] + last[LENGTH]:
+            return False
+        f.seek(last[OFFSET])
+        record = self._record(last[OFFSET], f.read(last[LENGTH]))
+        return record == last
+
+    @staticmethod
+    def _record(offset: int, line: bytes) -> list | None:
+        try:
+            data = json.loads(line)
+            return [offset, len(line), data["timestamp"], data["importance"]]
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def refresh(self) -> list[list]:
+        """Index records appended since the last refresh; returns them."""
+        if not self._loaded:
+            self._load()
+        if not self.path.exists():
+            self.backfill()
+
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return []
+
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if self.entries and self._verified(f, size):
+                last = self.entries[-1]
+                start = last[OFFSET] + last[LENGTH]
+                if size == start:
+                    return []
+                kept = len(self.entries)
+            else:
+                kept, start = 0, 0
+
+            f.seek(start)
+            chunk = f.read()
+
+        records = []
+        offset = start
+        for line in chunk.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                # Still being written
+                break
+            record = self._record(offset, line)
+            if record:
+                records.append(record)
+            offset += len(line)
+
+        if not records and len(self.entries) == kept:
+            return []
+        self.entries = self.entries[:kept] + records
+        try:
+            self._write(kept, records)
+            self._write_high()
+        except OSError:
+            # Read-only tenant; the index still serves this process
+            pass
+        return records
+
+    # -- reads -----------------------------------------------------------
+
+    def read(self, entries: list[list]) -> list[dict]:
+        """Seek to several records with one open file handle."""
+        if not entries:
+            return []
+        events = []
+        with open(self.path, "rb") as f:
+            for entry in entries:
+                f.seek(entry[OFFSET])
+                events.append({**json.loads(f.read(entry[LENGTH])), "month": self.month})
+        return events
+
+
+def append_event(event: str, importance: str, now: datetime | None = None,
+                 events_dir: Path = EVENTS_DIR) -> Path:
+    """Record one event in the month's JSONL. Returns its path."""
+    now = now or datetime.now()
+    log = MonthLog(now.strftime("%Y-%m"), events_dir)
+    log.append(now.strftime("%Y-%m-%d %H:%M"), importance, event)
+    return log.path
+
+
+def list_months(events_dir: Path = EVENTS_DIR) -> list[str]:
+    """Months with a JSONL or markdown events file, oldest first."""
+    try:
+        names = {path.stem for path in Path(events_dir).iterdir() if path.suffix in (".jsonl", ".md")}
+    except OSError:
+        return []
+    return sorted(name for name in names if MONTH_FILE.match(name))
+
+
+def read_events(start: date | None = None, end: date | None = None, importance=None, limit: int = 50,
+                events_dir: Path = EVENTS_DIR, index_dir: Path = EVENTS_INDEX_DIR) -> tuple[list[dict], bool]:
+    """
+    Events between start and end (inclusive) at the given importance
+    level(s), newest first. Returns (events, has_more).
+    """
+    levels = {importance} if isinstance(importance, str) else set(importance or IMPORTANCE_LEVELS)
+    unknown = levels - set(IMPORTANCE_LEVELS)
+    if unknown:
+        raise ValueError(f"Invalid importance: {', '.join(sorted(unknown))}. Must be one of: {', '.join(IMPORTANCE_LEVELS)}")
+
+    first = start.isoformat() if start else ""
+    last = f"{end.isoformat()} 99:99" if end else "9999"
+    lo, hi = month_range(start, end)
+    months = [m for m in list_months(events_dir) if lo <= m <= hi]
+
+    high = {}
+    if levels == {"high"}:
+        try:
+            high = json.loads((Path(index_dir) / "high.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+
+    events = []
+    for month in reversed(months):
+        log = MonthLog(month, events_dir, index_dir)
+        summary = high.get(month)
+        try:
+            current = summary is not None and log.path.stat().st_size == summary["size"]
+        except OSError:
+            current = False
+        if current:
+            entries = [[offset, length, timestamp, "high"] for offset, length, timestamp in summary["high"]]
+        else:
+            log.refresh()
+            entries = [entry for entry in log.entries if entry[IMPORTANCE] in levels]
+
+        entries = [entry for entry in entries if first <= entry[TIMESTAMP] <= last]
+        # Records are appended in time order; newest first within the month
+        entries.sort(key=lambda entry: (entry[TIMESTAMP], entry[OFFSET]), reverse=True)
+        events.extend(log.read(entries[:limit + 1 - len(events)]))
+        if len(events) > limit:
+            break
+
+    return events[:limit], len(events) > limit
+
+
+def main():
+    try:
+        raw = sys.stdin.read().strip()
+        input_data = json.loads(raw) if raw else {}
+
+        start = date.fromisoformat(input_data["from"]) if input_data.get("from") else None
+        end = date.fromisoformat(input_data["to"]) if input_data.get("to") else None
+        limit = int(input_data.get("limit", 50))
+
+        events, has_more = read_events(start, end, input_data.get("importance"), limit)
+
+        print(json.dumps({
+            "status": "success",
+            "events": events,
+            "returned": len(events),
+            "has_more": has_more
+        }))
+
+    except Exception as e:
+        error_result = {
+            "status": "error",
+            "message": str(e)
+        }
+        print(json.dumps(error_result))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
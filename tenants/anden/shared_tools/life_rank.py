@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+"""
+life_rank.py - Ranked (BM25) retrieval over a tenant's memory files.
+
+Where life_index.py answers "which lines contain this substring", this
+module answers "which parts of memory are most about this query". Every
+*.md file under life/, identity/, knowledge/ and relationships/ is split
+into sections:
+- one per frontmatter string field (e.g. contacts[3].notes)
+- one per markdown section (the text under each heading)
+
+and each section is tokenized, lowercased and stemmed ("showings" and
+"showing" both become "show").
+
+Layout (relative to the tenant folder):
+    state/.index/rank/manifest.marshal        per file: mtime_ns, size, section
+                                              count, total and per-section lengths
+    state/.index/rank/postings/<xx>.marshal   term -> {file: (section ids, term
+                                              frequencies)}, as packed arrays
+    state/.index/rank/sections/<nn>.marshal   file -> its terms and sections
+                                              (kind, locator, line, text)
+    state/.index/rank/grams.marshal           trigram -> vocabulary terms
+
+Postings are sharded by the first two characters of each term (like
+life_index.py), so a query loads the manifest and the shards of its own
+terms, walks only those terms' postings, and reads section texts only
+for the hits it returns: scoring costs O(postings of the query terms),
+not O(sections).
+
+Query terms that appear nowhere in memory (usually typos) are expanded to
+the closest vocabulary terms by character trigram similarity, weighted by
+how similar they are.
+
+The index is refreshed incrementally like life_index.py: files whose
+(mtime_ns, size) changed are re-sectioned, and only their postings, their
+sections bucket and the grams of terms that came or went are rewritten.
+As there, a refresh holds the manifest's lock and reloads first if another
+process saved the index meanwhile.
+
+Usage:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from life_rank import LifeRank
+
+    ranker = LifeRank()
+    ranker.refresh()
+    ranker.search("morning showngs", limit=10)
+"""
+
+import sys
+import os
+import re
+import math
+import heapq
+import marshal
+import zlib
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add this directory to path for shared codec imports
+sys.path.insert(0, str(Path(__file__).parent))
+import atomic_io
+import frontmatter
+from life_index import INDEXED_ROOTS, TOKEN_PATTERN, format_data_path, iter_string_leaves, markdown_offset, shard_key
+
+
+RANK_VERSION = 2
+RANK_DIR = Path("state") / ".index" / "rank"
+
+# Files are spread over this many sections buckets (by CRC32 of their path)
+SECTION_BUCKETS = 64
+
+# The delta is merged into the base shards past this many sections, or stale files
+MERGE_SECTIONS = 2000
+MERGE_FILES = 64
+
+# BM25 parameters (the usual defaults)
+K1 = 1.2
+B = 0.75
+
+# Typo fallback: trigram Jaccard similarity needed, and expansions per term
+FUZZY_THRESHOLD = 0.35
+FUZZY_EXPANSIONS = 3
+
+SNIPPET_CHARS = 160
+
+HEADING_PATTERN = re.compile(r"^#{1,6}\s+(.*)$")
+
+# Suffixes stripped by stem(), longest first; (suffix, replacement)
+SUFFIXES = [
+    ("ational", "ate"), ("ization", "ize"), ("fulness", "ful"),
+    ("iveness", "ive"), ("ousness", "ous"), ("ations", "ate"),
+    ("ation", "ate"), ("ments", ""), ("ment", ""), ("ness", ""),
+    ("ings", ""), ("ing", ""), ("ies", "y"), ("ied", "y"),
+    ("sses", "ss"), ("ed", ""), ("es", ""), ("s", ""),
+]
+SHORT_ES = ("xes", "zes", "ches", "shes")
+
+
+def stem(token: str) -> str:
+    """
+    Reduce a token to a crude stem (light suffix stripping).
+
+    Not a full Porter stemmer: it only needs to map inflections of the same
+    word to one term, and to do it the same way for documents and queries.
+    """
+    if len(token) <= 3 or not token.isalpha():
+        return token
+
+    for suffix, replacement in SUFFIXES:
+        if not token.endswith(suffix):
+            continue
+        if suffix == "es" and not token.endswith(SHORT_ES):
+            continue
+        if suffix == "s" and token.endswith(("ss", "us", "is")):
+            return token
+        base = token[:-len(suffix)]
+        if len(base) < 3:
+            return token
+        if suffix in ("ing", "ings", "ed") and len(base) > 3 and base[-1] == base[-2] and base[-1] not in "lsz":
+            base = base[:-1]  # running -> run
+        return base + replacement
+
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase, stemmed terms."""
+    return [stem(token) for token in TOKEN_PATTERN.findall(text.lower())]
+
+
+def trigrams(term: str) -> set[str]:
+    padded = f"${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def count_terms(text: str) -> tuple[dict, int]:
+    counts: dict[str, int] = {}
+    terms = tokenize(text)
+    for term in terms:
+        counts[term] = counts.get(term, 0) + 1
+    return counts, len(terms)
+
+
+def section_file(file_path: Path) -> list[tuple]:
+    """
+    Split one file into sections.
+
+    Returns [(kind, locator, line, text, term_counts, length)], where kind is
+    "data" (locator is the field path) or "markdown" (locator is the heading,
+    line is the raw 1-based line the section starts on).
+    """
+    content = file_path.read_text(encoding="utf-8")
+    data, markdown = frontmatter.parse(content)
+    sections = []
+
+    for keys, value in iter_string_leaves(data):
+        counts, length = count_terms(value)
+        if length:
+            sections.append(("data", format_data_path(keys), 0, value, counts, length))
+
+    offset = markdown_offset(content, markdown)
+    heading, start, lines = "", 1, []
+
+    def flush():
+        text = "\n".join(lines).strip()
+        counts, length = count_terms(text)
+        if length:
+            sections.append(("markdown", heading, offset + start, text, counts, length))
+
+    for i, line in enumerate(markdown.split("\n"), start=1):
+        match = HEADING_PATTERN.match(line)
+        if match:
+            flush()
+            heading, start, lines = match.group(1).strip(), i, []
+        lines.append(line)
+    flush()
+
+    return sections
+
+
+def snippet(text: str, terms: set[str]) -> str:
+    """A window of text around the first occurrence of any matched term."""
+    for match in TOKEN_PATTERN.finditer(text):
+        if stem(match.group().lower()) in terms:
+            start = max(0, match.start() - SNIPPET_CHARS // 3)
+            break
+    else:
+        start = 0
+
+    window = " ".join(text[start:start + SNIPPET_CHARS].split())
+    prefix = "..." if start > 0 else ""
+    suffix = "..." if start + SNIPPET_CHARS < len(text) else ""
+    return prefix + window + suffix
+
+
+class LifeRank:
+    """BM25 ranker over memory sections, with an incrementally maintained on-disk index."""
+
+    def __init__(self, rank_dir: Path = RANK_DIR, roots: list[str] | None = None):
+        self.rank_dir = Path(rank_dir)
+        self.manifest_path = self.rank_dir / "manifest.marshal"
+        self.postings_dir = self.rank_dir / "postings"
+        self.sections_dir = self.rank_dir / "sections"
+        self.delta_path = self.rank_dir / "delta.marshal"
+        self.stale_path = self.rank_dir / "stale.marshal"
+        self.grams_path = self.rank_dir / "grams.marshal"
+        self.roots = roots or INDEXED_ROOTS
+        self._load()
+
+    # -- storage ---------------------------------------------------------
+
+    def _load(self) -> None:
+        """(Re)load the manifest, dropping everything read from disk so far."""
+        # Without a current manifest, the index is rebuilt without reading old shards
+        self._rebuilding = False
+        self._loaded = atomic_io.fingerprint(self.manifest_path)
+        self.manifest = self._load_manifest()
+        self._postings: dict[str, dict] = {}
+        self._sections: dict[int, dict] = {}
+        self._delta: dict | None = None
+        self._stale_terms: dict | None = None
+        self._grams: dict | None = None
+        self._lengths: dict[str, array] = {}
+        self._dirty_postings: set[str] = set()
+        self._dirty_sections: set[int] = set()
+        self._vocab_changed: set[str] = set()
+        self._changed = False
+
+    @contextmanager
+    def _locked(self):
+        """Hold the index's lock, reloading first if another process saved it meanwhile."""
+        with atomic_io.index_locked(self.manifest_path):
+            if atomic_io.fingerprint(self.manifest_path) != self._loaded:
+                self._load()
+            yield
+
+    @staticmethod
+    def _read(path: Path, default):
+        try:
+            return marshal.loads(path.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return default
+
+    @staticmethod
+    def _write(path: Path, data) -> None:
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(marshal.dumps(data))
+        os.replace(tmp_path, path)
+
+    def _load_manifest(self) -> dict:
+        manifest = self._read(self.manifest_path, None)
+        if isinstance(manifest, dict) and manifest.get("version") == RANK_VERSION:
+            return manifest
+        self._rebuilding = True
+        return {"version": RANK_VERSION, "files": {}, "stale": set(), "delta_sections": 0}
+
+    def _shard(self, key: str) -> dict:
+        """Base postings shard: term -> {file: (section ids, term frequencies)}."""
+        if key not in self._postings:
+            path = self.postings_dir / f"{key}.marshal"
+            self._postings[key] = {} if self._rebuilding else self._read(path, {})
+        return self._postings[key]
+
+    def _bucket(self, rel: str) -> tuple[dict, int]:
+        """Sections bucket holding a file: file -> {"terms": [...], "sections": [...]}."""
+        number = zlib.crc32(rel.encode("utf-8")) % SECTION_BUCKETS
+        if number not in self._sections:
+            path = self.sections_dir / f"{number:02d}.marshal"
+            self._sections[number] = {} if self._rebuilding else self._read(path, {})
+        return self._sections[number], number
+
+    @property
+    def delta(self) -> dict:
+        """Postings of files changed since the last merge: file -> {term: (ids, tfs)}."""
+        if self._delta is None:
+            self._delta = {} if self._rebuilding else self._read(self.delta_path, {})
+        return self._delta
+
+    @property
+    def stale_terms(self) -> dict:
+        """Terms the base shards still hold for each stale file (read when merging)."""
+        if self._stale_terms is None:
+            self._stale_terms = {} if self._rebuilding else self._read(self.stale_path, {})
+        return self._stale_terms
+
+    def grams(self) -> dict[str, set]:
+        """Trigram -> base vocabulary terms containing it (for typo expansion)."""
+        if self._grams is None:
+            self._grams = {} if self._rebuilding else self._read(self.grams_path, {})
+        return self._grams
+
+    def save(self) -> None:
+        """Persist whatever changed: delta, manifest, and after a merge the base shards and grams."""
+        if not self._changed:
+            return
+        try:
+            self.postings_dir.mkdir(parents=True, exist_ok=True)
+            self.sections_dir.mkdir(parents=True, exist_ok=True)
+            for key in self._dirty_postings:
+                self._write(self.postings_dir / f"{key}.marshal", self._postings[key])
+            for number in self._dirty_sections:
+                self._write(self.sections_dir / f"{number:02d}.marshal", self._sections[number])
+            if self._vocab_changed:
+                self._write(self.grams_path, self._grams)
+            if self._delta is not None:
+                self._write(self.delta_path, self._delta)
+            if self._stale_terms is not None:
+                self._write(self.stale_path, self._stale_terms)
+            self._write(self.manifest_path, self.manifest)
+            self._loaded = atomic_io.fingerprint(self.manifest_path)
+            if self._rebuilding:
+                # The single-file corpus of the previous version
+                (self.rank_dir / "corpus.marshal").unlink(missing_ok=True)
+        except OSError:
+            # Read-only tenant; ranking still works, just rebuilt per process
+            pass
+        self._dirty_postings.clear()
+        self._dirty_sections.clear()
+        self._vocab_changed.clear()
+        self._changed = False
+
+    # -- maintenance -----------------------------------------------------
+
+    def _mark_stale(self, rel: str, entry: dict | None) -> None:
+        """The base shards' postings for rel are out of date; mask them until the next merge."""
+        if entry is None or entry["delta"] or rel in self.manifest["stale"]:
+            return
+        bucket, _ = self._bucket(rel)
+        self.stale_terms[rel] = (bucket.get(rel) or {}).get("terms", [])
+        self.manifest["stale"].add(rel)
+
+    def _drop(self, rel: str) -> None:
+        entry = self.manifest["files"].pop(rel, None)
+        if entry is None:
+            return
+        self._mark_stale(rel, entry)
+        if entry["delta"]:
+            self.delta.pop(rel, None)
+            self.manifest["delta_sections"] -= entry["count"]
+        bucket, number = self._bucket(rel)
+        bucket.pop(rel, None)
+        self._dirty_sections.add(number)
+        self._lengths.pop(rel, None)
+        self._changed = True
+
+    def _add(self, rel: str, stat: os.stat_result, sections: list[tuple]) -> None:
+        """Index a (new or changed) file into the delta."""
+        lengths = array("f")
+        columns: dict[str, tuple[array, array]] = {}
+        for i, (_, _, _, _, counts, length) in enumerate(sections):
+            lengths.append(length)
+            for term, count in counts.items():
+                column = columns.get(term)
+                if column is None:
+                    column = columns[term] = (array("I"), array("I"))
+                column[0].append(i)
+                column[1].append(count)
+
+        self.delta[rel] = {term: (ids.tobytes(), tfs.tobytes()) for term, (ids, tfs) in columns.items()}
+        self.manifest["delta_sections"] += len(lengths)
+
+        bucket, number = self._bucket(rel)
+        bucket[rel] = {
+            "terms": sorted(columns),
+            "sections": [(kind, locator, line, text) for kind, locator, line, text, _, _ in sections],
+        }
+        self._dirty_sections.add(number)
+
+        self.manifest["files"][rel] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "count": len(lengths),
+            "total": sum(lengths),
+            "lengths": lengths.tobytes(),
+            "delta": True,
+        }
+        self._changed = True
+
+    def merge(self) -> None:
+        """Fold the delta into the base shards and drop the stale files' old postings."""
+        for rel, terms in self.stale_terms.items():
+            for term in terms:
+                key = shard_key(term)
+                shard = self._shard(key)
+                files = shard.get(term)
+                if files is None or rel not in files:
+                    continue
+                del files[rel]
+                if not files:
+                    del shard[term]
+                    self._vocab_changed.add(term)
+                self._dirty_postings.add(key)
+
+        for rel, columns in self.delta.items():
+            for term, posting in columns.items():
+                key = shard_key(term)
+                shard = self._shard(key)
+                if term not in shard:
+                    shard[term] = {}
+                    self._vocab_changed.add(term)
+                shard[term][rel] = posting
+                self._dirty_postings.add(key)
+            self.manifest["files"][rel]["delta"] = False
+
+        grams = self.grams()
+        for term in self._vocab_changed:
+            if not term.isalpha():
+                continue
+            present = term in self._shard(shard_key(term))
+            for gram in trigrams(term):
+                terms = grams.get(gram)
+                if present:
+                    if terms is None:
+                        grams[gram] = {term}
+                    else:
+                        terms.add(term)
+                elif terms is not None:
+                    terms.discard(term)
+                    if not terms:
+                        del grams[gram]
+
+        self._delta = {}
+        self._stale_terms = {}
+        self.manifest["stale"] = set()
+        self.manifest["delta_sections"] = 0
+        self._changed = True
+
+    def refresh(self) -> None:
+        """Bring every root up to date, re-indexing only the files that changed."""
+        with self._locked():
+            files = self.manifest["files"]
+            seen = set()
+
+            for root in self.roots:
+                root_path = Path(root)
+                if not root_path.is_dir():
+                    continue
+                for file_path in root_path.rglob("*.md"):
+                    rel = file_path.as_posix()
+                    seen.add(rel)
+                    try:
+                        stat = file_path.stat()
+                    except OSError:
+                        continue
+                    entry = files.get(rel)
+                    if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                        continue
+                    try:
+                        sections = section_file(file_path)
+                    except (OSError, UnicodeDecodeError):
+                        sections = []
+                    self._drop(rel)
+                    self._add(rel, stat, sections)
+
+            for rel in [r for r in files if r not in seen]:
+                self._drop(rel)
+
+            if self.manifest["delta_sections"] > MERGE_SECTIONS or len(self.manifest["stale"]) > MERGE_FILES:
+                self.merge()
+            self.save()
+
+    # -- queries ---------------------------------------------------------
+
+    def postings(self, term: str) -> dict:
+        """Current postings of a term: base (minus stale files) and delta."""
+        stale = self.manifest["stale"]
+        base = self._shard(shard_key(term)).get(term, {})
+        current = {rel: posting for rel, posting in base.items() if rel not in stale} if stale else dict(base)
+        for rel, columns in self.delta.items():
+            if term in columns:
+                current[rel] = columns[term]
+        return current
+
+    def expand(self, term: str, grams: dict) -> list[tuple[str, float]]:
+        """Vocabulary terms close to an unknown term, with their similarity."""
+        if not term.isalpha() or len(term) < 3:
+            return []
+
+        wanted = trigrams(term)
+        shared: dict[str, int] = {}
+        for gram in wanted:
+            for candidate in grams.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        # Terms only the delta has aren't in the grams yet
+        for candidate in {t for columns in self.delta.values() for t in columns if t.isalpha()} - shared.keys():
+            overlap = len(wanted & trigrams(candidate))
+            if overlap:
+                shared[candidate] = overlap
+
+        scored = []
+        for candidate, overlap in shared.items():
+            similarity = overlap / (len(wanted) + len(trigrams(candidate)) - overlap)
+            if similarity >= FUZZY_THRESHOLD:
+                scored.append((similarity, candidate))
+
+        # Best first, skipping terms only stale files still have
+        expansions = []
+        for similarity, candidate in sorted(scored, reverse=True):
+            if len(expansions) == FUZZY_EXPANSIONS:
+                break
+            if self.postings(candidate):
+                expansions.append((candidate, similarity))
+        return expansions
+
+    def _file_lengths(self, rel: str) -> array:
+        lengths = self._lengths.get(rel)
+        if lengths is None:
+            lengths = self._lengths[rel] = array("f")
+            lengths.frombytes(self.manifest["files"][rel]["lengths"])
+        return lengths
+
+    def search(self, query: str, limit: int = 10, prefixes: list[str] | None = None) -> dict:
+        """
+        Top sections for query, best first.
+
+        prefixes limits results to files under those paths. Returns
+        {"hits": [...], "expansions": {typo: [terms]}, "sections": N}.
+        """
+        files = self.manifest["files"]
+        n = sum(entry["count"] for entry in files.values())
+        result = {"hits": [], "expansions": {}, "sections": n}
+        if not n:
+            return result
+
+        # Resolve query terms, expanding unknown ones by trigram similarity
+        weighted: dict[str, float] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            if self.postings(term):
+                weighted[term] = max(weighted.get(term, 0.0), 1.0)
+                continue
+            expansions = self.expand(term, self.grams())
+            if expansions:
+                result["expansions"][term] = [candidate for candidate, _ in expansions]
+            for candidate, similarity in expansions:
+                weighted[candidate] = max(weighted.get(candidate, 0.0), similarity)
+
+        if not weighted:
+            return result
+
+        avgdl = sum(entry["total"] for entry in files.values()) / n
+        allowed: dict[str, bool] = {}
+
+        # Score = sum over terms of idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len / avgdl))
+        scores: dict[tuple[str, int], float] = {}
+        for term, weight in weighted.items():
+            postings = self.postings(term)
+            df = sum(len(ids) for ids, _ in postings.values()) // 4
+            idf = weight * math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for rel, (id_bytes, tf_bytes) in postings.items():
+                if prefixes:
+                    if rel not in allowed:
+                        allowed[rel] = any(rel == p or rel.startswith(p + "/") for p in prefixes)
+                    if not allowed[rel]:
+                        continue
+                ids = array("I")
+                tfs = array("I")
+                ids.frombytes(id_bytes)
+                tfs.frombytes(tf_bytes)
+                lengths = self._file_lengths(rel)
+                for i, tf in zip(ids, tfs):
+                    norm = K1 * (1 - B + B * lengths[i] / avgdl)
+                    key = (rel, i)
+                    scores[key] = scores.get(key, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+
+        matched = set(weighted)
+        # Best first; ties in file and section order
+        for (rel, i), score in heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0])):
+            kind, locator, line, text = self._bucket(rel)[0][rel]["sections"][i]
+            hit = {"file": rel, "type": kind, "score": round(score, 4)}
+            if kind == "data":
+                hit["path"] = locator
+            else:
+                hit["section"] = locator
+                hit["line"] = line
+            hit["snippet"] = snippet(text, matched)
+            result["hits"].append(hit)
+
+        return result
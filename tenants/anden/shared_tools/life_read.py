@@ -6,9 +6,14 @@ Input JSON:
 {
     "file": "identity|boundaries|patterns|contacts|business|procedures|people|questions",
     "query": "optional search term",
-    "path": "optional.dot.path.to.field"
+    "path": "optional.dot.path.to.field",
+    "paths": ["optional", "list.of.paths"]
 }
 
+With "path", data is that field's value. With "paths", data is
+{path: value} for each path. Either way only the frontmatter header is
+read; the markdown body is never loaded.
+
 Output JSON:
 {
     "status": "success",
@@ -26,231 +31,22 @@ Frontmatter format:
 
 import sys
 import json
-import re
 from pathlib import Path
-from datetime import datetime
 
-# Add parent directory to path for schema imports
+# Add parent directory to path for shared life store imports
 sys.path.insert(0, str(Path(__file__).parent))
-from schemas.life_schemas import get_default_data, get_schema
-
-
-def get_life_file_path(file_name: str) -> Path:
-    """Get the full path to a life/identity/knowledge file."""
-    # V2 structure directories
-    identity_dir = Path("identity")
-    knowledge_dir = Path("knowledge")
-    relationships_dir = Path("relationships")
-
-    # V1 legacy directory (for backward compatibility)
-    life_dir = Path("life")
-
-    # Map short names to full paths - V2 structure first, V1 fallback
-    file_map = {
-        # V2 identity/ files
-        "profile": identity_dir / "profile.md",
-        "voice": identity_dir / "voice.md",
-        # V2 knowledge/ files
-        "services": knowledge_dir / "services.md",
-        "pricing": knowledge_dir / "pricing.md",
-        "faqs": knowledge_dir / "faqs.md",
-        "policies": knowledge_dir / "policies.md",
-        # V2 relationships/ (folder-based)
-        "clients": relationships_dir / "clients",
-        "prospects": relationships_dir / "prospects",
-        "contacts": relationships_dir / "contacts",
-
-        # V1 legacy mappings (backward compatibility)
-        "identity": identity_dir / "profile.md",  # V1 identity → V2 profile
-        "boundaries": life_dir / "boundaries.md",
-        "patterns": life_dir / "patterns.md",
-        "questions": life_dir / "questions.md",
-        "business": knowledge_dir / "services.md",  # V1 business → V2 services
-        "procedures": knowledge_dir / "policies.md",  # V1 procedures → V2 policies
-        "people": relationships_dir / "contacts",  # V1 people → V2 contacts folder
-        "relationships": relationships_dir / "contacts",
-    }
-
-    # If it's a known short name, use the mapping
-    if file_name in file_map:
-        return file_map[file_name]
-
-    # Check if it's a path starting with known directories
-    for prefix in ["identity/", "knowledge/", "relationships/", "operations/", "timeline/", "data/"]:
-        if file_name.startswith(prefix):
-            return Path(file_name)
-
-    # Legacy: treat as relative path within life/ (V1 compatibility)
-    if not file_name.startswith("life/"):
-        return life_dir / file_name
-
-    return Path(file_name)
-
-
-def parse_frontmatter(content: str) -> tuple[dict, str]:
-    """
-    Parse JSON frontmatter from markdown content.
-
-    Returns (data_dict, markdown_content).
-    If no frontmatter, returns (empty_dict, original_content).
-    """
-    # Pattern for JSON frontmatter: ---json\n{...}\n---
-    pattern = r'^---json\s*\n(.*?)\n---\s*\n?(.*)$'
-    match = re.match(pattern, content, re.DOTALL)
-
-    if match:
-        try:
-            json_str = match.group(1)
-            data = json.loads(json_str)
-            markdown = match.group(2)
-            return data, markdown
-        except json.JSONDecodeError:
-            # Invalid JSON, return as markdown only
-            return {}, content
-
-    # No frontmatter found
-    return {}, content
-
-
-def get_nested_value(data: dict, path: str):
-    """Get a value from nested dict using dot notation path."""
-    if not path:
-        return data
-
-    keys = path.split(".")
-    current = data
-
-    for key in keys:
-        if isinstance(current, dict) and key in current:
-            current = current[key]
-        elif isinstance(current, list):
-            try:
-                index = int(key)
-                current = current[index]
-            except (ValueError, IndexError):
-                return None
-        else:
-            return None
-
-    return current
-
-
-def search_content(data: dict, markdown: str, query: str) -> list[dict]:
-    """
-    Search for query in both structured data and markdown.
-    Returns list of matches with context.
-    """
-    results = []
-    query_lower = query.lower()
-
-    # Search in structured data
-    def search_dict(obj, path=""):
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                new_path = f"{path}.{key}" if path else key
-                search_dict(value, new_path)
-        elif isinstance(obj, list):
-            for i, item in enumerate(obj):
-                new_path = f"{path}[{i}]"
-                search_dict(item, new_path)
-        elif isinstance(obj, str) and query_lower in obj.lower():
-            results.append({
-                "type": "data",
-                "path": path,
-                "value": obj,
-                "match": query
-            })
-
-    search_dict(data)
-
-    # Search in markdown
-    lines = markdown.split("\n")
-    for i, line in enumerate(lines):
-        if query_lower in line.lower():
-            results.append({
-                "type": "markdown",
-                "line": i + 1,
-                "content": line.strip(),
-                "match": query
-            })
-
-    return results
+import life_store
 
 
 def main():
     try:
         input_data = json.loads(sys.stdin.read())
 
-        file_name = input_data.get("file")
-        query = input_data.get("query")
-        path = input_data.get("path")
-
-        if not file_name:
-            raise ValueError("Missing required field: file")
-
-        file_path = get_life_file_path(file_name)
-
-        # Check if file exists
-        if not file_path.exists():
-            # Return default empty data for this file type
-            default_data = get_default_data(file_name)
-            result = {
-                "status": "success",
-                "data": default_data,
-                "markdown": "",
-                "file_path": str(file_path),
-                "exists": False
-            }
-            print(json.dumps(result))
-            return
-
-        # Read and parse file
-        content = file_path.read_text(encoding="utf-8")
-        data, markdown = parse_frontmatter(content)
-
-        # If no structured data found, use defaults
-        if not data:
-            data = get_default_data(file_name)
-
-        # Handle path query (get specific field)
-        if path:
-            value = get_nested_value(data, path)
-            result = {
-                "status": "success",
-                "data": value,
-                "path": path,
-                "file_path": str(file_path),
-                "exists": True
-            }
-            print(json.dumps(result))
-            return
-
-        # Handle search query
-        if query:
-            matches = search_content(data, markdown, query)
-            result = {
-                "status": "success",
-                "data": data,
-                "markdown": markdown,
-                "file_path": str(file_path),
-                "exists": True,
-                "search": {
-                    "query": query,
-                    "matches": matches,
-                    "total": len(matches)
-                }
-            }
-            print(json.dumps(result))
-            return
-
-        # Default: return full content
-        result = {
-            "status": "success",
-            "data": data,
-            "markdown": markdown,
-            "file_path": str(file_path),
-            "exists": True
-        }
+        result = life_store.read(
+            input_data.get("file"),
+            query=input_data.get("query"),
+            path=input_data.get("paths") or input_data.get("path")
+        )
         print(json.dumps(result))
 
     except Exception as e:
@@ -36,6 +36,11 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 import subprocess
 
+# Add parent directory to path for shared life store imports
+sys.path.insert(0, str(Path(__file__).parent))
+import life_store
+import life_semantic
+
 
 def load_context_map() -> Dict:
     """Load the context_map.json file."""
@@ -114,6 +119,33 @@ If no pattern is a good match (confidence < 0.3), return null for matched_patter
         raise RuntimeError(f"Failed to perform semantic pattern matching: {str(e)}. Ensure ANTHROPIC_API_KEY is set.")
 
 
+def local_pattern_match(task: str, context_map: Dict, threshold: float = 0.15) -> Optional[tuple]:
+    """
+    Match task to pattern offline by embedding similarity (see life_semantic.py).
+    Returns (pattern_key, confidence, reasoning) or None.
+    """
+    patterns = context_map.get("task_patterns", {})
+    if not patterns:
+        return None
+
+    embedder = life_semantic.get_embedder()
+    texts = [
+        f"{key.replace('_', ' ')} {data.get('description', '')} {' '.join(data.get('workflows', []))}"
+        for key, data in patterns.items()
+    ]
+    task_vector = embedder.embed([task])[0]
+    scores = [life_semantic.dot(task_vector, vector) for vector in embedder.embed(texts)]
+
+    best = max(range(len(scores)), key=scores.__getitem__)
+    if scores[best] < threshold:
+        return None
+    return (
+        list(patterns)[best],
+        scores[best],
+        f"Offline match ({embedder.name}): closest pattern description to the task"
+    )
+
+
 def load_workflow_file(workflow_name: str) -> Optional[str]:
     """Load a workflow markdown file content."""
     workflow_path = Path(f"operations/workflows/{workflow_name}.md")
@@ -126,7 +158,7 @@ def load_workflow_file(workflow_name: str) -> Optional[str]:
 
 
 def load_memory_data(memory_keys: List[str]) -> Dict:
-    """Load memory data using the recall.py tool."""
+    """Load memory data in-process through the shared life_store module."""
     memory_data = {}
 
     for key in memory_keys:
@@ -136,19 +168,13 @@ def load_memory_data(memory_keys: List[str]) -> Dict:
         else:
             file_key = key
 
-        try:
-            result = subprocess.run(
-                [sys.executable, "shared_tools/recall.py"],
-                input=json.dumps({"file": file_key}),
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+        if file_key in memory_data:
+            continue
 
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                if data.get("status") == "success":
-                    memory_data[file_key] = data.get("data", {})
+        try:
+            data = life_store.read(file_key)
+            if data.get("status") == "success":
+                memory_data[file_key] = data.get("data", {})
         except Exception:
             pass
 
@@ -219,7 +245,11 @@ def main():
         pattern_data = {}
 
         if task:
-            match_result = semantic_pattern_match(task, context_map)
+            try:
+                match_result = semantic_pattern_match(task, context_map)
+            except RuntimeError:
+                # No API key or the call failed: match on the same descriptions offline
+                match_result = local_pattern_match(task, context_map)
             if match_result:
                 matched_pattern, confidence, reasoning = match_result
                 pattern_data = context_map["task_patterns"].get(matched_pattern, {})
@@ -38,6 +38,10 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 import subprocess
 
+# Add parent directory to path for shared life store imports
+sys.path.insert(0, str(Path(__file__).parent))
+import life_store
+
 
 def load_context_map() -> Dict:
     """Load the context_map.json file."""
@@ -100,7 +104,7 @@ def load_workflow_file(workflow_name: str) -> Optional[str]:
 
 
 def load_memory_data(memory_keys: List[str]) -> Dict:
-    """Load memory data using the recall.py tool."""
+    """Load memory data in-process through the shared life_store module."""
     memory_data = {}
 
     for key in memory_keys:
@@ -110,19 +114,13 @@ def load_memory_data(memory_keys: List[str]) -> Dict:
         else:
             file_key = key
 
-        try:
-            result = subprocess.run(
-                [sys.executable, "shared_tools/recall.py"],
-                input=json.dumps({"file": file_key}),
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+        if file_key in memory_data:
+            continue
 
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                if data.get("status") == "success":
-                    memory_data[file_key] = data.get("data", {})
+        try:
+            data = life_store.read(file_key)
+            if data.get("status") == "success":
+                memory_data[file_key] = data.get("data", {})
         except Exception as e:
             # Silently skip failed memory loads
             pass
@@ -2,7 +2,9 @@
 """
 log_decision.py - Log a decision to the tenant's history/decisions.log file.
 
-This is an append-only log for audit purposes.
+This is an append-only log for audit purposes. Old entries are rotated
+into gzipped, summarised segments under history/decisions/ (see
+decision_log.py) and can be searched with query_decisions.py.
 
 Input JSON:
 {
@@ -20,11 +22,11 @@ Output JSON:
 
 import sys
 import json
-from datetime import datetime
 from pathlib import Path
 
-
-VALID_CATEGORIES = ["ACTION", "ESCALATION", "BOUNDARY", "STATE_CHANGE"]
+# Add this directory to path for the shared decision log
+sys.path.insert(0, str(Path(__file__).parent))
+from decision_log import DECISIONS_LOG, VALID_CATEGORIES, append_decision
 
 
 def main():
@@ -42,33 +44,12 @@ def main():
         if category not in VALID_CATEGORIES:
             raise ValueError(f"Invalid category: {category}. Must be one of: {', '.join(VALID_CATEGORIES)}")
 
-        # Ensure history directory exists
-        history_dir = Path("history")
-        history_dir.mkdir(parents=True, exist_ok=True)
-
-        file_path = history_dir / "decisions.log"
-
-        # Create file with header if it doesn't exist
-        if not file_path.exists():
-            header = """# Decision Log
-# Format: [TIMESTAMP] [CATEGORY] Decision description
-# Categories: ACTION, ESCALATION, BOUNDARY, STATE_CHANGE
-
-"""
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(header)
-
-        # Format the log entry
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        entry = f"[{timestamp}] [{category}] {description}\n"
-
-        # Append to log
-        with open(file_path, "a", encoding="utf-8") as f:
-            f.write(entry)
+        # Rotates the log first if it's too big or from an earlier month
+        append_decision(category, description)
 
         result = {
             "status": "success",
-            "file": str(file_path),
+            "file": str(DECISIONS_LOG),
             "message": "Decision logged successfully"
         }
         print(json.dumps(result))
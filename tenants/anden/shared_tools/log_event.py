@@ -2,7 +2,9 @@
 """
 log_event.py - Log an event to the tenant's life/events/ folder.
 
-Events are stored in monthly files (e.g., 2025-12.md).
+Events are stored in monthly files (e.g., 2025-12.md), with a structured
+JSONL record of each event next to them (2025-12.jsonl) for indexed reads
+(see life_events.py).
 
 Input JSON:
 {
@@ -23,6 +25,10 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+# Add this directory to path for the shared events log
+sys.path.insert(0, str(Path(__file__).parent))
+from life_events import append_event
+
 
 def get_importance_marker(importance: str) -> str:
     """Get a visual marker for importance level."""
@@ -60,6 +66,10 @@ def main():
         marker = get_importance_marker(importance)
         entry = f"\n{marker} **{timestamp}** - {event}\n"
 
+        # Structured record first, so a backfill from the markdown can't
+        # pick this event up a second time
+        append_event(event, importance, now, events_dir)
+
         # Check if file exists, create header if new
         if not file_path.exists():
             header = f"# Events - {now.strftime('%B %Y')}\n"
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+timeline_archive.py - Columnar monthly archive of closed timeline days.
+
+Answering "how many TOOL events per day last quarter" from the journals
+means parsing every day file in the range. This module rolls closed days
+(anything before today) into one columnar file per month, built from the
+day sidecar indexes in timeline_index.py:
+
+    day      uint8   day of month
+    second   uint32  seconds since midnight
+    type     uint8   code into the file's "types" list
+    offset   uint32  byte offset of the event in its day file
+    length   uint32  byte length of the event
+    headers  list    header text, one per row
+
+Rows are sorted by (day, second). Aggregates slice the columns by day
+range with a binary search and count with map()/Counter over the packed
+arrays, so a query never touches the markdown. offset and length let a
+caller seek to any archived event's content.
+
+Layout (relative to the tenant folder):
+    state/.index/timeline/archive/YYYY-MM.marshal
+
+Compaction is incremental: a month is rewritten only when one of its closed
+days is missing from the archive or its (mtime_ns, size) changed. Days that
+are still open (today, or later) are aggregated live from their sidecar.
+The journals themselves are never modified.
+
+Input JSON (compaction job):
+{
+    "before": "2026-01-08"  // optional - compact days before this date (default: today)
+}
+
+Output JSON:
+{
+    "status": "success",
+    "months": {"2026-01": {"days": 2, "events": 41, "rewritten": true}}
+}
+"""
+
+import sys
+import os
+import json
+import marshal
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import date, timedelta
+from itertools import compress, repeat
+from operator import eq, floordiv
+from pathlib import Path
+
+# Add this directory to path for the shared timeline index
+sys.path.insert(0, str(Path(__file__).parent))
+from timeline_index import DayIndex, TIMELINE_DIR, TIMELINE_INDEX_DIR, OFFSET, LENGTH, TIME, TYPE
+
+
+ARCHIVE_VERSION = 1
+ARCHIVE_DIR = TIMELINE_INDEX_DIR / "archive"
+
+GROUP_KEYS = ("type", "hour", "day")
+
+COLUMN_TYPES = {"day": "B", "second": "I", "type": "B", "offset": "I", "length": "I"}
+
+
+def to_seconds(time_str: str) -> int:
+    hours, minutes, seconds = time_str.split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def day_files(month: str, timeline_dir: Path = TIMELINE_DIR) -> list[Path]:
+    """Day files of a YYYY-MM month, in date order."""
+    return sorted(Path(timeline_dir).glob(f"{month}-[0-3][0-9].md"))
+
+
+class MonthArchive:
+    """One month's columns, loaded from or compacted into its archive file."""
+
+    def __init__(self, month: str, archive_dir: Path = ARCHIVE_DIR):
+        self.month = month
+        self.path = Path(archive_dir) / f"{month}.marshal"
+        self.data = self._load()
+
+    def _load(self) -> dict:
+        try:
+            data = marshal.loads(self.path.read_bytes())
+            if data.get("version") == ARCHIVE_VERSION:
+                return data
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        return {"version": ARCHIVE_VERSION, "month": self.month, "days": {}, "types": [], "columns": None, "headers": []}
+
+    def column(self, name: str) -> array:
+        values = array(COLUMN_TYPES[name])
+        if self.data["columns"]:
+            values.frombytes(self.data["columns"][name])
+        return values
+
+    @property
+    def rows(self) -> int:
+        return len(self.data["headers"])
+
+    # -- compaction ------------------------------------------------------
+
+    def is_current(self, days: dict) -> bool:
+        return self.data["days"] == days
+
+    def compact(self, paths: list[Path]) -> bool:
+        """Rebuild from the given closed day files if any changed. Returns True if rewritten."""
+        days = {}
+        for path in paths:
+            stat = path.stat()
+            days[path.stem] = [stat.st_mtime_ns, stat.st_size]
+        if self.is_current(days):
+            return False
+
+        columns = {name: array(code) for name, code in COLUMN_TYPES.items()}
+        headers = []
+        types: list[str] = []
+        codes: dict[str, int] = {}
+
+        for path in paths:
+            day = DayIndex(path.stem, timeline_dir=path.parent)
+            day.refresh()
+            entries = sorted(day.entries, key=lambda e: e[TIME])
+            with open(path, "rb") as f:
+                for entry in entries:
+                    if entry[TYPE] not in codes:
+                        codes[entry[TYPE]] = len(types)
+                        types.append(entry[TYPE])
+                    f.seek(entry[OFFSET])
+                    line = f.readline().decode("utf-8", errors="replace").rstrip("\r\n")
+                    columns["day"].append(int(path.stem[-2:]))
+                    columns["second"].append(to_seconds(entry[TIME]))
+                    columns["type"].append(codes[entry[TYPE]])
+                    columns["offset"].append(entry[OFFSET])
+                    columns["length"].append(entry[LENGTH])
+                    headers.append(line.split("] ", 1)[-1])
+
+        self.data = {
+            "version": ARCHIVE_VERSION,
+            "month": self.month,
+            "days": days,
+            "types": types,
+            "columns": {name: values.tobytes() for name, values in columns.items()},
+            "headers": headers,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(marshal.dumps(self.data))
+        os.replace(tmp_path, self.path)
+        return True
+
+    # -- aggregates ------------------------------------------------------
+
+    def count(self, first_day: int, last_day: int, event_type: str | None, group_by: list[str]) -> Counter:
+        """Counter of group tuples for rows with first_day <= day <= last_day."""
+        if not self.rows:
+            return Counter()
+
+        day = self.column("day")
+        lo, hi = bisect_left(day, first_day), bisect_right(day, last_day)
+        types = self.data["types"]
+        keep = None
+        if event_type:
+            if event_type not in types:
+                return Counter()
+            keep = list(map(eq, self.column("type")[lo:hi], repeat(types.index(event_type))))
+
+        if not group_by:
+            return Counter({(): sum(keep) if keep is not None else hi - lo})
+
+        keys = {}
+        if "type" in group_by:
+            keys["type"] = map(types.__getitem__, self.column("type")[lo:hi])
+        if "hour" in group_by:
+            keys["hour"] = map(floordiv, self.column("second")[lo:hi], repeat(3600))
+        if "day" in group_by:
+            keys["day"] = map(f"{self.month}-{{:02d}}".format, day[lo:hi])
+
+        rows = zip(*(keys[name] for name in group_by))
+        return Counter(compress(rows, keep) if keep is not None else rows)
+
+
+def live_count(day: DayIndex, event_type: str | None, group_by: list[str]) -> Counter:
+    """Same counts as MonthArchive.count, for a day that isn't archived."""
+    day.refresh()
+    counts = Counter()
+    for entry in day.entries:
+        if event_type and entry[TYPE] != event_type:
+            continue
+        values = {"type": entry[TYPE], "hour": int(entry[TIME][:2]), "day": day.date}
+        counts[tuple(values[name] for name in group_by)] += 1
+    return counts
+
+
+def compact(before: date | None = None, timeline_dir: Path = TIMELINE_DIR, archive_dir: Path = ARCHIVE_DIR) -> dict:
+    """Roll every closed day (before `before`, default today) into monthly archives."""
+    before = before or date.today()
+    closed = before.isoformat()
+    months: dict[str, list[Path]] = {}
+    for path in sorted(Path(timeline_dir).glob("[0-9][0-9][0-9][0-9]-[0-1][0-9]-[0-3][0-9].md")):
+        if path.stem < closed:
+            months.setdefault(path.stem[:7], []).append(path)
+
+    summary = {}
+    for month, paths in months.items():
+        archive = MonthArchive(month, archive_dir)
+        rewritten = archive.compact(paths)
+        summary[month] = {"days": len(paths), "events": archive.rows, "rewritten": rewritten}
+    return summary
+
+
+def aggregate(start: date, end: date, event_type: str | None = None, group_by: list[str] | None = None,
+              timeline_dir: Path = TIMELINE_DIR, archive_dir: Path = ARCHIVE_DIR) -> dict:
+    """
+    Count events between start and end (inclusive), optionally grouped.
+
+    Closed days are compacted first (a no-op when the archive is current)
+    and answered from the columns; open days are counted from their sidecar.
+    """
+    group_by = group_by or []
+    unknown = [key for key in group_by if key not in GROUP_KEYS]
+    if unknown:
+        raise ValueError(f"Unknown group_by key(s): {', '.join(unknown)} (expected type, hour or day)")
+
+    today = date.today()
+    counts = Counter()
+
+    month_start = start.replace(day=1)
+    while month_start <= end:
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        month = month_start.strftime("%Y-%m")
+        first = max(start, month_start)
+        last = min(end, next_month - timedelta(days=1))
+
+        closed = [p for p in day_files(month, timeline_dir) if p.stem < today.isoformat()]
+        if first < today and closed:
+            archive = MonthArchive(month, archive_dir)
+            try:
+                archive.compact(closed)
+            except OSError:
+                # Read-only tenant: count from the (rebuilt in memory) columns anyway
+                pass
+            counts += archive.count(first.day, min(last, today - timedelta(days=1)).day, event_type, group_by)
+
+        current = max(first, today)
+        while current <= last:
+            counts += live_count(DayIndex(current.isoformat(), timeline_dir=timeline_dir), event_type, group_by)
+            current += timedelta(days=1)
+
+        month_start = next_month
+
+    groups = [
+        {**dict(zip(group_by, key)), "count": count}
+        for key, count in sorted(counts.items())
+    ]
+    return {
+        "count": sum(counts.values()),
+        "group_by": group_by,
+        "groups": groups if group_by else []
+    }
+
+
+def main():
+    try:
+        raw = sys.stdin.read().strip()
+        input_data = json.loads(raw) if raw else {}
+        before = date.fromisoformat(input_data["before"]) if "before" in input_data else None
+
+        print(json.dumps({
+            "status": "success",
+            "months": compact(before)
+        }))
+
+    except Exception as e:
+        error_result = {
+            "status": "error",
+            "message": str(e)
+        }
+        print(json.dumps(error_result))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+timeline_digest.py - Incrementally maintained per-day rollup of a timeline.
+
+"Summarise my day" needs counts, not the journal. Each day gets a digest:
+
+    events              total events
+    by_type             {"MESSAGE": 120, "TOOL": 31, ...}
+    messages            inbound / outbound counts, first and last message time
+    counterparties      per masked phone ("***1678"): inbound / outbound counts
+    tools               per tool: calls, failures, total duration (ms)
+
+built from event header lines only (TimelineService writes everything the
+digest needs there). The digest remembers the journal size it covers and
+the offset and header hash of the last event it counted, so:
+- an unchanged day costs one stat(): the stored digest is returned as is
+- an appended-to day reads from its last counted event onwards and folds in
+  only the new events
+- a day whose last counted event moved or changed is rebuilt
+
+Layout (relative to the tenant folder):
+    state/.index/timeline/digest/YYYY-MM-DD.json
+
+Input JSON:
+{
+    "date": "2026-01-08",     // optional - defaults to today
+    "top": 5                  // optional - counterparties and tools to list (default 5)
+}
+
+Output JSON:
+{
+    "status": "success",
+    "digest": {
+        "date": "2026-01-08",
+        "events": 151,
+        "by_type": {"MESSAGE": 120, "TOOL": 31},
+        "messages": {"inbound": 60, "outbound": 60, "first": "08:02:11", "last": "22:41:07"},
+        "counterparties": [{"party": "***1678", "inbound": 40, "outbound": 41, "total": 81}],
+        "tools": [{"tool": "recall", "calls": 12, "failures": 1, "avg_ms": 240}]
+    }
+}
+"""
+
+import sys
+import os
+import json
+import re
+from datetime import date
+from pathlib import Path
+
+# Add this directory to path for the shared timeline index
+sys.path.insert(0, str(Path(__file__).parent))
+import atomic_io
+from timeline_index import TIMELINE_DIR, TIMELINE_INDEX_DIR, EVENT_HEADER, OFFSET, HASH, scan_events
+
+
+DIGEST_VERSION = 1
+DIGEST_DIR = TIMELINE_INDEX_DIR / "digest"
+
+MESSAGE_HEADER = re.compile(r"^(Inbound from|Outbound to) (.+)$")
+TOOL_HEADER = re.compile(r"^(\S+) \((success|failure), (\d+)ms\)$")
+
+
+def mask_party(phone: str) -> str:
+    """The "***1234" form TimelineService logs; anything else is kept as is."""
+    phone = phone.strip()
+    if phone.startswith("*"):
+        return phone
+    digits = "".join(c for c in phone if c.isdigit())
+    return f"***{digits[-4:]}" if len(digits) >= 4 else phone
+
+
+def empty_digest(date_str: str) -> dict:
+    return {
+        "version": DIGEST_VERSION,
+        "date": date_str,
+        "size": 0,
+        "last": None,
+        "events": 0,
+        "by_type": {},
+        "messages": {"inbound": 0, "outbound": 0, "first": None, "last": None},
+        "counterparties": {},
+        "tools": {},
+    }
+
+
+def fold_event(digest: dict, time_str: str, event_type: str, header: str) -> None:
+    """Add one event (from its header line) to the digest."""
+    digest["events"] += 1
+    digest["by_type"][event_type] = digest["by_type"].get(event_type, 0) + 1
+
+    if event_type == "MESSAGE":
+        match = MESSAGE_HEADER.match(header)
+        direction = "inbound" if match and match.group(1) == "Inbound from" else "outbound"
+        messages = digest["messages"]
+        messages[direction] += 1
+        messages["first"] = min(messages["first"] or time_str, time_str)
+        messages["last"] = max(messages["last"] or time_str, time_str)
+        if match:
+            party = digest["counterparties"].setdefault(mask_party(match.group(2)), [0, 0])
+            party[0 if direction == "inbound" else 1] += 1
+
+    elif event_type == "TOOL":
+        match = TOOL_HEADER.match(header)
+        name = match.group(1) if match else header.split(" ", 1)[0]
+        tool = digest["tools"].setdefault(name, [0, 0, 0])
+        tool[0] += 1
+        if match:
+            tool[1] += match.group(2) == "failure"
+            tool[2] += int(match.group(3))
+
+
+class DayDigest:
+    """The stored digest for one day file."""
+
+    def __init__(self, date_str: str, timeline_dir: Path = TIMELINE_DIR, digest_dir: Path = DIGEST_DIR):
+        self.date = date_str
+        self.path = Path(timeline_dir) / f"{date_str}.md"
+        self.digest_path = Path(digest_dir) / f"{date_str}.json"
+
+    def _load(self) -> dict:
+        try:
+            data = json.loads(self.digest_path.read_text(encoding="utf-8"))
+            if data.get("version") == DIGEST_VERSION:
+                return data
+        except (OSError, ValueError):
+            pass
+        return empty_digest(self.date)
+
+    def update(self) -> dict:
+        """The day's digest, folding in events appended since it was last built."""
+        digest = self._load()
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return empty_digest(self.date)
+
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size == digest["size"]:
+                return digest
+
+            last = digest["last"]
+            if size < digest["size"] or not last:
+                digest, start = empty_digest(self.date), 0
+            else:
+                start = last[0]
+            f.seek(start)
+            chunk = f.read()
+
+        records = scan_events(chunk, start)
+        if start:
+            if records and records[0][OFFSET] == last[0] and records[0][HASH] == last[1]:
+                # Already counted
+                records = records[1:]
+            else:
+                digest, start = empty_digest(self.date), 0
+                with open(self.path, "rb") as f:
+                    chunk = f.read()
+                records = scan_events(chunk, 0)
+
+        for record in records:
+            line_end = chunk.find(b"\n", record[OFFSET] - start)
+            line = chunk[record[OFFSET] - start:line_end if line_end >= 0 else len(chunk)]
+            match = EVENT_HEADER.match(line)
+            if match:
+                fold_event(
+                    digest,
+                    match.group(1).decode("ascii"),
+                    match.group(2).decode("ascii"),
+                    match.group(3).decode("utf-8", errors="replace"),
+                )
+        if records:
+            digest["last"] = [records[-1][OFFSET], records[-1][HASH]]
+        digest["size"] = start + len(chunk)
+
+        try:
+            self.digest_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_io.write_json(self.digest_path, digest, indent=None)
+        except OSError:
+            # Read-only tenant; the digest still serves this call
+            pass
+        return digest
+
+
+def present(digest: dict, top: int = 5) -> dict:
+    """The stored digest in tool output shape, with the top counterparties and tools."""
+    parties = sorted(digest["counterparties"].items(), key=lambda item: (-sum(item[1]), item[0]))
+    tools = sorted(digest["tools"].items(), key=lambda item: (-item[1][0], item[0]))
+    return {
+        "date": digest["date"],
+        "events": digest["events"],
+        "by_type": dict(sorted(digest["by_type"].items())),
+        "messages": digest["messages"],
+        "counterparties": [
+            {"party": party, "inbound": inbound, "outbound": outbound, "total": inbound + outbound}
+            for party, (inbound, outbound) in parties[:top]
+        ],
+        "tools": [
+            {"tool": name, "calls": calls, "failures": failures, "avg_ms": round(total_ms / calls) if calls else 0}
+            for name, (calls, failures, total_ms) in tools[:top]
+        ],
+    }
+
+
+def main():
+    try:
+        raw = sys.stdin.read().strip()
+        input_data = json.loads(raw) if raw else {}
+
+        date_str = date.fromisoformat(input_data["date"]).isoformat() if input_data.get("date") else date.today().isoformat()
+        top = int(input_data.get("top", 5))
+
+        print(json.dumps({
+            "status": "success",
+            "digest": present(DayDigest(date_str).update(), top)
+        }))
+
+    except Exception as e:
+        error_result = {
+            "status": "error",
+            "message": str(e)
+        }
+        print(json.dumps(error_result))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,30 +2,58 @@
 """
 timeline_search.py - Search timeline journals for events.
 
+Day files are read through their sidecar index (timeline_index.py), so
+type filters are answered without parsing non-matching events. Matches
+are streamed newest first and the walk stops as soon as `limit` events
+are found; older days are never opened.
+
 Input JSON:
 {
     "query": "search term",           # optional - keyword search
+    "q": "escrow NOT \"rate lock\" type:MESSAGE from:2026-01-01",
+                                      # optional - indexed query language (see timeline_fts.py)
     "date": "2026-01-06",             # optional - specific date
     "from": "2026-01-01",             # optional - date range start
     "to": "2026-01-06",               # optional - date range end
     "type": "MESSAGE|TOOL|SCHEDULED", # optional - event type filter
-    "limit": 20                       # optional - max results (default 20)
+    "limit": 20,                      # optional - max results (default 20, 0 = all)
+    "cursor": "2026-01-06|09:15:00|812", # optional - resume after a previous page
+    "exact_total": false,             # optional - skip counting every match in the range
+                                      #   (default: true; false stops at `limit`)
+    "group_by": ["type", "day"]       # optional - aggregate instead: count events,
+                                      #   grouped by any of type|hour|day ([] = total)
 }
 
 Output JSON:
 {
     "status": "success",
     "events": [...],
-    "total": 42
+    "returned": 20,
+    "has_more": true,
+    "cursor": "2026-01-05|17:02:11|4410",  # pass back to get the next page (null when done)
+    "total": 42                             # every match in the range (unless exact_total is false)
+}
+
+With group_by, the output is instead:
+{
+    "status": "success",
+    "aggregate": {"count": 42, "group_by": ["type"], "groups": [{"type": "TOOL", "count": 7}, ...]},
+    "date_range": {...}
 }
+Closed days are counted from the columnar monthly archive (timeline_archive.py).
 """
 
 import sys
 import json
-import re
 from pathlib import Path
 from datetime import datetime, timedelta
 
+# Add this directory to path for the shared timeline index
+sys.path.insert(0, str(Path(__file__).parent))
+from timeline_index import DayIndex, OFFSET, TIME, TYPE
+from timeline_archive import aggregate
+from timeline_fts import TimelineFTS, parse_query
+
 
 def parse_date(date_str: str) -> datetime:
     """Parse YYYY-MM-DD string to datetime."""
@@ -57,75 +85,87 @@ def parse_timeline_file(filepath: Path) -> list[dict]:
 
     ---
     """
-    events = []
-
-    if not filepath.exists():
-        return events
-
-    content = filepath.read_text(encoding="utf-8")
-    date_str = filepath.stem  # YYYY-MM-DD from filename
-
-    # Pattern to match event headers: ### HH:MM:SS [TYPE] description
-    event_pattern = re.compile(
-        r'^### (\d{2}:\d{2}:\d{2}) \[([A-Z]+)\] (.+?)$',
-        re.MULTILINE
-    )
-
-    # Split by separator
-    blocks = content.split("---")
-
-    for block in blocks:
-        block = block.strip()
-        if not block:
-            continue
-
-        match = event_pattern.search(block)
-        if match:
-            time_str = match.group(1)
-            event_type = match.group(2)
-            header = match.group(3)
-
-            # Get content after the header line
-            lines = block.split("\n")
-            content_lines = []
-            header_found = False
-            for line in lines:
-                if header_found and line.strip():
-                    content_lines.append(line.strip())
-                if line.startswith("###"):
-                    header_found = True
-
-            event = {
-                "date": date_str,
-                "time": time_str,
-                "type": event_type,
-                "header": header,
-                "content": "\n".join(content_lines) if content_lines else ""
-            }
-            events.append(event)
+    day = DayIndex(filepath.stem, timeline_dir=filepath.parent)
+    day.refresh()
+    return day.read_events(day.entries)
 
-    return events
 
+def matches_query(event: dict, query_lower: str | None) -> bool:
+    """Case-insensitive substring match over header and content."""
+    return not query_lower or query_lower in f"{event['header']} {event['content']}".lower()
 
-def search_events(events: list[dict], query: str | None, event_type: str | None) -> list[dict]:
-    """Filter events by query and type."""
-    results = []
 
-    for event in events:
-        # Filter by type
-        if event_type and event["type"] != event_type:
-            continue
+def make_cursor(date_str: str, entry: list) -> str:
+    return f"{date_str}|{entry[TIME]}|{entry[OFFSET]}"
 
-        # Filter by query
-        if query:
-            query_lower = query.lower()
-            searchable = f"{event['header']} {event['content']}".lower()
-            if query_lower not in searchable:
-                continue
 
-        results.append(event)
+def parse_cursor(cursor: str | None) -> tuple | None:
+    """(date, time, offset) of the last event a previous page returned."""
+    if not cursor:
+        return None
+    try:
+        date_str, time_str, offset = cursor.split("|")
+        return parse_date(date_str).date(), time_str, int(offset)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
 
-    return results
+def iter_events(timeline_dir: Path, start_date, end_date, query: str | None = None,
+                event_type: str | None = None, after: tuple | None = None, fts: TimelineFTS | None = None,
+                node: tuple | None = None):
+    """
+    Yield (event, cursor) newest first, lazily.
+
+    Days are walked from end_date back to start_date, and each event is
+    read only when the walk reaches it, so a caller that stops after N
+    results never touches older days. Within a day, events are ordered by
+    time (latest first), keeping file order for equal times. after resumes
+    strictly past a cursor from an earlier page; events appended since
+    then sort before it, so they don't shift the page boundary. With an
+    fts index and a parsed query node, only the day's indexed matches are
+    read.
+    """
+    query_lower = query.lower() if query else None
+    current = min(end_date, after[0]) if after else end_date
+
+    while current >= start_date:
+        date_str = current.strftime("%Y-%m-%d")
+        day = DayIndex(date_str, timeline_dir=timeline_dir)
+        if node is not None:
+            entries = fts.day_matches(node, current)
+        else:
+            day.refresh()
+            entries = day.entries
+
+        entries = [e for e in entries if not event_type or e[TYPE] == event_type]
+        entries.sort(key=lambda e: e[TIME], reverse=True)
+        if after and current == after[0]:
+            _, after_time, after_offset = after
+            entries = [
+                e for e in entries
+                if e[TIME] < after_time or (e[TIME] == after_time and e[OFFSET] > after_offset)
+            ]
+
+        if entries:
+            with open(day.path, "rb") as f:
+                for entry in entries:
+                    event = day.read_event(entry, f)
+                    if matches_query(event, query_lower):
+                        yield event, make_cursor(date_str, entry)
+
+        current -= timedelta(days=1)
+
+
+def count_events(timeline_dir: Path, start_date, end_date, query: str | None, event_type: str | None,
+                 fts: TimelineFTS | None = None, node: tuple | None = None) -> int:
+    """Exact number of matches in the range (ignores any cursor)."""
+    if not query and node is not None:
+        if event_type:
+            node = ("and", node, ("type", event_type))
+        return fts.count(node, start_date, end_date)
+    if not query:
+        return aggregate(start_date, end_date, event_type, timeline_dir=timeline_dir)["count"]
+    return sum(1 for _ in iter_events(timeline_dir, start_date, end_date, query, event_type, fts=fts, node=node))
 
 
 def main():
@@ -135,12 +175,45 @@ def main():
         query = input_data.get("query")
         event_type = input_data.get("type")
         limit = input_data.get("limit", 20)
+        exact_total = input_data.get("exact_total", True)
+        after = parse_cursor(input_data.get("cursor"))
+
+        # Parse the query language; its from:/to: fill in or narrow the range
+        node = None
+        if input_data.get("q"):
+            node, q_from, q_to = parse_query(input_data["q"])
+            input_data = dict(input_data)
+            for key, value in (("from", q_from), ("to", q_to)):
+                if value and "date" not in input_data:
+                    given = input_data.get(key)
+                    if given is None:
+                        input_data[key] = value.isoformat()
+                    elif key == "from":
+                        input_data[key] = max(given, value.isoformat())
+                    else:
+                        input_data[key] = min(given, value.isoformat())
 
         # Get date range
         start_date, end_date = get_date_range(input_data)
 
         # Find timeline folder
         timeline_dir = Path("timeline")
+        date_range = {
+            "from": start_date.strftime("%Y-%m-%d"),
+            "to": end_date.strftime("%Y-%m-%d")
+        }
+
+        # Aggregate mode: counts from the columnar archive, no event bodies
+        if "group_by" in input_data:
+            group_by = input_data["group_by"]
+            if isinstance(group_by, str):
+                group_by = [group_by]
+            print(json.dumps({
+                "status": "success",
+                "aggregate": aggregate(start_date, end_date, event_type, group_by, timeline_dir=timeline_dir),
+                "date_range": date_range
+            }))
+            return
 
         if not timeline_dir.exists():
             result = {
@@ -152,35 +225,29 @@ def main():
             print(json.dumps(result))
             return
 
-        # Collect all events in date range
-        all_events = []
-        current = start_date
-        while current <= end_date:
-            filename = f"{current.strftime('%Y-%m-%d')}.md"
-            filepath = timeline_dir / filename
-            events = parse_timeline_file(filepath)
-            all_events.extend(events)
-            current += timedelta(days=1)
-
-        # Search/filter events
-        filtered = search_events(all_events, query, event_type)
-
-        # Sort by date/time (most recent first)
-        filtered.sort(key=lambda e: f"{e['date']} {e['time']}", reverse=True)
+        fts = TimelineFTS(timeline_dir) if node is not None else None
 
-        # Apply limit
-        limited = filtered[:limit] if limit else filtered
+        # Stream matches newest first, stopping one past the limit
+        events = []
+        cursor = None
+        has_more = False
+        for event, position in iter_events(timeline_dir, start_date, end_date, query, event_type, after, fts, node):
+            if limit and len(events) == limit:
+                has_more = True
+                break
+            events.append(event)
+            cursor = position
 
         result = {
             "status": "success",
-            "events": limited,
-            "total": len(filtered),
-            "returned": len(limited),
-            "date_range": {
-                "from": start_date.strftime("%Y-%m-%d"),
-                "to": end_date.strftime("%Y-%m-%d")
-            }
+            "events": events,
+            "returned": len(events),
+            "has_more": has_more,
+            "cursor": cursor if has_more else None,
+            "date_range": date_range
         }
+        if exact_total:
+            result["total"] = count_events(timeline_dir, start_date, end_date, query, event_type, fts, node)
         print(json.dumps(result))
 
     except Exception as e:
@@ -28,6 +28,10 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+# Add this directory to path for shared write layer imports
+sys.path.insert(0, str(Path(__file__).parent))
+import atomic_io
+
 
 VALID_FILES = {
     "current": "current.json",
@@ -59,6 +63,40 @@ def set_nested(data: dict, path: str, value):
     data[keys[-1]] = value
 
 
+def apply_operation(data: dict, operation: str, path: str, value) -> None:
+    """Apply a set/append/remove operation to state data in place."""
+    if operation == "set":
+        set_nested(data, path, value)
+    elif operation == "append":
+        target = get_nested(data, path)
+        if not isinstance(target, list):
+            raise ValueError(f"Path '{path}' is not an array, cannot append")
+        target.append(value)
+    elif operation == "remove":
+        target = get_nested(data, path)
+        if not isinstance(target, list):
+            raise ValueError(f"Path '{path}' is not an array, cannot remove")
+        if isinstance(value, int):
+            # Remove by index
+            if 0 <= value < len(target):
+                target.pop(value)
+            else:
+                raise ValueError(f"Index {value} out of range")
+        else:
+            # Remove by value
+            if value in target:
+                target.remove(value)
+            else:
+                # Try to remove by matching id field for objects
+                for i, item in enumerate(target):
+                    if isinstance(item, dict) and item.get("id") == value:
+                        target.pop(i)
+                        break
+
+    # Update lastUpdated timestamp
+    data["lastUpdated"] = datetime.now().isoformat()
+
+
 def main():
     try:
         input_data = json.loads(sys.stdin.read())
@@ -89,45 +127,8 @@ def main():
         if not file_path.exists():
             raise FileNotFoundError(f"State file not found: {file_path}")
 
-        # Read current state
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        # Perform operation
-        if operation == "set":
-            set_nested(data, path, value)
-        elif operation == "append":
-            target = get_nested(data, path)
-            if not isinstance(target, list):
-                raise ValueError(f"Path '{path}' is not an array, cannot append")
-            target.append(value)
-        elif operation == "remove":
-            target = get_nested(data, path)
-            if not isinstance(target, list):
-                raise ValueError(f"Path '{path}' is not an array, cannot remove")
-            if isinstance(value, int):
-                # Remove by index
-                if 0 <= value < len(target):
-                    target.pop(value)
-                else:
-                    raise ValueError(f"Index {value} out of range")
-            else:
-                # Remove by value
-                if value in target:
-                    target.remove(value)
-                else:
-                    # Try to remove by matching id field for objects
-                    for i, item in enumerate(target):
-                        if isinstance(item, dict) and item.get("id") == value:
-                            target.pop(i)
-                            break
-
-        # Update lastUpdated timestamp
-        data["lastUpdated"] = datetime.now().isoformat()
-
-        # Write back
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        # Read, modify and write back under the state file's lock
+        atomic_io.update_json(file_path, lambda data: apply_operation(data, operation, path, value))
 
         result = {
             "status": "success",